@@ -6,12 +6,16 @@ from ._util import field_name, as_field
 from .packet import Packet, TablePacket, ArrayPacket
 from .field import Field, makeField
 from .processors.base import TypeDef
+from .stream import PacketWriter
+from .records import PacketFile
+from ._journal import ChangeJournal
 
 
 __all__ = [
     'json', 
     'PacketBase', 'Packet', 'TablePacket', 'ArrayPacket', 'DiffKeys', 
-    'Field', 'makeField', 'TypeDef', 'field_name', 'as_field'
+    'Field', 'makeField', 'TypeDef', 'field_name', 'as_field',
+    'PacketWriter', 'PacketFile', 'ChangeJournal'
 ]
 
 
@@ -0,0 +1,124 @@
+# -*- coding:utf-8 -*-
+"""Primitives of the binary packet encoding.
+
+Integers are LEB128 varints (signed ones are zigzag encoded), floats are 8 bytes little endian,
+variable sized values are prefixed with the varint length.
+Container items are prefixed with the count shifted left by one, the low bit is set if some items
+are None, then every item has the presence byte before it.
+"""
+from typing import Any, Callable, Tuple
+import struct
+from . import _json as json
+
+
+__all__ = [
+    'write_uvarint', 'read_uvarint', 'skip_uvarint', 'write_svarint', 'read_svarint',
+    'write_double', 'read_double', 'write_block', 'read_block', 'skip_block', 'write_json', 'read_json',
+    'write_count', 'read_count', 'write_item', 'read_item',
+]
+
+
+_DOUBLE = struct.Struct('<d')
+
+
+def write_uvarint(buf: bytearray, n: int):
+    if n < 0:
+        raise ValueError(f'Negative value {n} for unsigned varint')
+    while n > 0x7f:
+        buf.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def read_uvarint(data: memoryview, pos: int) -> Tuple[int, int]:
+    b = data[pos]
+    pos += 1
+    if b < 0x80:
+        return b, pos
+    n = b & 0x7f
+    shift = 7
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def skip_uvarint(data: memoryview, pos: int) -> int:
+    while data[pos] & 0x80:
+        pos += 1
+    return pos + 1
+
+
+def write_svarint(buf: bytearray, n: int):
+    write_uvarint(buf, n << 1 if n >= 0 else ((-n) << 1) - 1)
+
+
+def read_svarint(data: memoryview, pos: int) -> Tuple[int, int]:
+    z, pos = read_uvarint(data, pos)
+    return (-((z + 1) >> 1) if z & 1 else z >> 1), pos
+
+
+def write_double(buf: bytearray, v: float):
+    buf += _DOUBLE.pack(v)
+
+
+def read_double(data: memoryview, pos: int) -> Tuple[float, int]:
+    return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+
+
+def write_block(buf: bytearray, block: bytes):
+    write_uvarint(buf, len(block))
+    buf += block
+
+
+def read_block(data: memoryview, pos: int) -> Tuple[memoryview, int]:
+    n, pos = read_uvarint(data, pos)
+    end = pos + n
+    if end > len(data):
+        raise ValueError('Binary data is truncated')
+    return data[pos:end], end
+
+
+def skip_block(data: memoryview, pos: int) -> int:
+    n, pos = read_uvarint(data, pos)
+    end = pos + n
+    if end > len(data):
+        raise ValueError('Binary data is truncated')
+    return end
+
+
+def write_json(buf: bytearray, r: Any):
+    write_block(buf, json.dumpb(r))
+
+
+def read_json(data: memoryview, pos: int) -> Tuple[Any, int]:
+    block, pos = read_block(data, pos)
+    return json.loadb(block), pos
+
+
+def write_count(buf: bytearray, n: int, nullable: bool):
+    write_uvarint(buf, n << 1 | nullable)
+
+
+def read_count(data: memoryview, pos: int) -> Tuple[int, bool, int]:
+    n, pos = read_uvarint(data, pos)
+    return n >> 1, bool(n & 1), pos
+
+
+def write_item(buf: bytearray, r: Any, write: Callable[[Any, bytearray], Any]):
+    """Write the item of the container with None items"""
+    if r is None:
+        buf.append(0)
+    else:
+        buf.append(1)
+        write(r, buf)
+
+
+def read_item(data: memoryview, pos: int, read: Callable[[memoryview, int], Tuple[Any, int]]) -> Tuple[Any, int]:
+    """Read the item written by `write_item`"""
+    if not data[pos]:
+        return None, pos + 1
+    return read(data, pos + 1)
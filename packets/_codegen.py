@@ -0,0 +1,378 @@
+# -*- coding:utf-8 -*-
+"""Per-class code generation for packets.
+
+Loaders are generated from `__fields__` of a packet class the first time the
+class is loaded, so the per-field dispatch of `Field.raw_to_py` and `Field.__set__`
+is replaced with inlined raw name lookups, required checks and conversions which
+write straight to the instance storage.
+Dumpers are generated the same way on the first dump. They skip the conversion of
+the typedefs where python value is the raw one and use raw defaults computed once.
+"""
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Type
+import linecache
+from ._binary import read_uvarint, read_block
+if TYPE_CHECKING:
+    from ._packetbase import PacketBase
+    from .field import Field
+    from ._trust import Trust
+
+
+__all__ = ['Source', 'compile_dict_loader', 'compile_list_loader', 'compile_binary_loader', 'compile_dict_dumper', 'compile_list_dumper']
+
+
+class Source():
+    """Generated function source with it's namespace of constants"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {}
+
+    def line(self, indent: int, text: str):
+        self.lines.append('    ' * indent + text)
+
+    def const(self, prefix: str, value: Any) -> str:
+        """Put `value` to the function namespace
+
+        Args:
+            prefix (str): name prefix of the constant
+            value (Any): value of the constant
+
+        Returns:
+            str: name of the constant in generated code
+        """
+        name = f'{prefix}_{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def build(self, qualname: str) -> Callable:
+        code = '\n'.join(self.lines) + '\n'
+        filename = f'<packets {qualname}.{self.name} {id(self):x}>'
+        exec(compile(code, filename, 'exec'), self.namespace)
+        # make generated code visible in tracebacks
+        linecache.cache[filename] = (len(code), None, code.splitlines(True), filename)
+        fn = self.namespace[self.name]
+        fn.__qualname__ = f'{qualname}.{self.name}'
+        return fn
+
+
+def _storage(cls: 'Type[PacketBase]', instance: str, name: str) -> str:
+    """Expression of the field storage of `instance`.
+    Dict storage is expected to be fetched to local `d` beforehand.
+    """
+    if cls.__use_slots__:
+        return f'{instance}.{name}'
+    return f'd[{name!r}]'
+
+
+def _fetch(cls: 'Type[PacketBase]', instance: str, name: str) -> str:
+    """Expression of the field value of `instance` or None if value is not set"""
+    if cls.__use_slots__:
+        return f'getattr({instance}, {name!r}, None)'
+    return f'd.get({name!r})'
+
+
+def _nested(src: Source, nested: 'Type[PacketBase]', factory: str, trust: 'Optional[Trust]') -> str:
+    """Name of the nested packet loader made by `factory` classmethod for the level of the outer load.
+    The loader is resolved on the first call, so the nested classes are not compiled ahead.
+    """
+    name = src.const('load', None)
+    namespace = src.namespace
+
+    def resolve(cls, *args):
+        loader = namespace[name] = getattr(cls, factory)(trust)
+        return loader(cls, *args)
+    namespace[name] = resolve
+    return name
+
+
+def _load_field(src: Source, indent: int, cls: 'Type[PacketBase]', py_name: str, field: 'Field', trust: 'Optional[Trust]'):
+    """Generate loading of a raw value `r` to the instance storage"""
+    err = src.const('err', f'Failed to parse "{cls.__name__}::{py_name}": ')
+    src.line(indent, 'if r is None:')
+    if field.required:
+        req = src.const('req', f'Field "{field.name}" required')
+        src.line(indent + 1, 'if strict:')
+        src.line(indent + 2, f'raise ValueError({err} + {req})')
+    else:
+        src.line(indent + 1, 'pass')
+    src.line(indent, 'else:')
+    _convert_field(src, indent + 1, cls, field, err, trust)
+
+
+def _convert_field(src: Source, indent: int, cls: 'Type[PacketBase]', field: 'Field', err: str, trust: 'Optional[Trust]'):
+    """Generate conversion of not None raw value `r` to the instance storage.
+    Checked values are validated by `parse_raw`, nested packets are loaded with the level of `trust`.
+    """
+    from .processors.subpacket import Subpacket
+    typ = field._typ
+    target = _storage(cls, 'pckt', field._instance_name)
+    check = (trust or cls.__trust__) != 'trusted'
+    if not check and typ.raw_to_py_is_identity():
+        src.line(indent, f'{target} = r')
+        return
+    src.line(indent, 'try:')
+    if type(typ) is Subpacket:
+        nested = src.const('nested', typ._typ)
+        if check:
+            valid = src.const('valid', typ.check_raw)
+            src.line(indent + 1, f'if not {valid}(r):')
+            src.line(indent + 2, 'raise invalid_raw(r)')
+        src.line(indent + 1, f'v = {_nested(src, typ._typ, "_nested_loader", trust)}({nested}, r, strict)')
+    else:
+        # checked values are validated and converted by `parse_raw` in one pass
+        conv = src.const('conv', typ.parse_raw if check else typ.raw_to_py)
+        src.line(indent + 1, f'v = {conv}(r, strict)')
+    src.line(indent, 'except Exception as e:')
+    src.line(indent + 1, f"raise ValueError(f'{{{err}}}{{e}}')")
+    src.line(indent, 'if v is not None:')
+    if typ.has_modified:
+        src.line(indent + 1, 'v.__parent__ = pckt')
+    src.line(indent + 1, f'{target} = v')
+    if field.required:
+        req = src.const('req', f'Field "{field.name}" required')
+        src.line(indent, 'elif strict:')
+        src.line(indent + 1, f'raise ValueError({err} + {req})')
+
+
+def _load_prologue(src: Source, cls: 'Type[PacketBase]'):
+    from .processors.base import invalid_raw
+    src.namespace['new'] = object.__new__
+    src.namespace['invalid_raw'] = invalid_raw
+    src.line(1, 'pckt = new(cls)')
+    if cls.__use_slots__:
+        src.line(1, 'pckt.has_modified = True')
+        src.line(1, 'pckt.__loading__ = False')
+        src.line(1, 'pckt.__modified__ = False')
+        src.line(1, 'pckt.__parent__ = None')
+        src.line(1, 'pckt.__raw__ = None')
+    else:
+        src.line(1, "d = {'has_modified': True, '__loading__': False, '__modified__': False}")
+
+
+def _load_epilogue(src: Source, cls: 'Type[PacketBase]', result: str = 'pckt'):
+    from ._packetbase import PacketBase
+    if not cls.__use_slots__:
+        src.line(1, 'pckt.__dict__ = d')
+    if cls.on_packet_loaded is not PacketBase.on_packet_loaded:
+        src.line(1, 'pckt.on_packet_loaded()')
+    src.line(1, f'return {result}')
+
+
+def compile_dict_loader(cls: 'Type[PacketBase]', trust: 'Optional[Trust]' = None) -> Callable:
+    """Generate `load(cls, raw, strict)` for packets serialized as dicts
+
+    Args:
+        cls (Type[PacketBase]): packet class
+        trust (Optional[Trust], optional): trust level of the raw data, passed to the nested packets.
+            Defaults to `__trust__` of the class, the nested packets use their own levels then.
+
+    Returns:
+        Callable: loader function
+    """
+    src = Source('load')
+    src.line(0, 'def load(cls, raw, strict=True):')
+    if (trust or cls.__trust__) == 'strict':
+        src.line(1, 'cls._reject_unknown(raw)')
+    _load_prologue(src, cls)
+    src.line(1, 'raw_get = raw.get')
+    for py_name, field in cls.__fields__.items():
+        src.line(1, f'r = raw_get({field.name!r})')
+        _load_field(src, 1, cls, py_name, field, trust)
+    _load_epilogue(src, cls)
+    return src.build(cls.__qualname__)
+
+
+def compile_list_loader(cls: 'Type[PacketBase]', trust: 'Optional[Trust]' = None) -> Callable:
+    """Generate `load(cls, raw, strict)` for packets serialized as lists.
+    As with zip() the fields missing at the end of raw list are left unset.
+
+    Args:
+        cls (Type[PacketBase]): packet class
+        trust (Optional[Trust], optional): trust level of the raw data, passed to the nested packets.
+            Defaults to `__trust__` of the class, the nested packets use their own levels then.
+
+    Returns:
+        Callable: loader function
+    """
+    src = Source('load')
+    src.line(0, 'def load(cls, raw, strict=True):')
+    src.line(1, 'if raw.__class__ is not list and raw.__class__ is not tuple:')
+    src.line(2, 'raw = list(raw)')
+    if (trust or cls.__trust__) == 'strict':
+        src.line(1, 'cls._reject_unknown(raw)')
+    src.line(1, 'n = len(raw)')
+    _load_prologue(src, cls)
+    for i, (py_name, field) in enumerate(cls.__fields__.items()):
+        src.line(1, f'if n > {i}:')
+        src.line(2, f'r = raw[{i}]')
+        _load_field(src, 2, cls, py_name, field, trust)
+    _load_epilogue(src, cls)
+    return src.build(cls.__qualname__)
+
+
+def compile_binary_loader(cls: 'Type[PacketBase]', trust: 'Optional[Trust]' = None) -> Callable:
+    """Generate `load(cls, data, pos, strict)` for the tagged binary encoding of `_write_binary`.
+    Values are decoded straight to the instance storage without the raw packet in between,
+    nested packets are decoded by their own binary loaders with the same `trust`.
+
+    Args:
+        cls (Type[PacketBase]): packet class
+        trust (Optional[Trust], optional): trust level of the data. Defaults to `__trust__` of the class.
+
+    Returns:
+        Callable: loader function returning the packet and the position after it
+    """
+    from .processors.subpacket import Subpacket
+    src = Source('load')
+    src.namespace['read_uvarint'] = read_uvarint
+    src.namespace['read_block'] = read_block
+    src.line(0, 'def load(cls, data, pos, strict=True):')
+    _load_prologue(src, cls)
+    for tag, field in enumerate(cls.__fields__.values(), 1):
+        if field.required:
+            src.line(1, f'seen_{tag} = False')
+    src.line(1, 'while True:')
+    src.line(2, 'tag, pos = read_uvarint(data, pos)')
+    src.line(2, 'if not tag:')
+    src.line(3, 'break')
+    errors = []
+    for tag, (py_name, field) in enumerate(cls.__fields__.items(), 1):
+        typ = field._typ
+        err = src.const('err', f'Failed to parse "{cls.__name__}::{py_name}": ')
+        errors.append((err, field))
+        src.line(2, f'elif tag == {tag}:')
+        if field.required:
+            src.line(3, f'seen_{tag} = True')
+        if type(typ) is Subpacket:
+            nested = src.const('nested', typ._typ)
+            size = src.const('size', f'Wrong size of nested {typ._typ.__name__}')
+            src.line(3, 'block, pos = read_block(data, pos)')
+            src.line(3, 'try:')
+            src.line(4, f'v, end = {_nested(src, typ._typ, "_binary_loader", trust)}({nested}, block, 0, strict)')
+            src.line(3, 'except ValueError as e:')
+            src.line(4, f"raise ValueError(f'{{{err}}}{{e}}')")
+            src.line(3, 'if end != len(block):')
+            src.line(4, f'raise ValueError({err} + {size})')
+            src.line(3, 'v.__parent__ = pckt')
+            src.line(3, f'{_storage(cls, "pckt", field._instance_name)} = v')
+        else:
+            read = src.const('read', typ.read_binary)
+            src.line(3, f'r, pos = {read}(data, pos)')
+            _convert_field(src, 3, cls, field, err, trust)
+    unknown = src.const('unknown', f' of "{cls.__name__}"')
+    src.line(2, 'else:')
+    src.line(3, f"raise ValueError('Unknown field #' + str(tag) + {unknown})")
+    if any(field.required for _, field in errors):
+        src.line(1, 'if strict:')
+        for tag, (err, field) in enumerate(errors, 1):
+            if field.required:
+                req = src.const('req', f'Field "{field.name}" required')
+                src.line(2, f'if not seen_{tag}:')
+                src.line(3, f'raise ValueError({err} + {req})')
+    _load_epilogue(src, cls, 'pckt, pos')
+    return src.build(cls.__qualname__)
+
+
+_IMMUTABLE_RAW = (str, int, float, bool, bytes)
+
+
+def _raw_default(src: Source, field: 'Field') -> Optional[str]:
+    """Get the expression of raw default value of the field or None if field has no default"""
+    if not field.has_default or field._default_value is None:
+        return None
+    typ = field._typ
+    raw = typ.py_to_raw(field._default_value)
+    if raw is None:
+        return None
+    if type(raw) in _IMMUTABLE_RAW:
+        return src.const('dflt', raw)
+    # containers are converted on every dump not to share them between results
+    return f'{src.const("dconv", typ.py_to_raw)}({src.const("dval", field._default_value)})'
+
+
+def _dump_field(src: Source, indent: int, cls: 'Type[PacketBase]', field: 'Field', target: str, keep_none: bool):
+    """Generate dumping of the instance storage value to `target`"""
+    typ = field._typ
+    req = src.const('req', f'Field required "{field.name}"') if field.required else None
+    src.line(indent, f'v = {_fetch(cls, "self", field._instance_name)}')
+    src.line(indent, 'if v is None:')
+    dflt = _raw_default(src, field)
+    if dflt is not None:
+        src.line(indent + 1, f'{target} = {dflt}')
+    elif field.required:
+        src.line(indent + 1, f'raise ValueError({req})')
+    elif keep_none:
+        src.line(indent + 1, f'{target} = None')
+    else:
+        src.line(indent + 1, 'pass')
+    src.line(indent, 'else:')
+    indent += 1
+    if __debug__:
+        conv = src.const('conv', typ.emit_py)
+    elif typ.py_to_raw_is_identity():
+        src.line(indent, f'{target} = v')
+        return
+    else:
+        conv = src.const('conv', typ.py_to_raw)
+    if keep_none and not field.required:
+        src.line(indent, f'{target} = {conv}(v)')
+        return
+    src.line(indent, f'r = {conv}(v)')
+    src.line(indent, 'if r is not None:')
+    src.line(indent + 1, f'{target} = r')
+    if field.required:
+        src.line(indent, 'else:')
+        src.line(indent + 1, f'raise ValueError({req})')
+
+
+def compile_dict_dumper(cls: 'Type[PacketBase]') -> Callable:
+    """Generate `dump(self, raw)` for packets serialized as dicts
+
+    Args:
+        cls (Type[PacketBase]): packet class
+
+    Returns:
+        Callable: dumper function
+    """
+    def dumper(name: str, raw: bool) -> Source:
+        src = Source(name)
+        src.line(0, f'def {name}(self, raw=True):')
+        if raw:
+            src.line(1, 'if not raw:')
+            src.line(2, f'return {src.const("dump_py", dump_py)}(self)')
+        if cls.__use_slots__:
+            src.line(1, 'if self.__raw__ is not None:')
+        else:
+            src.line(1, 'd = self.__dict__')
+            src.line(1, "if '__raw__' in d:")
+        src.line(2, 'return self._dump_lazy(raw)')
+        src.line(1, 'result = {}')
+        for py_name, field in cls.__fields__.items():
+            _dump_field(src, 1, cls, field, f'result[{(field.name if raw else py_name)!r}]', False)
+        src.line(1, 'return result')
+        return src
+
+    dump_py = dumper('dump_py', False).build(cls.__qualname__)
+    return dumper('dump', True).build(cls.__qualname__)
+
+
+def compile_list_dumper(cls: 'Type[PacketBase]') -> Callable:
+    """Generate `dump(self, raw)` for packets serialized as lists
+
+    Args:
+        cls (Type[PacketBase]): packet class
+
+    Returns:
+        Callable: dumper function
+    """
+    src = Source('dump')
+    src.line(0, 'def dump(self, raw=True):')
+    if not cls.__use_slots__:
+        src.line(1, 'd = self.__dict__')
+    targets = []
+    for i, field in enumerate(cls.__fields__.values()):
+        targets.append(f'r_{i}')
+        _dump_field(src, 1, cls, field, targets[-1], True)
+    src.line(1, f'return [{", ".join(targets)}]')
+    return src.build(cls.__qualname__)
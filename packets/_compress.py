@@ -0,0 +1,71 @@
+# -*- coding:utf-8 -*-
+"""One-shot compression of serialized packets."""
+from typing import Optional
+import zlib
+import gzip
+import lzma
+
+
+__all__ = ['ZDICT_MAX_SIZE', 'compress', 'decompress']
+
+
+# zlib uses at most 32K window of the preset dictionary
+ZDICT_MAX_SIZE = 32768
+
+
+def compress(data: bytes, compression: str = 'zlib', level: Optional[int] = None, zdict: Optional[bytes] = None) -> bytes:
+    """Compress bytes
+
+    Args:
+        data (bytes): data to compress
+        compression (str, optional): `zlib`, `gzip` or `lzma`. Defaults to 'zlib'.
+        level (Optional[int], optional): compression level (preset for lzma). Defaults to the codec default.
+        zdict (Optional[bytes], optional): zlib preset dictionary. Defaults to None.
+
+    Raises:
+        ValueError: compression is unknown or doesn't support preset dictionary
+
+    Returns:
+        bytes: compressed data
+    """
+    if compression == 'zlib':
+        level = -1 if level is None else level
+        if zdict is None:
+            return zlib.compress(data, level)
+        c = zlib.compressobj(level, zdict=zdict)
+        return c.compress(data) + c.flush()
+    if zdict is not None:
+        raise ValueError('Preset dictionary is supported only by zlib')
+    if compression == 'gzip':
+        return gzip.compress(data, 9 if level is None else level)
+    if compression == 'lzma':
+        return lzma.compress(data, preset=level)
+    raise ValueError(f'Unknown compression "{compression}"')
+
+
+def decompress(data: bytes, compression: str = 'zlib', zdict: Optional[bytes] = None) -> bytes:
+    """Decompress bytes
+
+    Args:
+        data (bytes): compressed data
+        compression (str, optional): `zlib`, `gzip` or `lzma`. Defaults to 'zlib'.
+        zdict (Optional[bytes], optional): zlib preset dictionary used for compression. Defaults to None.
+
+    Raises:
+        ValueError: compression is unknown or doesn't support preset dictionary
+
+    Returns:
+        bytes: decompressed data
+    """
+    if compression == 'zlib':
+        if zdict is None:
+            return zlib.decompress(data)
+        d = zlib.decompressobj(zdict=zdict)
+        return d.decompress(data) + d.flush()
+    if zdict is not None:
+        raise ValueError('Preset dictionary is supported only by zlib')
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'lzma':
+        return lzma.decompress(data)
+    raise ValueError(f'Unknown compression "{compression}"')
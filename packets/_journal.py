@@ -0,0 +1,138 @@
+# -*- coding:utf-8 -*-
+"""Versioned change journal of the packets.
+
+Every change of a packet field or a container item is stamped with the version taken from
+the global monotonic clock. The stamp is kept instead of the modified flag, so the changes
+made after any version are known without copying the packet. Consumers of the changes
+keep only the version they have seen, so resetting the consumer is O(1).
+"""
+from typing import TYPE_CHECKING, Any, Dict, Generic, Iterable, Optional, TypeVar
+from itertools import count
+from ._types import DiffKeys
+if TYPE_CHECKING:
+    from ._packetbase import PacketBase
+
+
+__all__ = ['next_version', 'ChangeJournal']
+
+
+T = TypeVar('T', bound='PacketBase')
+
+
+# next() of itertools.count is atomic, so the versions are unique between threads too
+next_version = count(1).__next__
+
+
+class ChangeJournal(Generic[T]):
+    """Changes of the packet for several independent consumers.
+    Each consumer has it's own cursor, the version of the packet it has already seen.
+    The stamps seen by all the consumers are compacted when the slowest one advances.
+
+    e.x.
+    journal = ChangeJournal(state, ('cache', 'replica'))
+    ...
+    cache.send(journal.pull('cache'))
+    if journal.is_modified('replica'):
+        replica.send(journal.pull('replica'))
+    """
+
+    def __init__(self, packet: T, consumers: Iterable[str] = ()) -> None:
+        """Constructor
+
+        Args:
+            packet (T): packet to track
+            consumers (Iterable[str], optional): names of the consumers subscribed to the current state. Defaults to ().
+        """
+        self._packet = packet
+        self._cursors: Dict[str, int] = {}
+        for name in consumers:
+            self.subscribe(name)
+
+    @property
+    def packet(self) -> T:
+        return self._packet
+
+    @property
+    def consumers(self) -> Iterable[str]:
+        return self._cursors.keys()
+
+    def subscribe(self, name: str, version: Optional[int] = None):
+        """Add the consumer. It gets the changes made after subscribing or after `version`.
+
+        Args:
+            name (str): consumer name
+            version (Optional[int], optional): version the consumer has seen. Defaults to the current one.
+        """
+        self._cursors[name] = next_version() if version is None else version
+
+    def unsubscribe(self, name: str):
+        """Remove the consumer, changes waiting only for it are compacted
+
+        Args:
+            name (str): consumer name
+        """
+        del self._cursors[name]
+        self._compact()
+
+    def cursor(self, name: str) -> int:
+        """Version the consumer has seen
+
+        Args:
+            name (str): consumer name
+
+        Returns:
+            int: version
+        """
+        return self._cursors[name]
+
+    def is_modified(self, name: str) -> bool:
+        return self._packet.is_modified(self._cursors[name])
+
+    def diff_keys(self, name: str) -> DiffKeys:
+        """Paths of the changes the consumer hasn't seen yet
+
+        Args:
+            name (str): consumer name
+
+        Returns:
+            DiffKeys: changed paths
+        """
+        return self._packet.diff_keys(self._cursors[name])
+
+    def advance(self, name: str, version: Optional[int] = None) -> int:
+        """Mark the changes as seen by the consumer.
+
+        Args:
+            name (str): consumer name
+            version (Optional[int], optional): version seen, e.g. taken by `next_version` before
+                the changes were sent. Defaults to the current one.
+
+        Returns:
+            int: new cursor of the consumer
+        """
+        if version is None:
+            version = next_version()
+        slowest = self._cursors[name] == min(self._cursors.values())
+        self._cursors[name] = version
+        if slowest:
+            self._compact()
+        return version
+
+    def pull(self, name: str) -> Any:
+        """Raw patch of the changes the consumer hasn't seen yet, the consumer is advanced.
+        Changes made while the patch is dumped are left for the next pull.
+
+        Args:
+            name (str): consumer name
+
+        Returns:
+            Any: raw patch to apply with `apply_partial`
+        """
+        version = next_version()
+        patch = self._packet.dump_partial(self._packet.diff_keys(self._cursors[name]))
+        self.advance(name, version)
+        return patch
+
+    def _compact(self):
+        if self._cursors:
+            self._packet.compact_changes(min(self._cursors.values()))
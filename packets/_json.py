@@ -1,23 +1,269 @@
 # -*- coding:utf-8 -*-
-from typing import Any
+"""JSON backends registry.
+
+The first available backend is selected on import (`ujson`, then the standard `json`),
+the other one may be selected with `set_backend` or `PACKETS_JSON_BACKEND` environment variable.
+`orjson` is faster, but it is used only if selected explicitly: its output differs
+(NaN and Infinity are written as null, integers over 64 bits are rejected).
+Module functions `loads`, `dumps`, `load`, `loadb`, `dumpb` and `encode_into` are bound to the active backend.
+"""
+from typing import Any, Callable, Dict, IO, List, Optional, Set, Union
+import os
+import json as _stdlib
+
+
+__all__ = [
+    'JSONBackend', 'register_backend', 'available_backends', 'set_backend', 'get_backend', 'backend_name',
+    'loads', 'dumps', 'load', 'loadb', 'dumpb', 'encode_into',
+]
+
+
+class JSONBackend():
+    """JSON backend interface. The default implementation uses the standard `json` module.
+    """
+    name = 'json'
+
+    def loads(self, s: Union[str, bytes, bytearray], *args, **kwargs) -> Any:
+        """Decode JSON from string or bytes
+
+        Args:
+            s (Union[str, bytes, bytearray]): encoded JSON
+            *args, **kwargs: options of the backend decoder
+
+        Returns:
+            Any: decoded value
+        """
+        return _stdlib.loads(s, *args, **kwargs)
+
+    def loadb(self, b: Union[bytes, bytearray, memoryview]) -> Any:
+        """Decode UTF-8 encoded JSON
+
+        Args:
+            b (Union[bytes, bytearray, memoryview]): encoded JSON
+
+        Returns:
+            Any: decoded value
+        """
+        if isinstance(b, memoryview):
+            b = bytes(b)
+        return self.loads(b)
+
+    def load(self, fp: IO, *args, **kwargs) -> Any:
+        return self.loads(fp.read(), *args, **kwargs)
+
+    def dumps(self, obj: Any, ensure_ascii: bool = False, **kwargs) -> str:
+        """Encode value to JSON string
+
+        Args:
+            obj (Any): value to encode
+            ensure_ascii (bool, optional): escape non-ASCII characters. Defaults to False.
+
+        Returns:
+            str: encoded JSON
+        """
+        return _stdlib.dumps(obj, ensure_ascii=ensure_ascii, **kwargs)
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Encode value to UTF-8 encoded JSON
+
+        Args:
+            obj (Any): value to encode
+
+        Returns:
+            bytes: encoded JSON
+        """
+        return self.dumps(obj).encode('utf-8')
+
+    def encode_into(self, obj: Any, buf: bytearray) -> int:
+        """Append UTF-8 encoded JSON to the buffer
+
+        Args:
+            obj (Any): value to encode
+            buf (bytearray): buffer to append to
+
+        Returns:
+            int: number of bytes appended
+        """
+        data = self.dumpb(obj)
+        buf += data
+        return len(data)
+
+
+class UJSONBackend(JSONBackend):
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, s: Union[str, bytes, bytearray], *args, **kwargs) -> Any:
+        if args or kwargs:
+            # decoding options ujson doesn't have
+            return super().loads(s, *args, **kwargs)
+        return self._ujson.loads(s)
+
+    def load(self, fp: IO, *args, **kwargs) -> Any:
+        if args or kwargs:
+            return super().load(fp, *args, **kwargs)
+        return self._ujson.load(fp)
+
+    def dumps(self, obj: Any, ensure_ascii: bool = False, **kwargs) -> str:
+        return self._ujson.dumps(obj, ensure_ascii=ensure_ascii, **kwargs)
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+class ORJSONBackend(JSONBackend):
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+        # orjson takes str, bytes, bytearray and memoryview as is
+        self.loadb = orjson.loads # type: ignore
+
+    def loads(self, s: Union[str, bytes, bytearray], *args, **kwargs) -> Any:
+        if args or kwargs:
+            # decoding options orjson doesn't have
+            return super().loads(s, *args, **kwargs)
+        return self._orjson.loads(s)
+
+    def dumps(self, obj: Any, ensure_ascii: bool = False, **kwargs) -> str:
+        if ensure_ascii or kwargs:
+            # formatting options orjson doesn't have
+            return super().dumps(obj, ensure_ascii=ensure_ascii, **kwargs)
+        return self._orjson.dumps(obj, option=self._options).decode('utf-8')
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+
+_factories: Dict[str, Callable[[], JSONBackend]] = {}
+_priority: List[str] = []
+# backends selected only by name
+_explicit: Set[str] = set()
+_backend: Optional[JSONBackend] = None
+
+loads: Callable[..., Any]
+loadb: Callable[[Union[bytes, bytearray, memoryview]], Any]
+load: Callable[..., Any]
+dumps: Callable[..., str]
+dumpb: Callable[[Any], bytes]
+encode_into: Callable[[Any, bytearray], int]
+
+
+def register_backend(name: str, factory: Callable[[], JSONBackend], explicit: bool = False):
+    """Register JSON backend. Registered later has lower priority.
+
+    Args:
+        name (str): name of the backend
+        factory (Callable[[], JSONBackend]): backend factory, raises ImportError if backend is unavailable
+        explicit (bool, optional): whether backend is used only if selected by name,
+            e.g. its output is not compatible with the default one. Defaults to False.
+    """
+    _factories[name] = factory
+    if name not in _priority:
+        _priority.append(name)
+    if explicit:
+        _explicit.add(name)
+    else:
+        _explicit.discard(name)
+
+
+def available_backends() -> List[str]:
+    """Names of backends which can be used
+
+    Returns:
+        List[str]: backend names in the order of priority
+    """
+    names = []
+    for name in _priority:
+        try:
+            _factories[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name: Optional[str] = None) -> JSONBackend:
+    """Select JSON backend
+
+    Args:
+        name (Optional[str], optional): name of the backend. Defaults to the first available one
+            not registered as explicit.
+
+    Raises:
+        ValueError: backend is unknown
+        ImportError: backend is unavailable
+
+    Returns:
+        JSONBackend: selected backend
+    """
+    global _backend
+    if name is None:
+        backend = None
+        for candidate in _priority:
+            if candidate in _explicit:
+                continue
+            try:
+                backend = _factories[candidate]()
+                break
+            except ImportError:
+                continue
+        assert backend is not None
+    else:
+        factory = _factories.get(name)
+        if factory is None:
+            raise ValueError(f'Unknown JSON backend "{name}"')
+        backend = factory()
+    _backend = backend
+    # bind module functions directly to skip the dispatch on every call
+    module = globals()
+    module['loads'] = backend.loads
+    module['loadb'] = backend.loadb
+    module['load'] = backend.load
+    module['dumps'] = backend.dumps
+    module['dumpb'] = backend.dumpb
+    module['encode_into'] = backend.encode_into
+    return backend
+
+
+def get_backend() -> JSONBackend:
+    """Active JSON backend
+
+    Returns:
+        JSONBackend: backend
+    """
+    assert _backend is not None
+    return _backend
+
+
+def backend_name() -> str:
+    """Name of active JSON backend
+
+    Returns:
+        str: name
+    """
+    return get_backend().name
+
+
+register_backend('ujson', UJSONBackend)
+register_backend('json', JSONBackend)
+register_backend('orjson', ORJSONBackend, explicit=True)
+set_backend(os.environ.get('PACKETS_JSON_BACKEND') or None)
+
 
 try:
     import ujson
     from json import JSONEncoder
 
-    def dumps(obj, ensure_ascii=False, *args, **kwargs):
-        return ujson.dumps(obj, ensure_ascii=ensure_ascii, *args, **kwargs)
-
-    def loads(s, *args, **kwargs):
-        return ujson.loads(s, *args, **kwargs)
-
-    def load(s, *args, **kwargs):
-        return ujson.load(s, *args, **kwargs)
-    
     class UJSONEncoder(JSONEncoder):
         def encode(self, o: Any) -> str:
             return ujson.encode(o)
-        
+
+    __all__.append('UJSONEncoder')
 except ImportError:
-    from json import * # type: ignore
-    _default_encoder.ensure_ascii = False # type: ignore
+    pass
@@ -1,10 +1,13 @@
 # -*- coding:utf-8 -*-
-from typing import TYPE_CHECKING, Union, TypeVar, Type, List, Dict, Any, TypeAlias, Self, Optional
-import pickle
+from typing import TYPE_CHECKING, Union, TypeVar, Type, List, Dict, Any, TypeAlias, Self, Optional, Callable, Iterable, Iterator, IO
 from abc import ABCMeta, abstractmethod
+import struct
 from . import json
 from ._types import DiffKeys
+from ._journal import next_version
+from ._trust import Trust, DEFAULT_TRUST, current_trust, validate_trust, use_trust
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
     from .field import Field
 
 
@@ -18,8 +21,46 @@ class PacketMeta(ABCMeta):
                 rm.update(base.__raw_mapping__)
         namespace['__fields__'] = fields
         namespace['__raw_mapping__'] = rm
+        # generated code is bound to the fields of exact class, never inherit or copy it
+        namespace.pop('__load_fn__', None)
+        namespace.pop('__load_fns__', None)
+        namespace.pop('__binary_load_fns__', None)
+        namespace.pop('__dump_fn__', None)
+        namespace.pop('__copy_plan__', None)
+        namespace.pop('__zdict__', None)
+        namespace.pop('__struct__', None)
+        if '__trust__' in namespace:
+            validate_trust(namespace['__trust__'])
+        if namespace.get('__use_slots__', any(getattr(base, '__use_slots__', False) for base in bases)):
+            cls._make_slots(cls_name, bases, namespace, fields)
         return super().__new__(cls, cls_name, bases, namespace)
 
+    @staticmethod
+    def _make_slots(cls_name, bases, namespace, fields):
+        """Generate `__slots__` for the packet storage instead of `__dict__`.
+        Fields storage names are known before `Field.__set_name__` is called,
+        so they are put to slots here. Overridden fields reuse parent storage.
+        """
+        from .field import Field
+        storage = []
+        if not any(getattr(base, '__use_slots__', False) for base in bases):
+            storage.extend(('has_modified', '__loading__', '__modified__', '__parent__', '__raw__'))
+        for name, v in namespace.items():
+            if not isinstance(v, Field) or name == '__default_field__' or name in fields:
+                continue
+            if name.startswith('_'):
+                raise TypeError(f'Packet "{cls_name}" can not store private field "{name}" in slots')
+            if not name.isidentifier():
+                # e.g. rows of the tables named by addresses
+                raise TypeError(f'Packet "{cls_name}" can not store field "{name}" in slots, '
+                                'it is not an identifier. Use dict storage or `__row_store__` for tables')
+            storage.extend((f'_{name}', f'_{name}_modified'))
+        inherited = tuple(n for base in bases for n in getattr(base, '__storage_names__', ()))
+        if namespace.get('__row_store__', any(getattr(base, '__row_store__', False) for base in bases)) and '__rows__' not in inherited:
+            storage.append('__rows__')
+        namespace['__slots__'] = tuple(storage)
+        namespace['__storage_names__'] = inherited + tuple(storage)
+
 
 T = TypeVar('T', bound='PacketBase')
 
@@ -28,10 +69,16 @@ class PacketBase(metaclass=PacketMeta):
     __fields__: dict[str, 'Field'] = {}
     __local_fields_names__: List[str] = []
     __raw_mapping__: Dict[str, str] = {}
-    __modified__: bool
+    __modified__: Union[bool, int]
     __loading__: bool
     __no_optionals__: bool = False
     __parent__: 'Optional[PacketBase]' = None
+    __raw__: Optional[Dict[str, Any]] = None
+    __use_slots__: bool = False
+    # trust level of the raw data loaded without the level in the call
+    __trust__: Trust = DEFAULT_TRUST
+    __storage_names__: tuple[str, ...] = ()
+    __slots__ = ()
 
     def __init__(self, __strict__=True, **kwargs) -> None:
         """Constructor
@@ -46,6 +93,9 @@ class PacketBase(metaclass=PacketMeta):
         """
         self.has_modified = True
         self.__loading__ = True
+        if self.__use_slots__:
+            self.__parent__ = None
+            self.__raw__ = None
         for field_name, field_processor in self.__fields__.items():
             r = kwargs.get(field_name, None)
             try:
@@ -84,10 +134,16 @@ class PacketBase(metaclass=PacketMeta):
         Args:
             state (dict): restored state
         """
-        self.__dict__.update(state) # type: ignore
+        if self.__use_slots__:
+            for k, v in state.items():
+                setattr(self, k, v)
+        else:
+            self.__dict__.update(state) # type: ignore
         self.__modified__ = False
 
     def __getstate__(self) -> object:
+        if self.__use_slots__:
+            return {k: getattr(self, k) for k in self.__storage_names__ if hasattr(self, k)}
         return self.__dict__.copy()
 
     def __iter__(self):
@@ -95,7 +151,9 @@ class PacketBase(metaclass=PacketMeta):
             yield getattr(self, field_name)
 
     def __deepcopy__(self, memo) -> Self:
-        return pickle.loads(pickle.dumps(self, protocol=-1))
+        c = self.clone()
+        memo[id(self)] = c
+        return c
 
     def __len__(self) -> int:
         return len(self.__fields__)
@@ -112,13 +170,37 @@ class PacketBase(metaclass=PacketMeta):
     def loading(self) -> bool:
         return self.__loading__
 
-    def is_modified(self) -> bool:
-        return self.__modified__
-    
-    def set_modified(self):
-        self.__modified__ = True
+    def is_modified(self, since: int = 0) -> bool:
+        """Check if the packet is changed
+
+        Args:
+            since (int, optional): version to check the changes after. Defaults to 0.
+
+        Returns:
+            bool: true if the packet is changed after the `since` version
+        """
+        return self.__modified__ > since
+
+    def set_modified(self, version: Optional[int] = None):
+        if version is None:
+            version = next_version()
+        self.__modified__ = version
         if self.__parent__:
-            self.__parent__.set_modified()
+            self.__parent__.set_modified(version)
+
+    def compact_changes(self, since: int):
+        """Forget the change stamps not newer than `since`.
+        Used by `ChangeJournal` when all the consumers have seen them.
+
+        Args:
+            since (int): version seen by all the consumers
+        """
+        if not self.__modified__:
+            return
+        for f in self.__fields__.values():
+            f.compact(self, since)
+        if self.__modified__ <= since:
+            self.__modified__ = False
 
     def no_optionals(self):
         return self.__no_optionals__
@@ -129,37 +211,365 @@ class PacketBase(metaclass=PacketMeta):
             field.set_ro(ro)
 
     @classmethod
-    def load(cls: Type[T], raw_data, strict=True) -> T:
+    def load(cls: Type[T], raw_data, strict=True, trust: Optional[Trust] = None) -> T:
         """Load packet from iterable (dict, list, etc...)
 
         Args:
             raw_data (dict | list | iterable): data to load to packet fields
             strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+            trust (Optional[Trust], optional): `trusted`, `checked` or `strict` validation of the raw data,
+                applied to the nested packets too. Defaults to `__trust__` of the class.
+
+        Returns:
+            T: loaded packet
+        """
+        if trust is None:
+            loader = cls.__dict__.get('__load_fn__') or cls._loader()
+            return loader(cls, raw_data, strict)
+        # the level is passed to the nested packets by generated loaders, the context is for the rest
+        token = current_trust.set(validate_trust(trust))
+        try:
+            return cls._loader(trust)(cls, raw_data, strict)
+        finally:
+            current_trust.reset(token)
+
+    @classmethod
+    def load_many(cls: Type[T], raw_items: Iterable[Any], strict=True, trust: Optional[Trust] = None) -> List[T]:
+        """Load packets from the iterable of raw data.
+        Loader of the class is resolved once for the whole batch.
+
+        Args:
+            raw_items (Iterable[Any]): raw data of the packets
+            strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+            trust (Optional[Trust], optional): validation level of the raw data, see `load`. Defaults to `__trust__` of the class.
+
+        Returns:
+            List[T]: loaded packets
+        """
+        token = current_trust.set(validate_trust(trust)) if trust is not None else None
+        try:
+            if cls.load.__func__ is not PacketBase.load.__func__: # type: ignore
+                load = cls.load
+                return [load(raw_data, strict) for raw_data in raw_items]
+            loader = cls._loader(current_trust.get())
+            return [loader(cls, raw_data, strict) for raw_data in raw_items]
+        finally:
+            if token is not None:
+                current_trust.reset(token)
+
+    @classmethod
+    def iter_load(cls: Type[T], fileobj: IO, strict=True, compression: Optional[str] = 'auto', chunk_size: Optional[int] = None, trust: Optional[Trust] = None) -> Iterator[T]:
+        """Load packets from the stream of JSON records (NDJSON or JSON text sequence).
+        The stream is read in chunks of `chunk_size`, so only one chunk of packets is kept in memory.
+
+        Args:
+            fileobj (IO): readable file object (binary or text)
+            strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+            compression (Optional[str], optional): `gzip`, `bz2`, `lzma`, None or `auto` to detect. Defaults to 'auto'.
+            chunk_size (Optional[int], optional): size of the chunk to read at once. Defaults to `stream.DEFAULT_CHUNK_SIZE`.
+            trust (Optional[Trust], optional): validation level of the raw data, see `load`. Defaults to `__trust__` of the class.
+
+        Returns:
+            Iterator[T]: loaded packets
+        """
+        from .stream import iter_load
+        return iter_load(cls, fileobj, strict, compression, chunk_size, trust)
+
+    @classmethod
+    def load_parallel(cls: Type[T], records: Iterable[Union[str, bytes]], workers: Optional[int] = None, batch_size: int = 1000, strict=True, executor: 'Optional[Executor]' = None, trust: Optional[Trust] = None, max_pending: Optional[int] = None) -> List[T]:
+        """Decode JSON records to packets in the pool of processes.
+        Records are split to batches, every batch is parsed and loaded in a worker process
+        and the packets are pickled back. The class must be importable by workers.
+        Records are read as the workers take the batches, at most `max_pending` batches are in flight.
+
+        Args:
+            records (Iterable[Union[str, bytes]]): JSON encoded packets (e.x. NDJSON lines)
+            workers (Optional[int], optional): number of processes. Defaults to the CPU count.
+            batch_size (int, optional): records to send to a worker at once. Defaults to 1000.
+            strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+            executor (Optional[Executor], optional): pool to reuse instead of creating one per call. Defaults to None.
+            trust (Optional[Trust], optional): validation level of the raw data, see `load`.
+                Defaults to the level of the outer call, otherwise `__trust__` of the class.
+            max_pending (Optional[int], optional): batches submitted and not collected yet. Defaults to twice the workers.
+
+        Returns:
+            List[T]: loaded packets in the order of records
+        """
+        from .stream import load_parallel
+        return load_parallel(cls, records, workers, batch_size, strict, executor, trust, max_pending)
+
+    @classmethod
+    def load_lazy(cls: Type[T], raw_data) -> T:
+        """Load packet converting field values on first access.
+        Packets which don't support lazy loading are loaded as usual.
+
+        Args:
+            raw_data (dict | list | iterable): data to load to packet fields
 
         Returns:
             T: loaded packet
         """
-        pckt = cls(__strict__=False)
-        pckt.__loading__ = True
+        return cls.load(raw_data)
+
+    @classmethod
+    def _loader(cls, trust: Optional[Trust] = None) -> Callable:
+        """Get the loader of the class, making it on first use
+
+        Args:
+            trust (Optional[Trust], optional): trust level of the raw data, applied to the nested packets too.
+                Defaults to `__trust__` of the class, the nested packets use their own levels then.
+
+        Returns:
+            Callable: `load(cls, raw_data, strict)` function
+        """
+        if trust is None:
+            loader = cls.__dict__.get('__load_fn__')
+            if loader is None:
+                loader = cls._make_loader(None)
+                setattr(cls, '__load_fn__', loader)
+            return loader
+        loaders = cls.__dict__.get('__load_fns__')
+        if loaders is None:
+            loaders = {}
+            setattr(cls, '__load_fns__', loaders)
+        loader = loaders.get(trust)
+        if loader is None:
+            loader = loaders[trust] = cls._make_loader(trust)
+        return loader
+
+    @classmethod
+    def _make_loader(cls, trust: Optional[Trust]) -> Callable:
+        """Loader factory. Children may generate the loader specialized for their fields.
+
+        Args:
+            trust (Optional[Trust]): trust level of the raw data, None for `__trust__` of the class
+
+        Returns:
+            Callable: `load(cls, raw_data, strict)` function
+        """
+        return generic_loader(trust or cls.__trust__)
+
+    @classmethod
+    def _nested_loader(cls, trust: Optional[Trust]) -> Callable:
+        """Loader of the packet nested to the packet loaded with `trust` level.
+        Generated loaders resolve it once per field, containers once per batch.
+
+        Args:
+            trust (Optional[Trust]): level of the outer load, None if the load has no level
+
+        Returns:
+            Callable: `load(cls, raw_data, strict)` function
+        """
+        if cls.load.__func__ is not PacketBase.load.__func__: # type: ignore
+            return custom_loader(trust)
+        return cls._loader(trust)
+
+    @classmethod
+    def _binary_loader(cls, trust: Optional[Trust] = None) -> Callable:
+        """Get the binary loader of the class, making it on first use
+
+        Args:
+            trust (Optional[Trust], optional): trust level of the data. Defaults to `__trust__` of the class.
+
+        Returns:
+            Callable: `load(cls, data, pos, strict)` function returning the packet and the position after it
+        """
+        loaders = cls.__dict__.get('__binary_load_fns__')
+        if loaders is None:
+            loaders = {}
+            setattr(cls, '__binary_load_fns__', loaders)
+        loader = loaders.get(trust)
+        if loader is None:
+            loader = loaders[trust] = cls._make_binary_loader(trust)
+        return loader
+
+    @classmethod
+    def _make_binary_loader(cls, trust: Optional[Trust]) -> Callable:
+        """Binary loader factory. Packets with the tagged encoding generate the loader
+        decoding the fields straight to the instance storage.
+
+        Args:
+            trust (Optional[Trust]): trust level of the data, None for `__trust__` of the class
+
+        Returns:
+            Callable: `load(cls, data, pos, strict)` function
+        """
+        def load(cls: Type[T], data: memoryview, pos: int, strict=True) -> tuple[T, int]:
+            raw_data, pos = cls._read_binary(data, pos)
+            return cls.load(raw_data, strict, trust), pos
+        return load
+
+    @classmethod
+    def _reject_unknown(cls, raw_data: Any):
+        """Raise if raw data has the values unknown to the packet. Used with `strict` trust level.
+
+        Args:
+            raw_data (Any): raw packet
+
+        Raises:
+            ValueError: unknown values found
+        """
+        pass
+
+    @classmethod
+    def loadz(cls: Type[T], b: Union[bytes, bytearray, memoryview], strict=True, compression: str = 'zlib', zdict: Union[bool, bytes] = False) -> T:
+        """Load packet from compressed source
+
+        Args:
+            b (Union[bytes, bytearray, memoryview]): compressed packet
+            strict (bool, optional): strict loading. Defaults to True.
+            compression (str, optional): `zlib`, `gzip` or `lzma`. Defaults to 'zlib'.
+            zdict (Union[bool, bytes], optional): zlib preset dictionary used by `dumpz`,
+                True for `compression_dictionary` of the class. Defaults to False.
+
+        Returns:
+            PacketBase[T]: loaded packet
+        """
+        from ._compress import decompress
+        if zdict is True:
+            zdict = cls.compression_dictionary()
+        return cls.load(json.loadb(decompress(b, compression, zdict or None)), strict)
+
+    @classmethod
+    def load_binary(cls: Type[T], data: Union[bytes, bytearray, memoryview], strict=True, trust: Optional[Trust] = None) -> T:
+        """Load packet from the binary encoding made by `dump_binary`
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): encoded packet
+            strict (bool, optional): strict loading. Defaults to True.
+            trust (Optional[Trust], optional): validation level of the data, see `load`. Defaults to `__trust__` of the class.
+
+        Raises:
+            ValueError: data is broken
+
+        Returns:
+            PacketBase[T]: loaded packet
+        """
+        data = memoryview(data)
+        token = current_trust.set(validate_trust(trust)) if trust is not None else None
         try:
-            pckt._parse_raw(raw_data, strict)
+            pckt, pos = cls._binary_loader(trust)(cls, data, 0, strict)
+        except (IndexError, struct.error):
+            raise ValueError(f'Binary data of "{cls.__name__}" is truncated')
         finally:
-            pckt.__loading__ = False
-        pckt.on_packet_loaded()
+            if token is not None:
+                current_trust.reset(token)
+        if pos != len(data):
+            raise ValueError(f'Binary data of "{cls.__name__}" has {len(data) - pos} extra bytes')
         return pckt
 
     @classmethod
-    def loadz(cls: Type[T], s: bytes) -> T:
-        """Load packet from zip packed source string
+    def load_view(cls: Type[T], data: Union[bytes, bytearray, memoryview]) -> T:
+        """Load packet as a view over the binary encoding made by `dump_binary`.
+        The buffer is not copied, fields are decoded on their first access, nested packets are views too.
+        Unchanged view is dumped by `dump_binary` as the buffer itself.
+        Packets without lazy loading (`ArrayPacket`, `TablePacket`) are loaded as `load_binary` does.
+        The buffer must not be changed while the packet is in use.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): encoded packet
 
         Returns:
             PacketBase[T]: loaded packet
-        """        
-        return cls.load(json.loads(s.decode('zip')))
+        """
+        return cls.load_lazy(cls._view_binary(memoryview(data)))
+
+    @classmethod
+    def _read_binary_exact(cls, data: memoryview) -> Any:
+        """Decode raw packet occupying the whole `data`"""
+        try:
+            raw, pos = cls._read_binary(data, 0)
+        except (IndexError, struct.error):
+            raise ValueError(f'Binary data of "{cls.__name__}" is truncated')
+        if pos != len(data):
+            raise ValueError(f'Binary data of "{cls.__name__}" has {len(data) - pos} extra bytes')
+        return raw
+
+    @classmethod
+    def _view_binary(cls, data: memoryview) -> Any:
+        """Raw packet for `load_lazy` from the binary encoding occupying the whole `data`"""
+        return cls._read_binary_exact(data)
 
     @classmethod
-    def loads(cls: Type[T], s: str, strict=True) -> T:
-        return cls.load(json.loads(s), strict)
+    def _write_binary(cls, raw_data: Any, buf: bytearray):
+        """Append binary encoding of the raw packet to the buffer.
+        Packets without fixed schema are stored as length prefixed JSON.
+
+        Args:
+            raw_data (Any): dumped packet
+            buf (bytearray): buffer to append to
+        """
+        from ._binary import write_json
+        write_json(buf, raw_data)
+
+    @classmethod
+    def _read_binary(cls, data: memoryview, pos: int) -> tuple[Any, int]:
+        """Decode raw packet written by `_write_binary`
+
+        Args:
+            data (memoryview): binary data
+            pos (int): position of the packet
+
+        Returns:
+            tuple[Any, int]: raw packet and the position after it
+        """
+        from ._binary import read_json
+        return read_json(data, pos)
+
+    @classmethod
+    def compression_dictionary(cls) -> bytes:
+        """zlib preset dictionary made of the packet schema: raw field names and enum values
+        of the packet and nested packets. Classes with the same schema get the same dictionary.
+
+        Returns:
+            bytes: dictionary
+        """
+        zdict = cls.__dict__.get('__zdict__')
+        if zdict is None:
+            from ._compress import ZDICT_MAX_SIZE
+            words = cls._dictionary_words(set())
+            # zlib finds closer matches cheaper, so own words of the packet go last
+            zdict = ''.join(dict.fromkeys(words)).encode('utf-8')[-ZDICT_MAX_SIZE:]
+            setattr(cls, '__zdict__', zdict)
+        return zdict
+
+    @classmethod
+    def _dictionary_words(cls, seen: set) -> List[str]:
+        """Serialized fragments of the packet for `compression_dictionary`
+
+        Args:
+            seen (set): packet classes already visited
+
+        Returns:
+            List[str]: fragments
+        """
+        if cls in seen:
+            return []
+        seen.add(cls)
+        words = []
+        for field in cls.__fields__.values():
+            words.extend(field._typ.dictionary_words(seen))
+        return words
+
+    @classmethod
+    def loads(cls: Type[T], s: str, strict=True, trust: Optional[Trust] = None) -> T:
+        raw_data = json.loads(s)
+        return cls.load(raw_data, strict) if trust is None else cls.load(raw_data, strict, trust)
+
+    @classmethod
+    def loadb(cls: Type[T], b: Union[bytes, bytearray, memoryview], strict=True, trust: Optional[Trust] = None) -> T:
+        """Load packet from UTF-8 encoded JSON without decoding it to string
+
+        Args:
+            b (Union[bytes, bytearray, memoryview]): encoded packet
+            strict (bool, optional): strict loading. Defaults to True.
+            trust (Optional[Trust], optional): validation level of the raw data, see `load`. Defaults to `__trust__` of the class.
+
+        Returns:
+            PacketBase[T]: loaded packet
+        """
+        raw_data = json.loadb(b)
+        return cls.load(raw_data, strict) if trust is None else cls.load(raw_data, strict, trust)
 
     def update(self, raw_data):
         self._parse_raw(raw_data, update=True)
@@ -179,13 +589,79 @@ class PacketBase(metaclass=PacketMeta):
     def dump_partial(self, field_paths: DiffKeys):
         pass
 
-    def dumpz(self) -> bytes:
-        """Serialize packet to zipped bytes
+    def _apply_field(self, field_name: str, field: 'Field', r: Any):
+        """Merge raw patch into the field value, replacing the value only if it can't be merged in place"""
+        token = use_trust(self.__trust__)
+        try:
+            current = getattr(self, field_name) if r is not None else None
+            if current is None:
+                v = field.raw_to_py(r)
+            else:
+                v = field._typ.apply_partial(current, r)
+                if v is current:
+                    return
+        except Exception as e:
+            raise ValueError(f'Failed to parse "{self.__class__.__name__}::{field_name}": {e}')
+        finally:
+            if token is not None:
+                current_trust.reset(token)
+        setattr(self, field_name, v)
+
+    @classmethod
+    def _dumper(cls) -> Callable:
+        """Get the dumper of the class, making it on first use
 
         Returns:
-            str: serialized packet
-        """        
-        return json.dumps(self.dump()).encode('zip')
+            Callable: `dump(self, raw)` function
+        """
+        dumper = cls.__dict__.get('__dump_fn__')
+        if dumper is None:
+            dumper = cls._make_dumper()
+            setattr(cls, '__dump_fn__', dumper)
+        return dumper
+
+    @classmethod
+    def _make_dumper(cls) -> Callable:
+        """Dumper factory. Children may generate the dumper specialized for their fields.
+
+        Returns:
+            Callable: `dump(self, raw)` function
+        """
+        return dump_generic
+
+    def dumpz(self, compression: str = 'zlib', level: Optional[int] = None, zdict: Union[bool, bytes] = False) -> bytes:
+        """Serialize packet to compressed bytes
+
+        Args:
+            compression (str, optional): `zlib`, `gzip` or `lzma`. Defaults to 'zlib'.
+            level (Optional[int], optional): compression level. Defaults to the codec default.
+            zdict (Union[bool, bytes], optional): zlib preset dictionary,
+                True for `compression_dictionary` of the class. Defaults to False.
+
+        Returns:
+            bytes: serialized packet
+        """
+        from ._compress import compress
+        if zdict is True:
+            zdict = self.compression_dictionary()
+        return compress(json.dumpb(self.dump()), compression, level, zdict or None)
+
+    def dump_binary(self) -> bytes:
+        """Serialize packet to the compact binary encoding driven by the packet schema:
+        fields are identified by their ordinals, numbers are varints or doubles,
+        enums are ordinals, containers and nested packets are length prefixed.
+
+        Returns:
+            bytes: serialized packet
+        """
+        from .view import BinaryRecord
+        raw = self.__raw__
+        if type(raw) is BinaryRecord and not self.__modified__:
+            # unchanged view, pass it through
+            return bytes(raw.data)
+        buf = bytearray()
+        self._write_binary(self.dump(), buf)
+        return bytes(buf)
 
     def dumps(self, **kwargs) -> str:
         """Serialize packet to string
@@ -195,6 +671,25 @@ class PacketBase(metaclass=PacketMeta):
         """        
         return json.dumps(self.dump(), **kwargs)
 
+    def dumpb(self) -> bytes:
+        """Serialize packet to UTF-8 encoded JSON
+
+        Returns:
+            bytes: serialized packet
+        """
+        return json.dumpb(self.dump())
+
+    def encode_into(self, buf: bytearray) -> int:
+        """Append UTF-8 encoded JSON of the packet to the buffer
+
+        Args:
+            buf (bytearray): buffer to append to
+
+        Returns:
+            int: number of bytes appended
+        """
+        return json.encode_into(self.dump(), buf)
+
     def packet_fields(self):
         for field_name in self.__class__.__fields__:
             yield (field_name, getattr(self, field_name))
@@ -206,7 +701,49 @@ class PacketBase(metaclass=PacketMeta):
             return default
 
     def clone(self) -> Self:
-        return pickle.loads(pickle.dumps(self, -1))
+        """Copy the packet using it's schema.
+        Mutable field values (containers, nested packets) are copied by their typedefs,
+        immutable ones are shared. Modified flags are kept, the copy has no parent.
+
+        Returns:
+            Self: copy of the packet
+        """
+        cls = self.__class__
+        plan = cls.__dict__.get('__copy_plan__')
+        if plan is None:
+            plan = cls._copy_plan()
+        c = object.__new__(cls)
+        if cls.__use_slots__:
+            for name in cls.__storage_names__:
+                try:
+                    setattr(c, name, getattr(self, name))
+                except AttributeError:
+                    pass
+            c.__parent__ = None
+        else:
+            d = self.__dict__.copy()
+            d.pop('__parent__', None)
+            c.__dict__ = d
+        for name, copy_py, parented in plan:
+            v = getattr(c, name, None)
+            if v is not None:
+                v = copy_py(v)
+                if parented:
+                    v.__parent__ = c
+                setattr(c, name, v)
+        return c
+
+    @classmethod
+    def _copy_plan(cls) -> tuple:
+        """Storage names of the fields which values must be copied on `clone`
+        with the copy function and whether the copy must be linked to the packet.
+        """
+        plan = tuple(
+            (f._instance_name, f._typ.copy_py, f._typ.has_modified)
+            for f in cls.__fields__.values() if f._typ.is_mutable()
+        )
+        setattr(cls, '__copy_plan__', plan)
+        return plan
 
     def on_packet_loaded(self):
         """Callback on packet load or update.
@@ -224,12 +761,89 @@ class PacketBase(metaclass=PacketMeta):
         """
         pass
 
-    def diff_keys(self) -> DiffKeys:
+    def diff_keys(self, since: int = 0) -> DiffKeys:
+        """Paths of the changed fields
+
+        Args:
+            since (int, optional): version to get the changes after. Defaults to 0.
+
+        Returns:
+            DiffKeys: changed paths
+        """
         res = {}
-        if self.__modified__:
+        if self.__modified__ > since:
             for f in self.__fields__.values():
-                v = f.diff_keys(self)
+                v = f.diff_keys(self, since)
                 if v is None:
                     continue
                 res[f.name] = v
         return res
+
+
+def load_generic(cls: Type[T], raw_data, strict=True) -> T:
+    """Load packet through the constructor and `_parse_raw`.
+    Used for the packets which can't have generated loader.
+    """
+    if current_trust.get() == 'strict':
+        cls._reject_unknown(raw_data)
+    pckt = cls(__strict__=False)
+    pckt.__loading__ = True
+    try:
+        pckt._parse_raw(raw_data, strict)
+    finally:
+        pckt.__loading__ = False
+    pckt.on_packet_loaded()
+    return pckt
+
+
+def dump_generic(pckt: 'PacketBase', raw=True) -> Dict[str, Any]:
+    """Dump packet field by field with `Field.py_to_raw`.
+    Used for the packets which can't have generated dumper.
+    """
+    result = {}
+    for field_name, field in pckt.__fields__.items():
+        raw_value = field.py_to_raw(getattr(pckt, field_name))
+        if raw_value is not None:
+            result[field.name if raw else field_name] = raw_value
+    return result
+
+
+def load_custom(cls: Type[T], raw_data, strict=True) -> T:
+    """Load nested packet of the class with customized `load`"""
+    return cls.load(raw_data, strict)
+
+
+_custom_loaders: Dict[str, Callable] = {}
+
+
+def custom_loader(trust: Optional[Trust]) -> Callable:
+    """`load_custom` passing the trust level of the outer load"""
+    if trust is None:
+        return load_custom
+    loader = _custom_loaders.get(trust)
+    if loader is None:
+        def loader(cls: Type[T], raw_data, strict=True) -> T:
+            return cls.load(raw_data, strict, trust)
+        _custom_loaders[trust] = loader
+    return loader
+
+
+_generic_loaders: Dict[str, Callable] = {}
+
+
+def generic_loader(trust: Trust) -> Callable:
+    """`load_generic` applying the trust level.
+    `Field.raw_to_py` takes the level from the context, so it is set for the nested packets too.
+    """
+    if trust == DEFAULT_TRUST:
+        return load_generic
+    loader = _generic_loaders.get(trust)
+    if loader is None:
+        def loader(cls: Type[T], raw_data, strict=True) -> T:
+            token = current_trust.set(trust)
+            try:
+                return load_generic(cls, raw_data, strict)
+            finally:
+                current_trust.reset(token)
+        _generic_loaders[trust] = loader
+    return loader
@@ -0,0 +1,216 @@
+# -*- coding:utf-8 -*-
+"""Row store of the table packets."""
+from typing import TYPE_CHECKING, Any, Dict, Generic, Iterator, MutableMapping, Optional, TypeVar, Union
+from ._journal import next_version
+from ._trust import current_trust, use_trust
+from ._types import DiffKeys
+from .processors.base import compact_container_changes
+if TYPE_CHECKING:
+    from .field import Field
+    from .packet import TablePacket
+
+
+__all__ = ['TableRows']
+
+
+_V = TypeVar('_V')
+
+
+class TableRows(MutableMapping[str, _V], Generic[_V]):
+    """Rows of the table packet keyed by raw name.
+    Rows are decoded with the `__default_field__` of the table on the first access,
+    the rows not accessed are dumped as they were loaded. The loaded raw mapping must not
+    be changed while the rows are in use.
+
+    Changes are journaled as in `HashT`, the rows changed in place are found by their own stamps.
+    """
+    __parent__: 'Optional[TablePacket]' = None
+    __modified__: Union[bool, int] = False
+    __diff__: Optional[Dict[str, int]] = None
+
+    def __init__(self, table: 'TablePacket', raw: Dict[str, Any]) -> None:
+        """Constructor
+
+        Args:
+            table (TablePacket): packet owning the rows
+            raw (Dict[str, Any]): raw rows
+        """
+        self.__parent__ = table
+        self._field: 'Field[_V]' = table.__class__.__default_field__ # type: ignore
+        # every row is either in `_raw` (not accessed) or in `_rows` (decoded or assigned)
+        self._raw = raw
+        self._rows: Dict[str, _V] = {}
+
+    def __getitem__(self, name: str) -> _V:
+        rows = self._rows
+        if name in rows:
+            return rows[name]
+        r = self._raw.pop(name)
+        token = use_trust(self.__parent__.__trust__)
+        try:
+            v = self._field.raw_to_py(r)
+        except Exception as e:
+            self._raw[name] = r
+            raise ValueError(f'Failed to parse "{self.__parent__.__class__.__name__}::{name}": {e}')
+        finally:
+            if token is not None:
+                current_trust.reset(token)
+        if v is not None and self._field._typ.has_modified:
+            v.__parent__ = self # type: ignore
+        rows[name] = v
+        return v
+
+    def __setitem__(self, name: str, value: _V):
+        value = self._field.py_to_py(value)
+        if value is not None and self._field._typ.has_modified:
+            value.__parent__ = self # type: ignore
+        self._raw.pop(name, None)
+        self._rows[name] = value
+        self._changed(name)
+
+    def __delitem__(self, name: str):
+        if name in self._rows:
+            del self._rows[name]
+        else:
+            del self._raw[name]
+        self._changed(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows or name in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._raw
+        yield from self._rows
+
+    def __len__(self) -> int:
+        return len(self._raw) + len(self._rows)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TableRows):
+            return self.dump() == other.dump()
+        return super().__eq__(other)
+
+    def _changed(self, name: str):
+        version = next_version()
+        self.set_modified(version)
+        if self.__diff__ is None:
+            self.__diff__ = {}
+        self.__diff__[name] = version
+
+    def is_modified(self, since: int = 0) -> bool:
+        return self.__modified__ > since
+
+    def set_modified(self, version: Optional[int] = None):
+        if version is None:
+            version = next_version()
+        self.__modified__ = version
+        # the table without declared fields is falsy
+        if self.__parent__ is not None:
+            self.__parent__.set_modified(version)
+
+    def compact_changes(self, since: int):
+        compact_container_changes(self, since, self._rows.values())
+
+    def dump(self) -> Dict[str, Any]:
+        """Raw rows, the rows not accessed are passed through
+
+        Returns:
+            Dict[str, Any]: raw rows
+        """
+        result = dict(self._raw)
+        to_raw = self._field.py_to_raw
+        for name, v in self._rows.items():
+            r = to_raw(v)
+            if r is not None:
+                result[name] = r
+        return result
+
+    def copy(self, table: 'TablePacket') -> 'TableRows[_V]':
+        """Copy of the rows for the copy of the table
+
+        Args:
+            table (TablePacket): copy of the table
+
+        Returns:
+            TableRows[_V]: rows
+        """
+        c = TableRows(table, dict(self._raw))
+        copy_value = self._field._typ.copy_py
+        parented = self._field._typ.has_modified
+        for name, v in self._rows.items():
+            if v is not None:
+                v = copy_value(v)
+                if parented:
+                    v.__parent__ = c # type: ignore
+            c._rows[name] = v
+        c.__modified__ = self.__modified__
+        if self.__diff__:
+            c.__diff__ = dict(self.__diff__)
+        return c
+
+    def diff_keys(self, since: int = 0) -> DiffKeys:
+        res: DiffKeys = {}
+        if self.__modified__ <= since:
+            return res
+        diff = self.__diff__
+        if diff:
+            for name, version in diff.items():
+                if version > since:
+                    res[name] = '1'
+        typ = self._field._typ
+        if typ.has_modified:
+            for name, v in self._rows.items():
+                if v is not None and name not in res and v.is_modified(since): # type: ignore
+                    res[name] = typ.diff_keys(v, since)
+        return res
+
+    def dump_partial(self, paths: DiffKeys) -> Dict[str, Any]:
+        res = {}
+        typ = self._field._typ
+        for name, sub in paths.items():
+            if name not in self:
+                # None stands for the deleted row
+                res[name] = None
+            elif isinstance(sub, dict):
+                res[name] = typ.dump_partial(self[name], sub)
+            else:
+                res[name] = self._field.py_to_raw(self[name])
+        return res
+
+    def apply_partial(self, patch: Dict[str, Any]):
+        token = use_trust(self.__parent__.__trust__)
+        try:
+            self._apply_partial(patch)
+        finally:
+            if token is not None:
+                current_trust.reset(token)
+
+    def _apply_partial(self, patch: Dict[str, Any]):
+        typ = self._field._typ
+        for name, r in patch.items():
+            if r is None:
+                if name in self:
+                    del self[name]
+                continue
+            current = self[name] if name in self else None
+            if current is None:
+                self[name] = self._field.raw_to_py(r)
+                continue
+            v = typ.apply_partial(current, r)
+            if v is not current:
+                self[name] = v
+
+    def __reduce__(self):
+        # the table relinks the rows on unpickling
+        return (_load_rows, (self.__parent__.__class__, self.dump()))
+
+    def __repr__(self) -> str:
+        return f'<TableRows of {len(self)}>'
+
+
+def _load_rows(table: 'type[TablePacket]', raw: Dict[str, Any]) -> TableRows:
+    rows = object.__new__(TableRows)
+    rows._field = table.__default_field__ # type: ignore
+    rows._raw = raw
+    rows._rows = {}
+    return rows
@@ -0,0 +1,75 @@
+# -*- coding:utf-8 -*-
+"""Trust levels of the raw data being loaded.
+
+- `trusted`: raw values are converted without `check_raw`, e.g. for the data of own services
+- `checked`: every raw value is checked with `check_raw` before the conversion
+- `strict`: as `checked`, raw keys unknown to the packet (or extra list items) are rejected
+
+The level is taken from the `trust` argument of the load call, otherwise from `__trust__` of
+the packet class. Level passed to the call applies to the nested packets too.
+"""
+from typing import Literal, Optional, TypeAlias
+from contextvars import ContextVar, Token
+
+
+__all__ = ['Trust', 'TRUST_LEVELS', 'DEFAULT_TRUST', 'current_trust', 'validate_trust', 'checks_raw', 'use_trust']
+
+
+Trust: TypeAlias = Literal['trusted', 'checked', 'strict']
+
+
+TRUST_LEVELS = ('trusted', 'checked', 'strict')
+
+
+# python started with -O skips the checks as before
+DEFAULT_TRUST: Trust = 'checked' if __debug__ else 'trusted'
+
+
+# trust level passed to the outer load call, None if the call has no level
+current_trust: ContextVar[Optional[Trust]] = ContextVar('packets_trust', default=None)
+
+
+def validate_trust(trust: str) -> Trust:
+    """Check the trust level name
+
+    Args:
+        trust (str): level name
+
+    Raises:
+        ValueError: unknown level
+
+    Returns:
+        Trust: level
+    """
+    if trust not in TRUST_LEVELS:
+        raise ValueError(f'Unknown trust level "{trust}", expected one of {TRUST_LEVELS}')
+    return trust # type: ignore
+
+
+def checks_raw(default: Optional[Trust] = None) -> bool:
+    """Whether raw values loaded now must be checked with `check_raw`
+
+    Args:
+        default (Optional[Trust], optional): level of the packet class used if the outer call has no level.
+            Defaults to DEFAULT_TRUST.
+    """
+    trust = current_trust.get() or default
+    if trust is None:
+        return __debug__
+    return trust != 'trusted'
+
+
+def use_trust(trust: Trust) -> Optional[Token]:
+    """Put the level of the packet class to the context for the typedefs converting its values,
+    unless the outer call has set the level. Used by the packet methods getting the raw data
+    outside of `load`, e.g. patches and lazily loaded values.
+
+    Args:
+        trust (Trust): level of the packet class
+
+    Returns:
+        Optional[Token]: token to reset the context with, None if the context is not changed
+    """
+    if trust == DEFAULT_TRUST or current_trust.get() is not None:
+        return None
+    return current_trust.set(trust)
@@ -0,0 +1,220 @@
+# -*- coding:utf-8 -*-
+"""asyncio streams of packets.
+
+Every packet is a JSON encoded frame, frames are either new line terminated (`ndjson`)
+or prefixed with 4 bytes big endian length (`length`).
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union, Self
+import asyncio
+import struct
+from . import _json as json
+if TYPE_CHECKING:
+    from ._packetbase import PacketBase
+
+
+__all__ = ['PacketStreamReader', 'PacketStreamWriter']
+
+
+_LENGTH = struct.Struct('>I')
+_FRAMINGS = ('ndjson', 'length')
+DEFAULT_MAX_FRAME = 16 << 20
+_READ_SIZE = 64 << 10
+
+
+def _check_framing(framing: str):
+    if framing not in _FRAMINGS:
+        raise ValueError(f'Unknown framing "{framing}"')
+
+
+class PacketStreamReader():
+    """Reader of packets from `asyncio.StreamReader`
+
+    e.x.
+    async for pckt in PacketStreamReader(reader, Message):
+        ...
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, packet: 'Union[Type[PacketBase], Dict[Any, Type[PacketBase]]]', framing: str = 'ndjson', key: Optional[str] = None, max_frame: int = DEFAULT_MAX_FRAME) -> None:
+        """Constructor
+
+        Args:
+            reader (asyncio.StreamReader): stream to read
+            packet (Union[Type[PacketBase], Dict[Any, Type[PacketBase]]]): packet class or the dispatch table
+                from the raw value of `key` field to packet class
+            framing (str, optional): `ndjson` or `length`. Defaults to 'ndjson'.
+            key (Optional[str], optional): raw name of the field to dispatch by. Required with the dispatch table.
+            max_frame (int, optional): max size of the frame. Defaults to DEFAULT_MAX_FRAME.
+        """
+        _check_framing(framing)
+        if isinstance(packet, dict) and key is None:
+            raise ValueError('Dispatch table requires the key field')
+        self._reader = reader
+        self._packet = packet
+        self._framing = framing
+        self._key = key
+        self._max_frame = max_frame
+        # lines are split here, `readuntil` of the stream is limited by its own `limit`, 64 KiB by default
+        self._buffer = bytearray()
+
+    async def _read_line(self) -> Optional[bytes]:
+        buffer = self._buffer
+        start = 0
+        while True:
+            end = buffer.find(b'\n', start)
+            if end >= 0:
+                if end > self._max_frame:
+                    raise ValueError(f'Frame of {end} bytes is too large')
+                line = bytes(buffer[:end + 1])
+                del buffer[:end + 1]
+                return line
+            if len(buffer) > self._max_frame:
+                raise ValueError(f'Frame of more than {self._max_frame} bytes is too large')
+            start = len(buffer)
+            chunk = await self._reader.read(_READ_SIZE)
+            if not chunk:
+                # last line without the new line
+                line = bytes(buffer)
+                buffer.clear()
+                return line or None
+            buffer += chunk
+
+    async def read_frame(self) -> Optional[bytes]:
+        """Read the next frame
+
+        Raises:
+            ValueError: frame is too large or the stream ended inside the frame
+
+        Returns:
+            Optional[bytes]: encoded frame or None at the end of the stream
+        """
+        reader = self._reader
+        if self._framing == 'ndjson':
+            while True:
+                line = await self._read_line()
+                if line is None or line.strip():
+                    return line
+        try:
+            header = await reader.readexactly(_LENGTH.size)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise ValueError('Stream ended inside frame header')
+        size, = _LENGTH.unpack(header)
+        if size > self._max_frame:
+            raise ValueError(f'Frame of {size} bytes is too large')
+        try:
+            return await reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            raise ValueError('Stream ended inside frame')
+
+    async def read(self) -> 'Optional[PacketBase]':
+        """Read and load the next packet
+
+        Returns:
+            Optional[PacketBase]: packet or None at the end of the stream
+        """
+        frame = await self.read_frame()
+        if frame is None:
+            return None
+        raw = json.loadb(frame)
+        packet = self._packet
+        if isinstance(packet, dict):
+            try:
+                packet = packet[raw[self._key]]
+            except (KeyError, TypeError):
+                raise ValueError(f'No packet for "{self._key}" of {raw}')
+        return packet.load(raw)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> 'PacketBase':
+        pckt = await self.read()
+        if pckt is None:
+            raise StopAsyncIteration()
+        return pckt
+
+
+class PacketStreamWriter():
+    """Writer of packets to `asyncio.StreamWriter`.
+
+    Frames written during one loop iteration are coalesced and sent with a single `write`,
+    concurrent `send` calls share a single `drain`.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, framing: str = 'ndjson') -> None:
+        """Constructor
+
+        Args:
+            writer (asyncio.StreamWriter): stream to write
+            framing (str, optional): `ndjson` or `length`. Defaults to 'ndjson'.
+        """
+        _check_framing(framing)
+        self._writer = writer
+        self._length = framing == 'length'
+        self._frames: List[bytes] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def write(self, pckt: 'PacketBase'):
+        """Put the packet to the pending frames, they are written at the end of the loop iteration
+
+        Args:
+            pckt (PacketBase): packet to write
+        """
+        self.write_raw(pckt.dump())
+
+    def write_raw(self, raw_data: Any):
+        """Same as `write` for already dumped packet
+
+        Args:
+            raw_data (Any): dumped packet
+        """
+        data = json.dumpb(raw_data)
+        if self._length:
+            self._frames.append(_LENGTH.pack(len(data)))
+            self._frames.append(data)
+        else:
+            self._frames.append(data + b'\n')
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self):
+        """Write pending frames to the stream at once"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._frames:
+            data = b''.join(self._frames)
+            self._frames.clear()
+            self._writer.write(data)
+
+    async def send(self, pckt: 'PacketBase'):
+        """Write the packet and wait until the stream is drained
+
+        Args:
+            pckt (PacketBase): packet to send
+        """
+        self.write(pckt)
+        await self.drain()
+
+    async def drain(self):
+        """Write pending frames and wait until the stream is drained.
+        All the callers during one loop iteration wait for the same drain.
+        """
+        if self._drain_task is None:
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain_burst())
+        await asyncio.shield(self._drain_task)
+
+    async def _drain_burst(self):
+        # let the other coroutines of the burst put their frames
+        await asyncio.sleep(0)
+        self._drain_task = None
+        self.flush()
+        await self._writer.drain()
+
+    async def close(self):
+        """Write pending frames and close the stream"""
+        self.flush()
+        self._writer.close()
+        await self._writer.wait_closed()
@@ -1,8 +1,9 @@
 # -*- coding:utf-8 -*-
 from typing import Generic, TypeVar, TYPE_CHECKING, Union, Optional, Any, overload, Type, Self, Literal
-from copy import deepcopy
 from ._types import DiffKeys
-from .processors.base import TypeDef
+from ._journal import next_version
+from ._trust import checks_raw
+from .processors.base import TypeDef, invalid_raw
 from .processors import Subpacket
 if TYPE_CHECKING:
     from ._packetbase import PacketBase
@@ -41,14 +42,15 @@ class Field(Generic[FT]):
             if self._required and value is not None:
                 assert self._typ.check_py(value), f'Value {value} of {type(value)} is not valid'
         value = self._typ.py_to_py(value)
+        version = 0 if instance.__loading__ else next_version()
         if self._typ.has_modified and value is not None:
             value.__parent__ = instance # type: ignore
-            if not instance.__loading__:
-                value.set_modified() # type: ignore
-        if not instance.__loading__:
+            if version:
+                value.set_modified(version) # type: ignore
+        if version:
             setattr(instance, self._instance_name, value)
-            setattr(instance, self._instance_modified_name, True)
-            instance.set_modified()
+            setattr(instance, self._instance_modified_name, version)
+            instance.set_modified(version)
         else:
             if value is not None:
                 setattr(instance, self._instance_name, value)
@@ -65,6 +67,11 @@ class Field(Generic[FT]):
         if hasattr(instance, self._instance_name):
             return getattr(instance, self._instance_name)
         else:
+            raw = instance.__raw__
+            if raw is not None:
+                r = raw.get(self.name, None)
+                if r is not None:
+                    return self._load_lazy(instance, r)
             if self.has_default:
                 dflt = self.default
                 setattr(instance, self._instance_name, dflt)
@@ -72,6 +79,8 @@ class Field(Generic[FT]):
             return None
     
     def __delete__(self, instance: 'PacketBase'):
+        if instance.__raw__ is not None and self.name in instance.__raw__:
+            instance.__raw__ = {k: v for k, v in instance.__raw__.items() if k != self.name}
         delattr(instance, self._instance_name)
         delattr(instance, self._instance_modified_name)
         instance.set_modified()
@@ -117,14 +126,26 @@ class Field(Generic[FT]):
     @property 
     def default(self) -> Optional[FT]:
         if self.has_default:
-            return deepcopy(self._default_value) # type: ignore
+            return self._typ.copy_py(self._default_value) # type: ignore
         else:
             return None
 
-    def is_modified(self, instance: 'PacketBase') -> bool:
+    def is_modified(self, instance: 'PacketBase', since: int = 0) -> bool:
         if self._typ.has_modified:
-            return getattr(instance, self._instance_name).is_modified()
-        return getattr(instance, self._instance_modified_name, False)
+            value = getattr(instance, self._instance_name, None)
+            if value is not None:
+                return value.is_modified(since)
+        return getattr(instance, self._instance_modified_name, False) > since
+
+    def compact(self, instance: 'PacketBase', since: int):
+        """Forget the change stamps of the field not newer than `since`"""
+        if self._typ.has_modified:
+            value = getattr(instance, self._instance_name, None)
+            if value is not None:
+                value.compact_changes(since)
+        modified = getattr(instance, self._instance_modified_name, False)
+        if modified and modified <= since:
+            setattr(instance, self._instance_modified_name, False)
     
     def py_to_py(self, v: FT, strict=True) -> Optional[FT]:
         res: Optional[FT]
@@ -149,10 +170,10 @@ class Field(Generic[FT]):
             else:
                 v = None
         else:
-            if __debug__:
-                if not self._typ.check_raw(r):
-                    raise ValueError(f'RAW value {r} ({type(r)}) is not valid')
-            v = self._typ.raw_to_py(r, strict)
+            if checks_raw():
+                v = self._typ.parse_raw(r, strict)
+            else:
+                v = self._typ.raw_to_py(r, strict)
         if v is None and self._required and strict:
             raise ValueError(f'Field "{self.name}" required')
         return v # type: ignore
@@ -165,14 +186,35 @@ class Field(Generic[FT]):
                 r = self._typ.py_to_raw(self._default_value) # type: ignore
         else:
             if __debug__:
-                if not self._typ.check_py(v):
-                    raise ValueError(f'Value {v} ({type(v)}) is not valid')
-            r = self._typ.py_to_raw(v)
+                r = self._typ.emit_py(v)
+            else:
+                r = self._typ.py_to_raw(v)
         
         if self._required and r is None:
             raise ValueError(f'Field required "{self.name}"')
         return r
 
+    def _load_lazy(self, instance: 'PacketBase', r) -> Optional[FT]:
+        """Convert the raw value kept by lazily loaded packet and store it as loaded one"""
+        typ = self._typ
+        try:
+            if not checks_raw(instance.__trust__):
+                v = typ.raw_to_py_lazy(r)
+            elif type(typ).raw_to_py_lazy is TypeDef.raw_to_py_lazy:
+                # nothing to defer, checked and converted in one pass
+                v = typ.parse_raw(r)
+            else:
+                if not typ.check_raw(r):
+                    raise invalid_raw(r)
+                v = typ.raw_to_py_lazy(r)
+        except Exception as e:
+            raise ValueError(f'Failed to parse "{instance.__class__.__name__}::{instance.__raw_mapping__[self.name]}": {e}')
+        if v is not None:
+            if self._typ.has_modified:
+                v.__parent__ = instance # type: ignore
+            setattr(instance, self._instance_name, v)
+        return v
+
     def clone(self) -> Self:
         return self.__class__(self._typ, self.name, self._default_value, self._required, self._override)
 
@@ -182,10 +224,13 @@ class Field(Generic[FT]):
     def set_ro(self, ro: bool):
         self._typ.set_ro(ro)
 
-    def diff_keys(self, instance: 'PacketBase') -> Optional[Union[str, None, DiffKeys]]:
-        if self.is_modified(instance):
+    def diff_keys(self, instance: 'PacketBase', since: int = 0) -> Optional[Union[str, None, DiffKeys]]:
+        if self.is_modified(instance, since):
+            if getattr(instance, self._instance_modified_name, False) > since:
+                # the value is assigned after `since`, so it is changed whole
+                return '1'
             data = getattr(instance, self._instance_name)
-            return self._typ.diff_keys(data)
+            return self._typ.diff_keys(data, since)
         return None
 
 
@@ -1,9 +1,18 @@
 # -*- coding:utf-8 -*-
-from typing import Type, Self, Dict, Any, Generic, TYPE_CHECKING, cast, List
+from typing import Type, Self, Dict, Any, Generic, TYPE_CHECKING, cast, List, Callable, Iterable, Iterator, Union, FrozenSet, Tuple, Optional
+from functools import lru_cache
+from weakref import WeakKeyDictionary, WeakSet
 import types
-from ._packetbase import PacketBase, DiffKeys
+import struct
+from . import _json as json
+from ._binary import write_uvarint, read_uvarint, write_json, read_json
+from .view import BinaryRecord
+from ._packetbase import PacketBase, DiffKeys, generic_loader
+from ._trust import Trust, current_trust, validate_trust
+from ._codegen import compile_dict_loader, compile_list_loader, compile_binary_loader, compile_dict_dumper, compile_list_dumper
 from .field import Field
 from .processors.subpacket import PT
+from ._rows import TableRows
 
 
 class Packet(PacketBase):
@@ -17,6 +26,8 @@ class Packet(PacketBase):
         b: B
     Serializes to {a: int, b: {a: str}}
     """
+    __slots__ = ()
+
     def _parse_raw(self, raw_js, strict=True, update=False):
         for field_name, field in self.__fields__.items():
             r = raw_js.get(field.name, None)
@@ -28,7 +39,99 @@ class Packet(PacketBase):
                 raise ValueError(f'Failed to parse "{self.__class__.__name__}::{field_name}": {e}')
             setattr(self, field_name, v)
 
+    @classmethod
+    def _make_loader(cls, trust: Optional[Trust]) -> Callable:
+        if not _can_generate(cls, Packet._parse_raw):
+            return super()._make_loader(trust)
+        return compile_dict_loader(cls, trust)
+
+    @classmethod
+    def _make_binary_loader(cls, trust: Optional[Trust]) -> Callable:
+        if not _can_generate_binary(cls, Packet._parse_raw, Packet._read_binary):
+            return super()._make_binary_loader(trust)
+        return compile_binary_loader(cls, trust)
+
+    @classmethod
+    def _reject_unknown(cls, raw_data: Dict[str, Any]):
+        raw_mapping = cls.__raw_mapping__
+        for k in raw_data:
+            if k not in raw_mapping:
+                raise ValueError(f'Failed to parse "{cls.__name__}": Unknown field "{k}"')
+
+    @classmethod
+    def load_lazy(cls, raw_data: Dict[str, Any]) -> Self:
+        """Load packet keeping `raw_data` and converting a field only on it's first access.
+        Only required fields presence is checked here, raw values are validated on access.
+        Nested packets are loaded lazily too, untouched fields are dumped as they were loaded.
+        `raw_data` must not be changed while the packet is in use.
+
+        Args:
+            raw_data (dict): data to load to packet fields
+
+        Returns:
+            Self: loaded packet
+        """
+        for field_name, field in cls.__fields__.items():
+            if field.required and raw_data.get(field.name, None) is None:
+                raise ValueError(f'Failed to parse "{cls.__name__}::{field_name}": Field "{field.name}" required')
+        if cls.__init__ is PacketBase.__init__:
+            # nothing to construct, all the fields are left unset
+            pckt = object.__new__(cls)
+            pckt.has_modified = True
+            pckt.__loading__ = False
+            pckt.__modified__ = False
+            if cls.__use_slots__:
+                pckt.__parent__ = None
+        else:
+            pckt = cls(__strict__=False)
+        pckt.__raw__ = raw_data
+        pckt.on_packet_loaded()
+        return pckt
+
     def dump(self, raw=True) -> Dict[str, Any]:
+        dumper = self.__class__.__dict__.get('__dump_fn__') or self._dumper()
+        return dumper(self, raw)
+
+    @classmethod
+    def dump_many(cls, packets: Iterable[Self], raw=True) -> List[Dict[str, Any]]:
+        """Dump packets of the class with the dumper resolved once for the whole batch
+
+        Args:
+            packets (Iterable[Self]): packets to dump
+            raw (bool, optional): whether to use raw field names. Defaults to True.
+
+        Returns:
+            List[Dict[str, Any]]: dumped packets
+        """
+        if cls.dump is not Packet.dump:
+            return [pckt.dump(raw) for pckt in packets]
+        dumper = cls._dumper()
+        return [dumper(pckt, raw) if pckt.__class__ is cls else pckt.dump(raw) for pckt in packets]
+
+    def _dump_lazy(self, raw=True) -> Dict[str, Any]:
+        """Dump lazily loaded packet passing not accessed raw values through"""
+        source = self.__raw__ or {}
+        result = {}
+        for field_name, field in self.__fields__.items():
+            if not hasattr(self, field._instance_name) and source.get(field.name, None) is not None:
+                raw_value = source[field.name]
+                if type(raw_value) is BinaryRecord:
+                    raw_value = raw_value.to_raw()
+            else:
+                raw_value = field.py_to_raw(getattr(self, field_name))
+            if raw_value is not None:
+                result[field.name if raw else field_name] = raw_value
+        return result
+
+    @classmethod
+    def _make_dumper(cls) -> Callable:
+        if not _plain_fields(cls):
+            return cls._dump_generic
+        return compile_dict_dumper(cls)
+
+    def _dump_generic(self, raw=True) -> Dict[str, Any]:
+        if self.__raw__ is not None:
+            return self._dump_lazy(raw)
         result = {}
         for field_name, field in self.__fields__.items():
             raw_value = field.py_to_raw(getattr(self, field_name))
@@ -47,34 +150,107 @@ class Packet(PacketBase):
                     if raw_value is not None:
                         result[field.name] = raw_value
                 else:
-                    result[field.name] = getattr(self, fn).dump_partial(subpaths)
+                    result[field.name] = field._typ.dump_partial(getattr(self, fn), subpaths)
         return result
 
+    def apply_partial(self, patch: Dict[str, Any]) -> Self:
+        """Apply the patch made by `dump_partial`.
+        Only patched fields are touched, nested packets and hashes are merged in place.
+
+        Args:
+            patch (Dict[str, Any]): raw patch
+
+        Returns:
+            Self: the packet itself
+        """
+        raw_mapping = self.__raw_mapping__
+        fields = self.__fields__
+        for raw_name, r in patch.items():
+            field_name = raw_mapping.get(raw_name)
+            if field_name is not None:
+                self._apply_field(field_name, fields[field_name], r)
+        return self
+
     def __reduce_for_fields__(self) -> tuple[Any, ...]:
-        ns = {k: v for k, v in self.__class__.__dict__.items() if isinstance(v, Field)}
-        ns.update({
-            '__fields__': self.__class__.__dict__['__fields__'],
-            '__local_fields_names__': self.__class__.__dict__.get('__local_fields_names__', []),
-            '__raw_mapping__': self.__class__.__dict__['__raw_mapping__']
-        })
+        # dynamic classes are pickled as the key of the class cache, named subclasses by reference
+        cls = self.__class__
+        key = cls.__dict__.get('__dynamic_key__')
         return (
-            create_packet_class,
-            (self.__class__.__name__, self.__class__.__bases__, ns),
-            self.__dict__
+            create_cached_packet if key is not None else create_packet,
+            key if key is not None else (cls, ),
+            self.__getstate__()
         )
 
+    @classmethod
+    def _write_binary(cls, raw_data: Dict[str, Any], buf: bytearray):
+        # fields are tagged with ordinal + 1, missing ones are skipped, 0 ends the packet
+        get = raw_data.get
+        for tag, (field_name, field) in enumerate(cls.__fields__.items(), 1):
+            r = get(field.name)
+            if r is not None:
+                write_uvarint(buf, tag)
+                try:
+                    field._typ.write_binary(r, buf)
+                except Exception as e:
+                    raise ValueError(f'Failed to dump "{cls.__name__}::{field_name}": {e}')
+        buf.append(0)
+
+    @classmethod
+    def _read_binary(cls, data: memoryview, pos: int) -> tuple[Dict[str, Any], int]:
+        fields = tuple(cls.__fields__.values())
+        raw_data = {}
+        while True:
+            tag, pos = read_uvarint(data, pos)
+            if not tag:
+                return raw_data, pos
+            if tag > len(fields):
+                raise ValueError(f'Unknown field #{tag} of "{cls.__name__}"')
+            field = fields[tag - 1]
+            raw_data[field.name], pos = field._typ.read_binary(data, pos)
+
+    @classmethod
+    def _view_binary(cls, data: memoryview) -> BinaryRecord:
+        return BinaryRecord(cls, data)
+
+    @classmethod
+    def _dictionary_words(cls, seen: set) -> List[str]:
+        if cls in seen:
+            return []
+        words = super()._dictionary_words(seen)
+        words.extend(f'{json.dumps(field.name)}:' for field in cls.__fields__.values())
+        return words
+
+    @classmethod
+    def set_ro(cls, ro: bool):
+        key = cls.__dict__.get('__dynamic_key__')
+        if key is not None:
+            # cached classes are shared, so their state is the state of the declared class
+            key[1].set_ro(ro)
+            return
+        super().set_ro(ro)
+        for dynamic in tuple(_dynamic_classes.get(cls, ())):
+            for field in dynamic.__fields__.values():
+                field.set_ro(ro)
+
     @classmethod
     def with_fields(cls, *field_names: str) -> Type[Self]:
-        fields_set = set(field_names) # raw names!!!
-        cls_fields_set = set(cls.__raw_mapping__.keys()) # raw names !!!
-        if len(fields_set&cls_fields_set) != len(fields_set):
-            raise TypeError(f'Failed to prepare packet. Unknown fields: {fields_set-(fields_set&cls_fields_set)}')
-        normal_naming = {raw_name: cls.__raw_mapping__[raw_name] for raw_name in fields_set }
-        namespace: dict[str, Any] = {field_name: cls.__fields__[field_name].clone() for field_name in normal_naming.values()}
-        partial_class: Type[Self] = types.new_class(f'Partial{cls.__name__}', (Packet, ), exec_body=lambda ns: ns.update(namespace))
-        setattr(partial_class, '__reduce__', cls.__reduce_for_fields__)
-        return partial_class
+        """Packet class with only some of the fields of this one.
+        Classes are cached, so the same fields give the same class.
+
+        Args:
+            field_names (str): raw names of the fields
+
+        Raises:
+            TypeError: some of the fields are unknown
 
+        Returns:
+            Type[Self]: partial packet class
+        """
+        fields_set = frozenset(field_names) # raw names!!!
+        unknown = fields_set - cls.__raw_mapping__.keys()
+        if unknown:
+            raise TypeError(f'Failed to prepare packet. Unknown fields: {set(unknown)}')
+        return partial_packet_class(cls, fields_set)
 
 
 class ArrayPacket(PacketBase):
@@ -91,7 +267,11 @@ class ArrayPacket(PacketBase):
     Serializes to [int, [str, float]]
     !!! Can't store optional fields.
     """    
+    __slots__ = ()
     __no_optionals__: bool = True
+    # byte order of `struct_layout`
+    __byte_order__: str = '<'
+
     def _parse_raw(self, raw_js_list, strict=True, update=False):
         for (field_name, field), r in zip(self.__fields__.items(), raw_js_list):
             try:
@@ -99,52 +279,358 @@ class ArrayPacket(PacketBase):
             except Exception as e:
                 raise ValueError(f'Failed to parse "{self.__class__.__name__}::{field_name}": {e}')
             setattr(self, field_name, v)
+
+    @classmethod
+    def _make_loader(cls, trust: Optional[Trust]) -> Callable:
+        if not _can_generate(cls, ArrayPacket._parse_raw):
+            return super()._make_loader(trust)
+        return compile_list_loader(cls, trust)
+
+    @classmethod
+    def _make_binary_loader(cls, trust: Optional[Trust]) -> Callable:
+        if not _can_generate_binary(cls, ArrayPacket._parse_raw, ArrayPacket._read_binary):
+            return super()._make_binary_loader(trust)
+        return compile_binary_loader(cls, trust)
+
+    @classmethod
+    def _reject_unknown(cls, raw_data: List[Any]):
+        if len(raw_data) > len(cls.__fields__):
+            raise ValueError(f'Failed to parse "{cls.__name__}": {len(raw_data)} values for {len(cls.__fields__)} fields')
     
     def dump(self) -> List[Any]:
+        dumper = self.__class__.__dict__.get('__dump_fn__') or self._dumper()
+        return dumper(self)
+
+    @classmethod
+    def _make_dumper(cls) -> Callable:
+        if not _plain_fields(cls):
+            return cls._dump_generic
+        return compile_list_dumper(cls)
+
+    @classmethod
+    def struct_layout(cls) -> struct.Struct:
+        """Fixed layout of the packet with only fixed width fields (numbers, bools, unixtime)
+
+        Raises:
+            TypeError: packet has not fixed width field
+
+        Returns:
+            struct.Struct: layout of the raw values
+        """
+        layout = cls.__dict__.get('__struct__')
+        if layout is None:
+            formats = []
+            for field_name, field in cls.__fields__.items():
+                fmt = field._typ.struct_format()
+                if fmt is None:
+                    raise TypeError(f'Field "{cls.__name__}::{field_name}" has no fixed width')
+                formats.append(fmt)
+            layout = struct.Struct(cls.__byte_order__ + ''.join(formats))
+            setattr(cls, '__struct__', layout)
+        return layout
+
+    def pack(self) -> bytes:
+        """Serialize packet with `struct_layout`
+
+        Returns:
+            bytes: packed packet
+        """
+        return self.struct_layout().pack(*self.dump())
+
+    def pack_into(self, buffer: Union[bytearray, memoryview], offset: int = 0):
+        """Serialize packet with `struct_layout` to the writable buffer
+
+        Args:
+            buffer (Union[bytearray, memoryview]): buffer to write to
+            offset (int, optional): offset in the buffer. Defaults to 0.
+        """
+        self.struct_layout().pack_into(buffer, offset, *self.dump())
+
+    @classmethod
+    def pack_many(cls, packets: Iterable[Self]) -> bytes:
+        """Serialize packets with `struct_layout` one after another
+
+        Args:
+            packets (Iterable[Self]): packets to pack
+
+        Returns:
+            bytes: packed packets
+        """
+        pack = cls.struct_layout().pack
+        return b''.join([pack(*raw) for raw in cls.dump_many(packets)])
+
+    @classmethod
+    def unpack_from(cls, buffer: Union[bytes, bytearray, memoryview], offset: int = 0, strict=True) -> Self:
+        """Load packet packed with `struct_layout`
+
+        Args:
+            buffer (Union[bytes, bytearray, memoryview]): buffer to read
+            offset (int, optional): offset in the buffer. Defaults to 0.
+            strict (bool, optional): strict loading. Defaults to True.
+
+        Returns:
+            Self: loaded packet
+        """
+        try:
+            values = cls.struct_layout().unpack_from(buffer, offset)
+        except struct.error as e:
+            raise ValueError(f'Failed to unpack "{cls.__name__}": {e}')
+        return cls.load(values, strict)
+
+    @classmethod
+    def iter_unpack(cls, buffer: Union[bytes, bytearray, memoryview], strict=True) -> Iterator[Self]:
+        """Load packets packed one after another with `struct_layout`
+
+        Args:
+            buffer (Union[bytes, bytearray, memoryview]): buffer of the size multiple of the layout size
+            strict (bool, optional): strict loading. Defaults to True.
+
+        Yields:
+            Iterator[Self]: loaded packets
+        """
+        try:
+            unpacked = cls.struct_layout().iter_unpack(buffer)
+        except struct.error as e:
+            raise ValueError(f'Failed to unpack "{cls.__name__}": {e}')
+        loader = cls.__dict__.get('__load_fn__') or cls._loader()
+        for values in unpacked:
+            yield loader(cls, values, strict)
+
+    @classmethod
+    def _write_binary(cls, raw_data: List[Any], buf: bytearray):
+        for tag, ((field_name, field), r) in enumerate(zip(cls.__fields__.items(), raw_data), 1):
+            if r is not None:
+                write_uvarint(buf, tag)
+                try:
+                    field._typ.write_binary(r, buf)
+                except Exception as e:
+                    raise ValueError(f'Failed to dump "{cls.__name__}::{field_name}": {e}')
+        buf.append(0)
+
+    @classmethod
+    def _read_binary(cls, data: memoryview, pos: int) -> tuple[List[Any], int]:
+        fields = tuple(cls.__fields__.values())
+        raw_data: List[Any] = [None] * len(fields)
+        while True:
+            tag, pos = read_uvarint(data, pos)
+            if not tag:
+                return raw_data, pos
+            if tag > len(fields):
+                raise ValueError(f'Unknown field #{tag} of "{cls.__name__}"')
+            raw_data[tag - 1], pos = fields[tag - 1]._typ.read_binary(data, pos)
+
+    @classmethod
+    def dump_many(cls, packets: Iterable[Self]) -> List[List[Any]]:
+        """Dump packets of the class with the dumper resolved once for the whole batch
+
+        Args:
+            packets (Iterable[Self]): packets to dump
+
+        Returns:
+            List[List[Any]]: dumped packets
+        """
+        if cls.dump is not ArrayPacket.dump:
+            return [pckt.dump() for pckt in packets]
+        dumper = cls._dumper()
+        return [dumper(pckt) if pckt.__class__ is cls else pckt.dump() for pckt in packets]
+
+    def _dump_generic(self, raw=True) -> List[Any]:
         return [field.py_to_raw(getattr(self, field_name)) for field_name, field in self.__fields__.items()]
 
     def dump_partial(self, field_paths: DiffKeys):
         return self.dump()
 
+    def apply_partial(self, patch: List[Any]) -> Self:
+        """Apply the patch made by `dump_partial`, which is the whole packet
+
+        Args:
+            patch (List[Any]): raw patch
+
+        Returns:
+            Self: the packet itself
+        """
+        for (field_name, field), r in zip(self.__fields__.items(), patch):
+            self._apply_field(field_name, field, r)
+        return self
+
 
 class TablePacket(Packet, Generic[PT]):
     """Same as a normal packet, but intended to use with initially unknown amount of rows.
 
     __default_field__ must be defined to show the structure of a row.
+    With __row_store__ the rows are kept in `TableRows` decoded on the first access
+    instead of the fields of the generated class, see `table_rows`.
     """
     __default_field__: PT
+    __row_store__: bool = False
+    __rows__: Optional[TableRows[PT]] = None
     
     @classmethod
-    def load(cls, raw_data, strict=True) -> Self:
+    def load(cls, raw_data, strict=True, trust: Optional[Trust] = None) -> Self:
         """Load packet from iterable (dict, list, etc...)
 
         Args:
             raw_data (dict | list | iterable): data to load to packet fields
             strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+            trust (Optional[Trust], optional): validation level of the raw data, see `PacketBase.load`.
+                Rows of the row store are decoded on access, so they are checked as the class requires.
+                Defaults to `__trust__` of the class.
 
         Returns:
             T: loaded packet
         """
         assert issubclass(cls, TablePacket)
+        if trust is not None:
+            token = current_trust.set(validate_trust(trust))
+            try:
+                return cls.load(raw_data, strict)
+            finally:
+                current_trust.reset(token)
+        # loaded packets are of the table class with rows, rows are found against the declared table
+        cls = cls.__dict__.get('__table__', cls)
         if cls.__dict__.get('__default_field__', None) is None:
             raise AttributeError(f'TablePacket "{cls.__name__}" __default_field__ is mandatory')
-        curr_fields = set(cls.__fields__.keys())
-        curr_fields.update(cls.__raw_mapping__.keys())
-        new_fields = set(raw_data.keys())
-        new_ones = new_fields - curr_fields
-        namespace: Dict[str, Any] = {k: v for k, v in cls.__dict__.items()}
-        for k in raw_data.keys():
-            if k in new_ones:
-                namespace[k] = cast(Field[PT], cls.__default_field__).clone()
-        partial_class: Type[TablePacket[PT]] = types.new_class(f'PartialTable{cls.__name__}', cls.__bases__, exec_body = lambda ns: ns.clear() or ns.update(namespace))
-        pckt = partial_class(__strict__=False)
-        pckt.__loading__ = True
-        try:
-            pckt._parse_raw(raw_data, strict)
-        finally:
-            pckt.__loading__ = False
-        pckt.on_packet_loaded()
-        return cast(Self, pckt)
+        fields = cls.__fields__
+        raw_mapping = cls.__raw_mapping__
+        trust = current_trust.get()
+        if cls.__row_store__:
+            raw_rows = {k: r for k, r in raw_data.items() if k not in fields and k not in raw_mapping}
+            declared = {k: r for k, r in raw_data.items() if k in raw_mapping} if len(raw_rows) != len(raw_data) else {}
+            pckt = cls._loader(trust)(cls, declared, strict)
+            pckt.__rows__ = TableRows(pckt, raw_rows)
+            return pckt
+        rows = frozenset(k for k in raw_data.keys() if k not in fields and k not in raw_mapping)
+        partial_class = table_packet_class(cls, rows)
+        if len(rows) > GENERATED_ROWS_MAX:
+            return cast(Self, generic_loader(trust or cls.__trust__)(partial_class, raw_data, strict))
+        return cast(Self, partial_class._loader(trust)(partial_class, raw_data, strict))
+
+    @classmethod
+    def set_ro(cls, ro: bool):
+        default = getattr(cls, '__default_field__', None)
+        if default is not None:
+            # rows of the tables loaded later are cloned from the default field
+            default.set_ro(ro)
+        super().set_ro(ro)
+
+    @classmethod
+    def load_lazy(cls, raw_data: Dict[str, Any]) -> Self:
+        return cls.load(raw_data)
+
+    def table_rows(self) -> TableRows[PT]:
+        """Rows of the row store table
+
+        Raises:
+            TypeError: the table has no row store
+
+        Returns:
+            TableRows[PT]: rows keyed by raw name
+        """
+        rows = getattr(self, '__rows__', None)
+        if rows is None:
+            if not self.__row_store__:
+                raise TypeError(f'TablePacket "{self.__class__.__name__}" has no row store')
+            rows = self.__rows__ = TableRows(self, {})
+        return rows
+
+    def dump(self, raw=True) -> Dict[str, Any]:
+        result = super().dump(raw)
+        rows = getattr(self, '__rows__', None)
+        if rows is not None:
+            result.update(rows.dump())
+        return result
+
+    def diff_keys(self, since: int = 0) -> DiffKeys:
+        res = super().diff_keys(since)
+        rows = getattr(self, '__rows__', None)
+        if rows is not None:
+            res.update(rows.diff_keys(since))
+        return res
+
+    def dump_partial(self, field_paths: DiffKeys) -> Dict[str, Any]:
+        rows = getattr(self, '__rows__', None)
+        if rows is None:
+            return super().dump_partial(field_paths)
+        raw_mapping = self.__raw_mapping__
+        result = super().dump_partial({k: v for k, v in field_paths.items() if k in raw_mapping})
+        result.update(rows.dump_partial({k: v for k, v in field_paths.items() if k not in raw_mapping}))
+        return result
+
+    def apply_partial(self, patch: Dict[str, Any]) -> Self:
+        """Apply the patch made by `dump_partial`.
+        Rows are fields of the packet class, so the patch with new rows makes a new packet.
+        Rows of the row store are merged in place.
+
+        Args:
+            patch (Dict[str, Any]): raw patch
+
+        Returns:
+            Self: the packet itself or the new one if rows are added
+        """
+        raw_mapping = self.__raw_mapping__
+        new_rows = {k: r for k, r in patch.items() if k not in raw_mapping}
+        if not new_rows:
+            return super().apply_partial(patch)
+        super().apply_partial({k: r for k, r in patch.items() if k in raw_mapping})
+        if self.__row_store__:
+            self.table_rows().apply_partial(new_rows)
+            return self
+        raw_data = self.dump()
+        raw_data.update(new_rows)
+        return self.load(raw_data)
+
+    @classmethod
+    def _write_binary(cls, raw_data: Dict[str, Any], buf: bytearray):
+        # rows are not known by the schema
+        write_json(buf, raw_data)
+
+    @classmethod
+    def _read_binary(cls, data: memoryview, pos: int) -> tuple[Dict[str, Any], int]:
+        return read_json(data, pos)
+
+    @classmethod
+    def _view_binary(cls, data: memoryview) -> Dict[str, Any]:
+        return cls._read_binary_exact(data)
+
+    @classmethod
+    def _dictionary_words(cls, seen: set) -> List[str]:
+        if cls in seen:
+            return []
+        default = getattr(cls, '__default_field__', None)
+        words = list(default._typ.dictionary_words(seen)) if default is not None else []
+        words.extend(super()._dictionary_words(seen))
+        return words
+
+    @classmethod
+    def _make_dumper(cls) -> Callable:
+        # compiling the code for the big tables costs more than it saves
+        if len(cls.__fields__) > GENERATED_ROWS_MAX:
+            return cls._dump_generic
+        return super()._make_dumper()
+
+    def compact_changes(self, since: int):
+        super().compact_changes(since)
+        rows = getattr(self, '__rows__', None)
+        if rows is not None:
+            rows.compact_changes(since)
+
+    def clone(self) -> Self:
+        c = super().clone()
+        rows = getattr(self, '__rows__', None)
+        if rows is not None:
+            c.__rows__ = rows.copy(c)
+        return c
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        rows = getattr(self, '__rows__', None)
+        if rows is not None:
+            rows.__parent__ = self
+
+    def __eq__(self, other: Self) -> bool:
+        if not super().__eq__(other):
+            return False
+        return not self.__row_store__ or self.table_rows() == other.table_rows()
 
     __reduce__ = Packet.__reduce_for_fields__
 
@@ -156,9 +642,100 @@ class TablePacket(Packet, Generic[PT]):
                 assert df is not None
                 return df
             raise AttributeError()
+    else:
+        def __getattr__(self, name: str) -> Any:
+            # rows of the row store are accessed as attributes too
+            if not name.startswith('__'):
+                try:
+                    rows = object.__getattribute__(self, '__rows__')
+                except AttributeError:
+                    rows = None
+                if rows is not None and name in rows:
+                    return rows[name]
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+
+def _can_generate(cls: Type[PacketBase], parse_raw: Callable) -> bool:
+    """Check if generated code may replace the generic one for `cls`.
+    Generated code inlines `Field` and `_parse_raw` behavior, so it is not possible
+    if any of them is customized.
+    """
+    if cls._parse_raw is not parse_raw or cls.__init__ is not PacketBase.__init__:
+        return False
+    return _plain_fields(cls)
+
+
+def _can_generate_binary(cls: Type[PacketBase], parse_raw: Callable, read_binary: Callable) -> bool:
+    """Check if generated binary loader may replace `_read_binary` followed by `load`"""
+    if cls.load.__func__ is not PacketBase.load.__func__ or cls._read_binary.__func__ is not read_binary.__func__: # type: ignore
+        return False
+    return _can_generate(cls, parse_raw)
+
+
+def _plain_fields(cls: Type[PacketBase]) -> bool:
+    return all(type(field) is Field for field in cls.__fields__.values())
+
+
+# tables with more rows are loaded and dumped without generated code
+GENERATED_ROWS_MAX = 64
+
+
+# dynamic classes are reused for the same shapes, the cache is bounded to not leak classes on random ones
+DYNAMIC_CLASSES_CACHE_SIZE = 512
+
+
+# cached classes of the declared ones, they follow `set_ro` of the declared class
+_dynamic_classes: 'WeakKeyDictionary[type, WeakSet[type]]' = WeakKeyDictionary()
+
+
+def _clone_field(field: Field) -> Field:
+    """Field of the cached class with the read only state of the declared one"""
+    c = field.clone()
+    if field._typ._ro:
+        c.set_ro(True)
+    return c
+
+
+def _register_dynamic(cls: Type[PacketBase], dynamic: Type[PacketBase]) -> Type[PacketBase]:
+    classes = _dynamic_classes.get(cls)
+    if classes is None:
+        classes = _dynamic_classes[cls] = WeakSet()
+    classes.add(dynamic)
+    return dynamic
+
+
+@lru_cache(maxsize=DYNAMIC_CLASSES_CACHE_SIZE)
+def partial_packet_class(cls: Type[Packet], field_names: FrozenSet[str]) -> Type[Packet]:
+    """Packet class with the fields of `cls` having raw names from `field_names`. Made by `Packet.with_fields`."""
+    namespace: Dict[str, Any] = {
+        name: _clone_field(field) for name, field in cls.__fields__.items() if field.name in field_names
+    }
+    namespace['__dynamic_key__'] = (partial_packet_class, cls, field_names)
+    namespace['__reduce__'] = Packet.__reduce_for_fields__
+    return _register_dynamic(cls, types.new_class(f'Partial{cls.__name__}', (Packet, ), exec_body=lambda ns: ns.update(namespace)))
+
+
+@lru_cache(maxsize=DYNAMIC_CLASSES_CACHE_SIZE)
+def table_packet_class(cls: Type[TablePacket], rows: FrozenSet[str]) -> Type[TablePacket]:
+    """Subclass of the table `cls` with the fields for `rows` in sorted order. Made by `TablePacket.load`."""
+    default = cast(Field, cls.__default_field__)
+    namespace: Dict[str, Any] = {row: _clone_field(default) for row in sorted(rows)}
+    namespace['__table__'] = cls
+    namespace['__dynamic_key__'] = (table_packet_class, cls, rows)
+    return _register_dynamic(cls, types.new_class(f'PartialTable{cls.__name__}', (cls, ), exec_body=lambda ns: ns.update(namespace)))
+
+
+def create_cached_packet(make_class: Callable, cls: Type[PacketBase], key: Any) -> PacketBase:
+    """Unpickle the packet of the dynamic class"""
+    return create_packet(make_class(cls, key))
+
+
+def create_packet(cls: Type[PacketBase]) -> PacketBase:
+    return cls(__strict__=False)
 
 
 def create_packet_class(name, bases, namespace) -> PacketBase:
+    """Unpickle the packet pickled with the whole class namespace by the older versions"""
     partial_class = types.new_class(f'Partial{name}', bases, exec_body = lambda ns: ns.update(namespace))
     pckt = partial_class(__strict__=False)
     return pckt
@@ -1,8 +1,12 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Optional, List, Iterable, Self, Union, Type
-from .base import TypeDef
+from typing import TypeVar, Optional, List, Dict, Iterable, Self, Union, Type, Any, Tuple
+from .base import TypeDef, invalid_raw, invalid_py, copy_container_state, compact_container_changes
 from .subpacket import Subpacket
+from .._binary import write_count, read_count, write_item, read_item
+from .._trust import checks_raw
 from .._packetbase import PacketBase
+from .._journal import next_version
+from .._types import DiffKeys
 
 
 __all__ = ['Array', 'ArrayT']
@@ -12,48 +16,147 @@ _VT=TypeVar('_VT')
 
 
 class ArrayT(List[_VT]):
+    """List tracking the changes of it's elements.
+    Assigned and appended elements are journaled by index, the other changes
+    moving the elements (insert, delete, sort, ...) mark the whole array as changed.
+    """
     _ro = False
     __parent__: Optional[PacketBase] = None
-    __modified__: bool = False
+    __modified__: Union[bool, int] = False
+    __diff__: Optional[Dict[int, int]] = None
+    __shape__: Union[bool, int] = False
 
     def __init__(self, iterable: Iterable[_VT] = (), size: Optional[int] = None) -> None:
         self._size = size
         self._ro = False
         super().__init__(iterable)
     
-    def __setitem__(self, index: int, value: _VT):
+    def __setitem__(self, index: Union[int, slice], value: _VT):
         if not self._ro:
             super().__setitem__(index, value)
-            if hasattr(value, 'set_modified'):
-                value.__parent__ = self # type: ignore
+            if isinstance(index, slice):
+                self._adopt(self)
+                self._reshaped()
+                return
+            self._adopt((value,))
+            self._changed(index if index >= 0 else index + super().__len__())
     
-    def __delitem__(self, index: int):
+    def __delitem__(self, index: Union[int, slice]):
         if not self._ro:
             super().__delitem__(index)
+            self._reshaped()
     
     def __len__(self) -> int:
         return super().__len__() or self._size or 0
+
+    def __iadd__(self, values: Iterable[_VT]) -> Self:
+        self.extend(values)
+        return self
+
+    def __imul__(self, n: int) -> Self:
+        if not self._ro:
+            super().__imul__(n)
+            self._reshaped()
+        return self
     
     def insert(self, index: int, value: _VT):
         if not self._ro:
             if self._size is None or len(self) < self._size:
+                n = super().__len__()
                 super().insert(index, value)
+                self._adopt((value,))
+                if index >= n:
+                    self._changed(n)
+                else:
+                    self._reshaped()
             else:
                 raise IndexError('Sized arrays doesnt support inserting or adding')
 
+    def append(self, value: _VT):
+        if not self._ro:
+            super().append(value)
+            self._adopt((value,))
+            self._changed(super().__len__() - 1)
+
+    def extend(self, values: Iterable[_VT]):
+        if not self._ro:
+            n = super().__len__()
+            super().extend(values)
+            self._adopt(super().__getitem__(slice(n, None)))
+            version = next_version()
+            self.set_modified(version)
+            diff = self._diff()
+            for i in range(n, super().__len__()):
+                diff[i] = version
+
+    def pop(self, index: int = -1) -> _VT:
+        if self._ro:
+            # the other changes are silently skipped, but pop has to return the removed element
+            raise TypeError('Read-only array doesnt support pop')
+        value = super().pop(index)
+        self._reshaped()
+        return value
+
+    def remove(self, value: _VT):
+        if not self._ro:
+            super().remove(value)
+            self._reshaped()
+
+    def clear(self):
+        if not self._ro:
+            super().clear()
+            self._reshaped()
+
+    def sort(self, *args, **kwargs):
+        if not self._ro:
+            super().sort(*args, **kwargs)
+            self._reshaped()
+
+    def reverse(self):
+        if not self._ro:
+            super().reverse()
+            self._reshaped()
+
+    def _adopt(self, values: Iterable[Any]):
+        for value in values:
+            if hasattr(value, 'set_modified'):
+                value.__parent__ = self # type: ignore
+
+    def _diff(self) -> Dict[int, int]:
+        if self.__diff__ is None:
+            self.__diff__ = {}
+        return self.__diff__
+
+    def _changed(self, index: int):
+        version = next_version()
+        self.set_modified(version)
+        self._diff()[index] = version
+
+    def _reshaped(self):
+        # indexes of the journaled changes are not valid anymore
+        version = next_version()
+        self.set_modified(version)
+        self.__shape__ = version
+        self.__diff__ = None
+
     def set_ro(self, ro: bool):
         self._ro = ro
         for vi in self:
             if isinstance(vi, PacketBase):
                 vi.set_ro(ro)
 
-    def is_modified(self) -> bool:
-        return self.__modified__
+    def is_modified(self, since: int = 0) -> bool:
+        return self.__modified__ > since
     
-    def set_modified(self):
-        self.__modified__ = True
+    def set_modified(self, version: Optional[int] = None):
+        if version is None:
+            version = next_version()
+        self.__modified__ = version
         if self.__parent__:
-            self.__parent__.set_modified()
+            self.__parent__.set_modified(version)
+
+    def compact_changes(self, since: int):
+        compact_container_changes(self, since, self)
 
     @property
     def size(self) -> Optional[int]:
@@ -78,13 +181,71 @@ class Array(TypeDef[ArrayT[_VT]]):
         return isinstance(r, (list, tuple))
     
     def raw_to_py(self, r, strict = True) -> ArrayT[_VT]:
-        return ArrayT[_VT]([self._typ.raw_to_py(ri, strict) for ri in r], self._size)
+        return self._adopted(ArrayT[_VT](self._typ.raw_to_py_many(r, strict), self._size))
+
+    def parse_raw(self, r, strict = True) -> ArrayT[_VT]:
+        if not isinstance(r, (list, tuple)):
+            raise invalid_raw(r)
+        return self._adopted(ArrayT[_VT](self._typ.parse_raw_many(r, strict), self._size))
+
+    def raw_to_py_lazy(self, r, strict = True) -> ArrayT[_VT]:
+        return self._adopted(ArrayT[_VT]([self._typ.raw_to_py_lazy(ri, strict) for ri in r], self._size))
+
+    def _adopted(self, v: ArrayT[_VT]) -> ArrayT[_VT]:
+        # elements changed in place report it to the array
+        if self._typ.has_modified:
+            for vi in v:
+                if vi is not None:
+                    vi.__parent__ = v # type: ignore
+        return v
 
     def py_to_raw(self, v: ArrayT[_VT]) -> list:
-        return list(map(self._typ.py_to_raw, v))
+        return self._typ.py_to_raw_many(v)
+
+    def emit_py(self, v: ArrayT[_VT]) -> list:
+        if not isinstance(v, (list, tuple)):
+            raise invalid_py(v)
+        return self._typ.emit_py_many(v)
 
     def py_to_py(self, v: Optional[ArrayT[_VT]]) -> Optional[ArrayT[_VT]]:
-        return None if v is None else ArrayT[_VT](v, self._size) if not isinstance(v, ArrayT) else v
+        return None if v is None else self._adopted(ArrayT[_VT](v, self._size)) if not isinstance(v, ArrayT) else v
+
+    def write_binary(self, r: Any, buf: bytearray):
+        nullable = None in r
+        write_count(buf, len(r), nullable)
+        write = self._typ.write_binary
+        if nullable:
+            for ri in r:
+                write_item(buf, ri, write)
+        else:
+            for ri in r:
+                write(ri, buf)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        n, nullable, pos = read_count(data, pos)
+        read = self._typ.read_binary
+        r = []
+        for _ in range(n):
+            ri, pos = read_item(data, pos, read) if nullable else read(data, pos)
+            r.append(ri)
+        return r, pos
+
+    def dictionary_words(self, seen: set) -> Iterable[str]:
+        return self._typ.dictionary_words(seen)
+
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: ArrayT[_VT]) -> ArrayT[_VT]:
+        if not self._typ.is_mutable():
+            c = ArrayT[_VT](v, v._size)
+        else:
+            c = ArrayT[_VT](map(self._typ.copy_py, v), v._size)
+            for vi, ci in zip(v, c):
+                if getattr(vi, '__parent__', None) is v:
+                    ci.__parent__ = c
+        copy_container_state(v, c)
+        return c
     
     def zero_value(self) -> ArrayT[_VT]:
         if self._size:
@@ -106,6 +267,57 @@ class Array(TypeDef[ArrayT[_VT]]):
         c.set_ro(False)
         return c
 
+    def diff_keys(self, data: ArrayT[_VT], since: int = 0) -> Union[str, DiffKeys]:
+        if data.__shape__ > since:
+            return '1'
+        res = {}
+        diff = data.__diff__
+        if diff:
+            for i, version in diff.items():
+                if version > since:
+                    res[i] = '1'
+        if self._typ.has_modified:
+            # elements changed in place are found by their own stamps
+            diff_value = self._typ.diff_keys
+            for i, vi in enumerate(data):
+                if vi is not None and i not in res and vi.is_modified(since): # type: ignore
+                    res[i] = diff_value(vi, since)
+        return res
+
+    def dump_partial(self, v: ArrayT[_VT], paths: Any) -> Any:
+        if not isinstance(paths, dict):
+            return self.py_to_raw(v)
+        # whole elements and patches of the elements are kept apart to replace the first ones on apply,
+        # indexes are strings to keep the patch JSON compatible
+        whole = {}
+        patches = {}
+        for i, sub in sorted(paths.items()):
+            if isinstance(sub, dict):
+                patches[str(i)] = self._typ.dump_partial(v[i], sub)
+            else:
+                whole[str(i)] = self._typ.py_to_raw(v[i])
+        return {'set': whole, 'patch': patches}
+
+    def apply_partial(self, v: ArrayT[_VT], patch: Any) -> ArrayT[_VT]:
+        if not isinstance(patch, dict):
+            return super().apply_partial(v, patch)
+        for ri, r in sorted((int(k), r) for k, r in patch.get('patch', {}).items()):
+            current = v[ri]
+            value = self._typ.apply_partial(current, r)
+            if value is not current:
+                v[ri] = value
+        to_py = self._typ.parse_raw if checks_raw() else self._typ.raw_to_py
+        for ri, r in sorted((int(k), r) for k, r in patch.get('set', {}).items()):
+            n = list.__len__(v)
+            if ri > n:
+                raise ValueError(f'Patched index {ri} is out of array of {n} elements')
+            value = to_py(r)
+            if ri == n:
+                v.append(value)
+            else:
+                v[ri] = value
+        return v
+
     @property
     def size(self) -> Optional[int]:
         return self._size
@@ -1,9 +1,11 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Type, Generic, Self, Any
+from typing import TypeVar, Type, Generic, Self, Any, Iterable, Tuple, Optional, List
 from abc import ABCMeta, abstractmethod
+from .._binary import write_json, read_json, skip_block
+from .._trust import checks_raw
 
 
-__all__ = ['TypeDef']
+__all__ = ['TypeDef', 'invalid_raw', 'invalid_py', 'copy_container_state', 'compact_container_changes']
 
 
 T = TypeVar('T')
@@ -25,15 +27,117 @@ class TypeDef(Generic[T], metaclass=ABCMeta):
     
     @abstractmethod
     def py_to_raw(self, v: T) -> Any: ...
+
+    def parse_raw(self, r, strict=True) -> T:
+        """Check the raw value and convert it in one pass.
+        Typedefs override it not to convert the value twice in `check_raw` and `raw_to_py`.
+
+        Args:
+            r (Any): raw value, not None
+            strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+
+        Raises:
+            ValueError: the raw value is not valid
+
+        Returns:
+            T: python value
+        """
+        if not self.check_raw(r):
+            raise invalid_raw(r)
+        return self.raw_to_py(r, strict)
+
+    def emit_py(self, v: T) -> Any:
+        """Check the python value and convert it to raw in one pass, the pair of `parse_raw`
+
+        Args:
+            v (T): python value, not None
+
+        Raises:
+            ValueError: the python value is not valid
+
+        Returns:
+            Any: raw value
+        """
+        if not self.check_py(v):
+            raise invalid_py(v)
+        return self.py_to_raw(v)
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[T]:
+        """Convert raw items of a container at once.
+        Typedefs override it to convert the whole batch with C-level calls instead of python loop.
+
+        Args:
+            rs (Iterable[Any]): raw values
+            strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+
+        Returns:
+            List[T]: python values
+        """
+        raw_to_py = self.raw_to_py
+        return [raw_to_py(r, strict) for r in rs]
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[T]:
+        """Same as `raw_to_py_many`, but the values are checked as by `parse_raw`
+
+        Raises:
+            ValueError: a raw value is not valid
+        """
+        parse_raw = self.parse_raw
+        return [parse_raw(r, strict) for r in rs]
+
+    def py_to_raw_many(self, vs: Iterable[T]) -> List[Any]:
+        """Convert python items of a container to raw at once, the pair of `raw_to_py_many`
+
+        Args:
+            vs (Iterable[T]): python values
+
+        Returns:
+            List[Any]: raw values
+        """
+        return list(map(self.py_to_raw, vs))
+
+    def emit_py_many(self, vs: Iterable[T]) -> List[Any]:
+        """Same as `py_to_raw_many`, but the values are checked as by `emit_py`
+
+        Raises:
+            ValueError: a python value is not valid
+        """
+        return list(map(self.emit_py, vs))
+
+    def raw_to_py_lazy(self, r, strict=True) -> T:
+        """Same as `raw_to_py`, but nested packets are loaded lazily"""
+        return self.raw_to_py(r, strict)
     
     def py_to_py(self, v: T) -> T:
         return v
+
+    def is_mutable(self) -> bool:
+        """Whether python values of the type are mutable and must be copied by `copy_py`"""
+        return False
+
+    def copy_py(self, v: T) -> T:
+        """Copy python value for packet cloning.
+        Values of immutable types are shared, so returned as is.
+        """
+        return v
     
     @abstractmethod
     def zero_value(self) -> T: ...
 
     def is_const(self) -> bool:
         return self._ro
+
+    def raw_to_py_is_identity(self) -> bool:
+        """Whether `raw_to_py` returns a valid raw value as is.
+        Compiled packet loaders skip the conversion call for such typedefs.
+        """
+        return False
+
+    def py_to_raw_is_identity(self) -> bool:
+        """Whether `py_to_raw` returns a python value as is.
+        Compiled packet dumpers skip the conversion call for such typedefs.
+        """
+        return False
     
     def set_ro(self, ro: bool):
         self._ro = ro
@@ -46,5 +150,148 @@ class TypeDef(Generic[T], metaclass=ABCMeta):
     @abstractmethod
     def self_type(self) -> Type[T]: ...
 
-    def diff_keys(self, data: T) -> str:
+    def dictionary_words(self, seen: set) -> Iterable[str]:
+        """Serialized fragments common for values of the type, used to build
+        compression dictionary of the packet.
+
+        Args:
+            seen (set): packet classes already visited
+
+        Returns:
+            Iterable[str]: fragments
+        """
+        return ()
+
+    def struct_format(self) -> Optional[str]:
+        """`struct` format character of the fixed width raw value
+
+        Returns:
+            Optional[str]: format or None if the raw value has no fixed width
+        """
+        return None
+
+    def write_binary(self, r: Any, buf: bytearray):
+        """Append binary encoding of the raw value to the buffer.
+        Types without compact encoding are stored as length prefixed JSON.
+
+        Args:
+            r (Any): raw value
+            buf (bytearray): buffer to append to
+        """
+        write_json(buf, r)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        """Decode raw value written by `write_binary`
+
+        Args:
+            data (memoryview): binary data
+            pos (int): position of the value
+
+        Returns:
+            Tuple[Any, int]: raw value and the position after it
+        """
+        return read_json(data, pos)
+
+    def skip_binary(self, data: memoryview, pos: int) -> int:
+        """Skip the value written by `write_binary` without decoding if possible
+
+        Args:
+            data (memoryview): binary data
+            pos (int): position of the value
+
+        Returns:
+            int: position after the value
+        """
+        if type(self).read_binary is TypeDef.read_binary:
+            return skip_block(data, pos)
+        return self.read_binary(data, pos)[1]
+
+    def view_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        """Same as `read_binary`, but nested packets are returned as views over `data`
+
+        Args:
+            data (memoryview): binary data
+            pos (int): position of the value
+
+        Returns:
+            Tuple[Any, int]: raw value and the position after it
+        """
+        return self.read_binary(data, pos)
+
+    def diff_keys(self, data: T, since: int = 0) -> str:
         return '1'
+
+    def dump_partial(self, v: T, paths: Any) -> Any:
+        """Raw patch of the value for the paths returned by `diff_keys`
+
+        Args:
+            v (T): python value
+            paths (Any): `diff_keys` of the value
+
+        Returns:
+            Any: raw patch
+        """
+        return self.py_to_raw(v)
+
+    def apply_partial(self, v: T, patch: Any) -> T:
+        """Merge raw patch made by `dump_partial` into the value
+
+        Args:
+            v (T): python value, not None
+            patch (Any): raw patch, not None
+
+        Returns:
+            T: `v` itself if it is merged in place or the new value
+        """
+        if checks_raw():
+            return self.parse_raw(patch)
+        return self.raw_to_py(patch)
+
+
+def invalid_raw(r: Any) -> ValueError:
+    """Error of the raw value failed the check"""
+    return ValueError(f'RAW value {r} ({type(r)}) is not valid')
+
+
+def invalid_py(v: Any) -> ValueError:
+    """Error of the python value failed the check"""
+    return ValueError(f'Value {v} ({type(v)}) is not valid')
+
+
+def copy_container_state(src: Any, dst: Any):
+    """Copy state of a container value (ro, modified and diff flags) to its copy.
+    The copy is not linked to the parent of `src`.
+
+    Args:
+        src (Any): container value
+        dst (Any): copy of `src`
+    """
+    state = src.__dict__
+    dst.__dict__.update(state)
+    dst.__dict__.pop('__parent__', None)
+    if state.get('__diff__'):
+        dst.__diff__ = dict(state['__diff__'])
+
+
+def compact_container_changes(c: Any, since: int, values: Iterable[Any]):
+    """Forget the change stamps of a container value (and packets in it) not newer than `since`.
+
+    Args:
+        c (Any): container value
+        since (int): version seen by all the consumers
+        values (Iterable[Any]): values of the container
+    """
+    if not c.__modified__:
+        return
+    for vi in values:
+        # nested packets and containers
+        if hasattr(vi, 'compact_changes'):
+            vi.compact_changes(since)
+    diff = c.__dict__.get('__diff__')
+    if diff:
+        c.__diff__ = {k: version for k, version in diff.items() if version > since} or None
+    shape = c.__dict__.get('__shape__')
+    if shape and shape <= since:
+        c.__shape__ = False
+    if c.__modified__ <= since:
+        c.__modified__ = False
@@ -1,7 +1,8 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Type, Set, Self
+from typing import TypeVar, Type, Set, Self, Any, Tuple
 from enum import Enum
-from .base import TypeDef
+from .base import TypeDef, invalid_raw, invalid_py
+from .._binary import write_uvarint, read_uvarint
 
 
 __all__ = ['Bitmask']
@@ -43,11 +44,33 @@ class Bitmask(TypeDef[T]):
     def raw_to_py(self, raw_value: int, strict) -> Set[T]:
         return set(filter(None, (self._powers_to_enum.get(v) for v in _iterbits(int(raw_value)))))
     
+    def parse_raw(self, raw_value: int, strict=True) -> Set[T]:
+        if not isinstance(raw_value, int):
+            raise invalid_raw(raw_value)
+        return self.raw_to_py(raw_value, strict)
+
     def py_to_raw(self, v: Set[T]) -> int:
         return sum(self._enum_to_powers[element] for element in v)
+
+    def emit_py(self, v: Set[T]) -> int:
+        if not isinstance(v, set):
+            raise invalid_py(v)
+        return self.py_to_raw(v)
         
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: Set[T]) -> Set[T]:
+        return set(v)
+
     def zero_value(self) -> Set[T]:
         return set()
+
+    def write_binary(self, r: Any, buf: bytearray):
+        write_uvarint(buf, r)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        return read_uvarint(data, pos)
     
     def self_type(self) -> type[Set[T]]:
         return Set[T]
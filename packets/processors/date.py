@@ -1,10 +1,114 @@
 # -*- coding:utf-8 -*-
-from typing import Type, TypeVar, cast, Self
+from typing import Type, TypeVar, cast, Self, Callable, Iterable, Any, List
+from functools import lru_cache
 import datetime
-from .base import TypeDef
+import re
+from .base import TypeDef, invalid_raw, invalid_py
 
 
-__all__ = ['DateTime', 'Time']
+__all__ = ['DateTime', 'Time', 'datetime_parser', 'time_parser', 'cached_parser']
+
+
+_R = TypeVar('_R')
+
+
+_STR_TYPES = frozenset((str, ))
+
+
+_DATE = '[0-9]{4}-[0-9]{2}-[0-9]{2}'
+_TIME = '[0-9]{2}:[0-9]{2}:[0-9]{2}'
+
+
+# ISO-style formats: the zero padded values of them are parsed by `fromisoformat`
+_ISO_DATETIME_FORMATS = {
+    '%Y-%m-%d': re.compile(_DATE).fullmatch,
+    '%Y-%m-%d %H:%M:%S': re.compile(f'{_DATE} {_TIME}').fullmatch,
+    '%Y-%m-%dT%H:%M:%S': re.compile(f'{_DATE}T{_TIME}').fullmatch,
+}
+_ISO_DATETIME_Z_FORMAT = '%Y-%m-%d %H:%M:%S %z'
+_ISO_DATETIME_Z = re.compile(f'{_DATE} {_TIME} [+-][0-9]{{4}}').fullmatch
+_ISO_TIME_FORMATS = {
+    '%H:%M': re.compile('[0-9]{2}:[0-9]{2}').fullmatch,
+    '%H:%M:%S': re.compile(_TIME).fullmatch,
+}
+
+
+def datetime_parser(date_format: str) -> Callable[[str], datetime.datetime]:
+    """Parser of the strings of the format, same as `datetime.strptime`.
+    ISO-style formats are parsed by `fromisoformat` when the value has the canonical shape,
+    the other values (e.g. not zero padded) fall back to `strptime`.
+
+    Args:
+        date_format (str): `strptime` format
+
+    Returns:
+        Callable[[str], datetime.datetime]: parser
+    """
+    strptime = datetime.datetime.strptime
+    fromisoformat = datetime.datetime.fromisoformat
+    if date_format in _ISO_DATETIME_FORMATS:
+        match = _ISO_DATETIME_FORMATS[date_format]
+
+        def parse_iso(r: str) -> datetime.datetime:
+            if match(r):
+                return fromisoformat(r)
+            return strptime(r, date_format)
+        return parse_iso
+    if date_format == _ISO_DATETIME_Z_FORMAT:
+        match = _ISO_DATETIME_Z
+
+        def parse_iso_z(r: str) -> datetime.datetime:
+            if match(r):
+                # fromisoformat has no space before the offset
+                return fromisoformat(r[:19] + r[20:])
+            return strptime(r, date_format)
+        return parse_iso_z
+
+    def parse(r: str) -> datetime.datetime:
+        return strptime(r, date_format)
+    return parse
+
+
+def time_parser(time_format: str) -> Callable[[str], datetime.time]:
+    """Parser of the time strings of the format, same as `datetime.strptime(...).time()`.
+    See `datetime_parser`.
+
+    Args:
+        time_format (str): `strptime` format
+
+    Returns:
+        Callable[[str], datetime.time]: parser
+    """
+    strptime = datetime.datetime.strptime
+    if time_format in _ISO_TIME_FORMATS:
+        match = _ISO_TIME_FORMATS[time_format]
+        fromisoformat = datetime.time.fromisoformat
+
+        def parse_iso(r: str) -> datetime.time:
+            if match(r):
+                return fromisoformat(r)
+            return strptime(r, time_format).time()
+        return parse_iso
+
+    def parse(r: str) -> datetime.time:
+        return strptime(r, time_format).time()
+    return parse
+
+
+def cached_parser(parse: Callable[[str], _R], cache_size: int) -> Callable[[str], _R]:
+    """Parser memoizing the values parsed, for the feeds repeating the same timestamps.
+    Parsed values must be immutable as they are shared.
+
+    Args:
+        parse (Callable[[str], _R]): parser
+        cache_size (int): size of LRU cache, 0 for no cache
+
+    Returns:
+        Callable[[str], _R]: parser
+    """
+    if not cache_size:
+        return parse
+    return lru_cache(cache_size)(parse)
 
 
 _DT = TypeVar('_DT', bound=datetime.datetime)
@@ -13,14 +117,17 @@ _DT = TypeVar('_DT', bound=datetime.datetime)
 class DateTime(TypeDef[_DT]):
     """DateTime processor. Stores `datetime.datetime` as string using `self._date_format`"""
 
-    def __init__(self, date_format: str):
+    def __init__(self, date_format: str, cache_size: int = 0):
         """Constructor
 
         Args:
             date_format (str): the format string to store and decode datetime value.
+            cache_size (int, optional): size of LRU cache of the parsed values. Defaults to 0, no cache.
         """  
         super().__init__()
         self._date_format = date_format
+        self._cache_size = cache_size
+        self._parse = cached_parser(datetime_parser(date_format), cache_size)
 
     def check_py(self, v: datetime.datetime) -> bool:
         return isinstance(v, datetime.datetime)
@@ -29,11 +136,35 @@ class DateTime(TypeDef[_DT]):
         return isinstance(r, str)
     
     def raw_to_py(self, r: str, strict=True) -> _DT:
-        return cast(_DT, datetime.datetime.strptime(r, self._date_format))
+        return cast(_DT, self._parse(r))
+
+    def parse_raw(self, r: str, strict=True) -> _DT:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        return cast(_DT, self._parse(r))
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[_DT]:
+        if type(self).raw_to_py is not DateTime.raw_to_py:
+            return super().raw_to_py_many(rs, strict)
+        return list(map(self._parse, rs)) # type: ignore
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[_DT]:
+        if type(self).parse_raw is not DateTime.parse_raw:
+            return super().parse_raw_many(rs, strict)
+        rs = rs if isinstance(rs, list) else list(rs)
+        if not _STR_TYPES.issuperset(map(type, rs)):
+            # the item by item pass raises on the invalid value
+            return super().parse_raw_many(rs, strict)
+        return list(map(self._parse, rs)) # type: ignore
 
     def py_to_raw(self, v: _DT) -> str:
         return v.strftime(self._date_format)
 
+    def emit_py(self, v: _DT) -> str:
+        if not isinstance(v, datetime.datetime):
+            raise invalid_py(v)
+        return v.strftime(self._date_format)
+
     def zero_value(self) -> _DT:
         return cast(_DT, datetime.datetime.today())
 
@@ -41,7 +172,7 @@ class DateTime(TypeDef[_DT]):
         return datetime.datetime
     
     def clone(self) -> Self:
-        c = self.__class__(self._date_format)
+        c = self.__class__(self._date_format, self._cache_size)
         c.set_ro(False)
         return c
 
@@ -53,16 +184,19 @@ _T = TypeVar('_T', bound=datetime.time)
 class Time(TypeDef[_T]):
     """Time processor. Stores `datetime.time` as string using `self._time_format`"""
 
-    def __init__(self, time_format: str):
+    def __init__(self, time_format: str, cache_size: int = 0):
         """Constructor
 
         Args:
             time_format (str): the format string to store and decode datetime value. Timezones are not supported.
+            cache_size (int, optional): size of LRU cache of the parsed values. Defaults to 0, no cache.
         """
         super().__init__()
         if '%z' in time_format:
             raise NotImplementedError('Timezone dates are not supported')
         self._time_format = time_format
+        self._cache_size = cache_size
+        self._parse = cached_parser(time_parser(time_format), cache_size)
 
     def check_py(self, v: _T) -> bool:
         return isinstance(v, datetime.time)
@@ -71,11 +205,34 @@ class Time(TypeDef[_T]):
         return isinstance(r, str)
 
     def raw_to_py(self, r: str, strict: bool) -> _T:
-        return cast(_T, datetime.datetime.strptime(r, self._time_format).time())
+        return cast(_T, self._parse(r))
+
+    def parse_raw(self, r: str, strict=True) -> _T:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        return cast(_T, self._parse(r))
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[_T]:
+        if type(self).raw_to_py is not Time.raw_to_py:
+            return super().raw_to_py_many(rs, strict)
+        return list(map(self._parse, rs)) # type: ignore
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[_T]:
+        if type(self).parse_raw is not Time.parse_raw:
+            return super().parse_raw_many(rs, strict)
+        rs = rs if isinstance(rs, list) else list(rs)
+        if not _STR_TYPES.issuperset(map(type, rs)):
+            return super().parse_raw_many(rs, strict)
+        return list(map(self._parse, rs)) # type: ignore
 
     def py_to_raw(self, v: _T) -> str:
         return v.strftime(self._time_format)
 
+    def emit_py(self, v: _T) -> str:
+        if not isinstance(v, datetime.time):
+            raise invalid_py(v)
+        return v.strftime(self._time_format)
+
     def zero_value(self) -> _T:
         return cast(_T, datetime.datetime.today())
 
@@ -83,6 +240,6 @@ class Time(TypeDef[_T]):
         return datetime.time
 
     def clone(self) -> Self:
-        c = self.__class__(self._time_format)
+        c = self.__class__(self._time_format, self._cache_size)
         c.set_ro(False)
         return c
@@ -1,7 +1,9 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Type, Self
+from typing import TypeVar, Type, Self, Iterable, Any, Tuple, List, Dict, Optional
 from enum import Enum
-from .base import TypeDef
+from .base import TypeDef, invalid_raw, invalid_py
+from .. import _json as json
+from .._binary import write_uvarint, read_uvarint
 
 
 __all__ = ['Enumeration', 'EnumerationByName']
@@ -16,6 +18,8 @@ class Enumeration(TypeDef[T]):
     def __init__(self, typ: Type[T]) -> None:
         super().__init__()
         self._typ = typ
+        self._raw_values: Optional[List[Any]] = None
+        self._ordinals: Optional[Dict[Any, int]] = None
 
     def check_py(self, v: T) -> bool:
         return isinstance(v, Enum)
@@ -26,12 +30,51 @@ class Enumeration(TypeDef[T]):
     def raw_to_py(self, r, strict=True) -> T:
         return self._typ(r)
 
+    def parse_raw(self, r, strict=True) -> T:
+        # any raw value is checked by the lookup of the enum
+        return self.raw_to_py(r, strict)
+
     def py_to_raw(self, v: T):
         return v.value
+
+    def emit_py(self, v: T) -> Any:
+        if not isinstance(v, Enum):
+            raise invalid_py(v)
+        return self.py_to_raw(v)
     
     def self_type(self) -> Type[T]:
         return self._typ
 
+    def write_binary(self, r: Any, buf: bytearray):
+        ordinals = self._ordinals
+        if ordinals is None:
+            ordinals = self._ordinals = {self.py_to_raw(element): i for i, element in enumerate(self._typ)}
+        try:
+            i = ordinals[r]
+        except (KeyError, TypeError):
+            raise ValueError(f'Value {r!r} is not a member of {self._typ.__name__}')
+        write_uvarint(buf, i)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        raw_values = self._raw_values
+        if raw_values is None:
+            raw_values = self._raw_values = [self.py_to_raw(element) for element in self._typ]
+        i, pos = read_uvarint(data, pos)
+        try:
+            return raw_values[i], pos
+        except IndexError:
+            raise ValueError(f'Wrong ordinal {i} of {self._typ.__name__}')
+
+    def dictionary_words(self, seen: set) -> Iterable[str]:
+        words = []
+        for element in self._typ:
+            try:
+                words.append(json.dumps(self.py_to_raw(element)))
+            except (TypeError, ValueError, OverflowError):
+                # not serializable values never get to the wire as is
+                continue
+        return words
+
     def zero_value(self) -> T:
         return self._typ()
     
@@ -51,5 +94,13 @@ class EnumerationByName(Enumeration[T]):
     def raw_to_py(self, r: str, strict=True) -> T:
         return self._typ[r]
 
+    def parse_raw(self, r: str, strict=True) -> T:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        try:
+            return self._typ[r]
+        except KeyError:
+            raise ValueError(f'{r!r} is not a valid {self._typ.__name__}')
+
     def py_to_raw(self, v: T) -> str:
         return v.name
@@ -1,9 +1,12 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Dict, Generic, Self, Optional, Set, Union, Type
+from typing import TypeVar, Dict, Generic, Self, Optional, Set, Union, Type, Iterable, Any, Tuple
 from enum import Enum
-from .base import TypeDef
+from .base import TypeDef, invalid_raw, invalid_py, copy_container_state, compact_container_changes
 from .subpacket import Subpacket
+from .._binary import write_count, read_count, write_item, read_item
+from .._trust import checks_raw
 from .._packetbase import PacketBase
+from .._journal import next_version
 from .._types import DiffKeys
 
 
@@ -17,20 +20,25 @@ _V = TypeVar('_V')
 class HashT(Dict[_K, _V]):
     _ro = False
     __parent__: Optional[PacketBase] = None
-    __modified__: bool = False
-    __diff__: Set[_K] = set()
+    __modified__: Union[bool, int] = False
+    __diff__: Optional[Dict[_K, int]] = None
 
     def __setitem__(self, key: _K, value: _V):
         if not self._ro:
             super().__setitem__(key, value)
-            self.set_modified()
-            self.__diff__.add(key)
+            self._changed(key)
 
     def __delitem__(self, key):
         if not self._ro:
             super().__delitem__(key)
-            self.set_modified()
-            self.__diff__.add(key)
+            self._changed(key)
+
+    def _changed(self, key):
+        version = next_version()
+        self.set_modified(version)
+        if self.__diff__ is None:
+            self.__diff__ = {}
+        self.__diff__[key] = version
 
     def set_ro(self, ro: bool):
         self._ro = ro
@@ -40,13 +48,18 @@ class HashT(Dict[_K, _V]):
             if isinstance(vi, PacketBase):
                 vi.set_ro(ro)
 
-    def is_modified(self) -> bool:
-        return self.__modified__
+    def is_modified(self, since: int = 0) -> bool:
+        return self.__modified__ > since
     
-    def set_modified(self):
-        self.__modified__ = True
+    def set_modified(self, version: Optional[int] = None):
+        if version is None:
+            version = next_version()
+        self.__modified__ = version
         if self.__parent__:
-            self.__parent__.set_modified()
+            self.__parent__.set_modified(version)
+
+    def compact_changes(self, since: int):
+        compact_container_changes(self, since, self.values())
 
 
 class Hash(TypeDef[HashT[_K, _V]]):
@@ -67,16 +80,73 @@ class Hash(TypeDef[HashT[_K, _V]]):
         return isinstance(r, dict)
     
     def raw_to_py(self, r: dict, strict = True) -> HashT[_K, _V]:
-        d = HashT[_K, _V]({self._ktyp.raw_to_py(ki, strict): self._vtyp.raw_to_py(ri, strict) for ki, ri in r.items()})
-        d.__diff__ = set()
+        d = HashT[_K, _V](zip(self._ktyp.raw_to_py_many(r.keys(), strict), self._vtyp.raw_to_py_many(r.values(), strict)))
+        d.__modified__ = False
+        return d
+
+    def parse_raw(self, r: dict, strict = True) -> HashT[_K, _V]:
+        if not isinstance(r, dict):
+            raise invalid_raw(r)
+        d = HashT[_K, _V](zip(self._ktyp.parse_raw_many(r.keys(), strict), self._vtyp.parse_raw_many(r.values(), strict)))
+        d.__modified__ = False
+        return d
+
+    def raw_to_py_lazy(self, r: dict, strict = True) -> HashT[_K, _V]:
+        d = HashT[_K, _V]({self._ktyp.raw_to_py(ki, strict): self._vtyp.raw_to_py_lazy(ri, strict) for ki, ri in r.items()})
         d.__modified__ = False
         return d
 
     def py_to_raw(self, v: HashT[_K, _V]) -> dict:
-        return dict({self._ktyp.py_to_raw(ki): self._vtyp.py_to_raw(vi) for ki, vi in v.items()})
+        return dict(zip(self._ktyp.py_to_raw_many(v.keys()), self._vtyp.py_to_raw_many(v.values())))
+
+    def emit_py(self, v: HashT[_K, _V]) -> dict:
+        if not isinstance(v, dict):
+            raise invalid_py(v)
+        return dict(zip(self._ktyp.emit_py_many(v.keys()), self._vtyp.emit_py_many(v.values())))
 
     def py_to_py(self, v: Optional[HashT[_K, _V]]) -> Optional[HashT[_K, _V]]:
         return None if v is None else HashT[_K, _V](v) if not isinstance(v, HashT) else v
+
+    def write_binary(self, r: Any, buf: bytearray):
+        # only values may be None, raw keys are the keys of JSON object
+        nullable = None in r.values()
+        write_count(buf, len(r), nullable)
+        kwrite = self._ktyp.write_binary
+        vwrite = self._vtyp.write_binary
+        for ki, ri in r.items():
+            kwrite(ki, buf)
+            if nullable:
+                write_item(buf, ri, vwrite)
+            else:
+                vwrite(ri, buf)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        n, nullable, pos = read_count(data, pos)
+        kread = self._ktyp.read_binary
+        vread = self._vtyp.read_binary
+        r = {}
+        for _ in range(n):
+            ki, pos = kread(data, pos)
+            r[ki], pos = read_item(data, pos, vread) if nullable else vread(data, pos)
+        return r, pos
+
+    def dictionary_words(self, seen: set) -> Iterable[str]:
+        return [*self._ktyp.dictionary_words(seen), *self._vtyp.dictionary_words(seen)]
+
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: HashT[_K, _V]) -> HashT[_K, _V]:
+        if not self._vtyp.is_mutable():
+            c = HashT[_K, _V](v)
+        else:
+            copy_value = self._vtyp.copy_py
+            c = HashT[_K, _V]({ki: copy_value(vi) for ki, vi in v.items()})
+            for ki, vi in v.items():
+                if getattr(vi, '__parent__', None) is v:
+                    c[ki].__parent__ = c
+        copy_container_state(v, c)
+        return c
         
     def zero_value(self) -> HashT[_K, _V]:
         return HashT[_K, _V]()
@@ -94,8 +164,34 @@ class Hash(TypeDef[HashT[_K, _V]]):
         c.set_ro(False)
         return c
 
-    def diff_keys(self, data: HashT[_K, _V]) -> DiffKeys:
+    def diff_keys(self, data: HashT[_K, _V], since: int = 0) -> DiffKeys:
+        # keys in diff are assigned or deleted, so their values are dumped whole
+        diff = data.__diff__
+        if not diff:
+            return {}
+        return {k: '1' for k, version in diff.items() if version > since}
+
+    def dump_partial(self, v: HashT[_K, _V], paths: Any) -> Any:
+        if not isinstance(paths, dict):
+            return self.py_to_raw(v)
         res = {}
-        for k in data.__diff__:
-            res[k] = self._vtyp.diff_keys(data[k])
+        for k, sub in paths.items():
+            # None stands for the deleted key
+            res[self._ktyp.py_to_raw(k)] = self._vtyp.dump_partial(v[k], sub) if k in v else None
         return res
+
+    def apply_partial(self, v: HashT[_K, _V], patch: Any) -> HashT[_K, _V]:
+        check = checks_raw()
+        if check and not self.check_raw(patch):
+            raise invalid_raw(patch)
+        key_to_py = self._ktyp.parse_raw if check else self._ktyp.raw_to_py
+        to_py = self._vtyp.parse_raw if check else self._vtyp.raw_to_py
+        for rk, r in patch.items():
+            k = key_to_py(rk)
+            if r is None:
+                if k in v:
+                    del v[k]
+                continue
+            current = v.get(k)
+            v[k] = to_py(r) if current is None else self._vtyp.apply_partial(current, r)
+        return v
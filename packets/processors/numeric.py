@@ -1,6 +1,7 @@
 # -*- coding: utf8 -*-
-from typing import TypeVar, Optional, Union, Type, Self
-from .base import TypeDef
+from typing import TypeVar, Optional, Union, Type, Self, Any, Tuple, Iterable, List
+from .base import TypeDef, invalid_raw, invalid_py
+from .._binary import write_uvarint, read_uvarint, skip_uvarint, write_svarint, read_svarint, write_double, read_double
 
 
 __all__ = ['Number', 'Percent', 'NumberAsString']
@@ -9,6 +10,19 @@ __all__ = ['Number', 'Percent', 'NumberAsString']
 T=TypeVar('T', bound=Union[int, float])
 
 
+# raw types accepted by `Number.check_raw`, batches of other types are checked item by item
+_NUMERIC_TYPES = frozenset((int, float, bool))
+
+
+# the narrowest struct integer formats first
+_STRUCT_FORMATS = (
+    (-2**7, 2**7 - 1, 'b'), (0, 2**8 - 1, 'B'),
+    (-2**15, 2**15 - 1, 'h'), (0, 2**16 - 1, 'H'),
+    (-2**31, 2**31 - 1, 'i'), (0, 2**32 - 1, 'I'),
+    (-2**63, 2**63 - 1, 'q'), (0, 2**64 - 1, 'Q'),
+)
+
+
 class Number(TypeDef[T]):
     def __init__(self, typ: type[T], min: Optional[T] = None, max: Optional[T] = None) -> None:
         super().__init__()
@@ -37,12 +51,98 @@ class Number(TypeDef[T]):
     def raw_to_py(self, r, strict=True) -> T:
         return self._typ(r)
 
+    def parse_raw(self, r, strict=True) -> T:
+        if not isinstance(r, (int, float)):
+            raise invalid_raw(r)
+        v = self._typ(r)
+        if (self._min is not None and v < self._min) or (self._max is not None and v > self._max):
+            raise invalid_raw(r)
+        return v
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[T]:
+        if type(self).raw_to_py is not Number.raw_to_py:
+            return super().raw_to_py_many(rs, strict)
+        return list(map(self._typ, rs))
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[T]:
+        if type(self).parse_raw is not Number.parse_raw:
+            return super().parse_raw_many(rs, strict)
+        rs = rs if isinstance(rs, list) else list(rs)
+        if _NUMERIC_TYPES.issuperset(map(type, rs)):
+            vs = list(map(self._typ, rs))
+            if self._in_range(vs):
+                return vs
+        # the item by item pass raises on the invalid value
+        return super().parse_raw_many(rs, strict)
+
+    def _in_range(self, vs: List[T]) -> bool:
+        if not vs:
+            return True
+        return (self._min is None or min(vs) >= self._min) and (self._max is None or max(vs) <= self._max)
+
     def py_to_raw(self, v: T) -> T:
         return v
 
+    def py_to_raw_many(self, vs: Iterable[T]) -> List[Any]:
+        if not self.py_to_raw_is_identity():
+            return super().py_to_raw_many(vs)
+        return list(vs)
+
+    def emit_py_many(self, vs: Iterable[T]) -> List[Any]:
+        if not self.py_to_raw_is_identity():
+            return super().emit_py_many(vs)
+        vs = list(vs)
+        if _NUMERIC_TYPES.issuperset(map(type, vs)):
+            if self._min is None and self._max is None or self._in_range(list(map(self._typ, vs))):
+                return vs
+        return super().emit_py_many(vs)
+
+    def emit_py(self, v: T) -> Any:
+        if not isinstance(v, (int, float)):
+            raise invalid_py(v)
+        if self._min is not None or self._max is not None:
+            c = self._typ(v)
+            if (self._min is not None and c < self._min) or (self._max is not None and c > self._max):
+                raise invalid_py(v)
+        return self.py_to_raw(v)
+
+    def py_to_raw_is_identity(self) -> bool:
+        return type(self).py_to_raw is Number.py_to_raw
+
     def zero_value(self) -> T:
         return self._typ(0)
 
+    def struct_format(self) -> Optional[str]:
+        if self._typ is float:
+            return 'd'
+        if self._min is None or self._max is None:
+            return None
+        for lo, hi, fmt in _STRUCT_FORMATS:
+            if lo <= self._min and self._max <= hi:
+                return fmt
+        return None
+
+    def write_binary(self, r: Any, buf: bytearray):
+        if self._typ is float:
+            write_double(buf, r)
+        elif self._min is not None and self._min >= 0:
+            write_uvarint(buf, int(r))
+        else:
+            write_svarint(buf, int(r))
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        if self._typ is float:
+            return read_double(data, pos)
+        elif self._min is not None and self._min >= 0:
+            return read_uvarint(data, pos)
+        else:
+            return read_svarint(data, pos)
+
+    def skip_binary(self, data: memoryview, pos: int) -> int:
+        if self._typ is float:
+            return pos + 8
+        return skip_uvarint(data, pos)
+
     def self_type(self) -> Type[T]:
         return self._typ
 
@@ -58,6 +158,9 @@ class Percent(Number[float]):
         res =  super().raw_to_py(r)
         return res/100.0
 
+    def parse_raw(self, r, strict=True) -> float:
+        return super().parse_raw(r, strict)/100.0
+
     def py_to_raw(self, v: float) -> float:
         return super().py_to_raw(v) * 100.0
 
@@ -74,6 +177,23 @@ class NumberAsString(Number[T]):
 
     def raw_to_py(self, r: str, strict=True) -> T:
         return super().raw_to_py(float(r))
+
+    def parse_raw(self, r: str, strict=True) -> T:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        try:
+            f = float(r)
+        except ValueError:
+            raise invalid_raw(r)
+        return super().parse_raw(f, strict)
     
     def py_to_raw(self, v: T) -> str:
         return f'{v}'
+
+    def struct_format(self) -> Optional[str]:
+        return None
+
+    # raw values are strings
+    write_binary = TypeDef.write_binary
+    read_binary = TypeDef.read_binary
+    skip_binary = TypeDef.skip_binary
@@ -1,8 +1,12 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Optional, Set as TSet, Self, Union, Type
-from .base import TypeDef
+from typing import TypeVar, Optional, Dict, Set as TSet, Self, Union, Type, Iterable, Any, Tuple
+from .base import TypeDef, invalid_raw, invalid_py, copy_container_state, compact_container_changes
 from .subpacket import Subpacket
+from .._binary import write_count, read_count, write_item, read_item
+from .._trust import checks_raw
 from .._packetbase import PacketBase
+from .._journal import next_version
+from .._types import DiffKeys
 
 
 __all__ = ['SetT', 'Set']
@@ -12,21 +16,98 @@ _VT=TypeVar('_VT')
 
 
 class SetT(TSet[_VT]):
+    """Set tracking the added and removed members.
+    Changes which are not per member (clear, intersection, ...) mark the whole set as changed.
+    """
     _ro = False
     __parent__: Optional[PacketBase] = None
-    __modified__: bool = False
+    __modified__: Union[bool, int] = False
+    __diff__: Optional[Dict[_VT, int]] = None
+    __shape__: Union[bool, int] = False
 
     def add(self, value: _VT):
-        if not self._ro:
+        if not self._ro and value not in self:
             super().add(value)
-            self.set_modified()
+            self._changed((value,))
             if hasattr(value, 'set_modified'):
                 value.__parent__ = self # type: ignore
 
     def discard(self, value: _VT):
-        if not self._ro:
+        if not self._ro and value in self:
             super().discard(value)
-            self.set_modified()
+            self._changed((value,))
+
+    def remove(self, value: _VT):
+        if not self._ro:
+            super().remove(value)
+            self._changed((value,))
+
+    def pop(self) -> _VT:
+        if self._ro:
+            # the other changes are silently skipped, but pop has to return the removed element
+            raise TypeError('Read-only set doesnt support pop')
+        value = super().pop()
+        self._changed((value,))
+        return value
+
+    def update(self, *others: Iterable[_VT]):
+        if not self._ro:
+            added = set().union(*others).difference(self)
+            super().update(added)
+            self._changed(added)
+
+    def difference_update(self, *others: Iterable[_VT]):
+        if not self._ro:
+            removed = self.intersection(set().union(*others))
+            super().difference_update(removed)
+            self._changed(removed)
+
+    def __ior__(self, other: TSet[_VT]) -> Self: # type: ignore
+        self.update(other)
+        return self
+
+    def __isub__(self, other: TSet[_VT]) -> Self: # type: ignore
+        self.difference_update(other)
+        return self
+
+    def clear(self):
+        if not self._ro:
+            super().clear()
+            self._reshaped()
+
+    def intersection_update(self, *others: Iterable[_VT]):
+        if not self._ro:
+            super().intersection_update(*others)
+            self._reshaped()
+
+    def symmetric_difference_update(self, other: Iterable[_VT]):
+        if not self._ro:
+            super().symmetric_difference_update(other)
+            self._reshaped()
+
+    def __iand__(self, other: TSet[_VT]) -> Self: # type: ignore
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other: TSet[_VT]) -> Self: # type: ignore
+        self.symmetric_difference_update(other)
+        return self
+
+    def _changed(self, members: Iterable[_VT]):
+        if not members:
+            return
+        version = next_version()
+        self.set_modified(version)
+        if self.__diff__ is None:
+            self.__diff__ = {}
+        for value in members:
+            self.__diff__[value] = version
+
+    def _reshaped(self):
+        version = next_version()
+        self.set_modified(version)
+        self.__shape__ = version
+        self.__diff__ = None
 
     def set_ro(self, ro: bool):
         self._ro = ro
@@ -34,13 +115,18 @@ class SetT(TSet[_VT]):
             if isinstance(vi, PacketBase):
                 vi.set_ro(ro)
     
-    def is_modified(self) -> bool:
-        return self.__modified__
+    def is_modified(self, since: int = 0) -> bool:
+        return self.__modified__ > since
     
-    def set_modified(self):
-        self.__modified__ = True
+    def set_modified(self, version: Optional[int] = None):
+        if version is None:
+            version = next_version()
+        self.__modified__ = version
         if self.__parent__:
-            self.__parent__.set_modified()
+            self.__parent__.set_modified(version)
+
+    def compact_changes(self, since: int):
+        compact_container_changes(self, since, self)
 
 
 class Set(TypeDef[SetT[_VT]]):
@@ -60,14 +146,82 @@ class Set(TypeDef[SetT[_VT]]):
         return isinstance(r, set)
     
     def raw_to_py(self, r, strict = True) -> SetT[_VT]:
-        return SetT[_VT]([self._typ.raw_to_py(ri, strict) for ri in r])
+        return SetT[_VT](self._typ.raw_to_py_many(r, strict))
+
+    def parse_raw(self, r, strict = True) -> SetT[_VT]:
+        if not isinstance(r, set):
+            raise invalid_raw(r)
+        return SetT[_VT](self._typ.parse_raw_many(r, strict))
 
     def py_to_raw(self, v: SetT[_VT]) -> set:
-        return set(map(self._typ.py_to_raw, v))
+        return set(self._typ.py_to_raw_many(v))
+
+    def emit_py(self, v: SetT[_VT]) -> set:
+        if not isinstance(v, set):
+            raise invalid_py(v)
+        return set(self._typ.emit_py_many(v))
 
     def py_to_py(self, v: Optional[SetT[_VT]]) -> Optional[SetT[_VT]]:
         return None if v is None else SetT[_VT](v) if not isinstance(v, SetT) else v
 
+    def write_binary(self, r: Any, buf: bytearray):
+        nullable = None in r
+        write_count(buf, len(r), nullable)
+        write = self._typ.write_binary
+        if nullable:
+            for ri in r:
+                write_item(buf, ri, write)
+        else:
+            for ri in r:
+                write(ri, buf)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        n, nullable, pos = read_count(data, pos)
+        read = self._typ.read_binary
+        r = set()
+        for _ in range(n):
+            ri, pos = read_item(data, pos, read) if nullable else read(data, pos)
+            r.add(ri)
+        return r, pos
+
+    def diff_keys(self, data: SetT[_VT], since: int = 0) -> Union[str, DiffKeys]:
+        if data.__shape__ > since:
+            return '1'
+        diff = data.__diff__
+        if not diff:
+            return {}
+        return {k: '1' for k, version in diff.items() if version > since}
+
+    def dump_partial(self, v: SetT[_VT], paths: Any) -> Any:
+        if not isinstance(paths, dict):
+            return self.py_to_raw(v)
+        to_raw = self._typ.py_to_raw
+        added = []
+        removed = []
+        for k in paths:
+            (added if k in v else removed).append(to_raw(k))
+        return {'add': added, 'del': removed}
+
+    def apply_partial(self, v: SetT[_VT], patch: Any) -> SetT[_VT]:
+        if not isinstance(patch, dict):
+            return super().apply_partial(v, set(patch) if isinstance(patch, (list, tuple)) else patch)
+        to_py = self._typ.parse_raw if checks_raw() else self._typ.raw_to_py
+        v.difference_update(map(to_py, patch.get('del', ())))
+        v.update(map(to_py, patch.get('add', ())))
+        return v
+
+    def dictionary_words(self, seen: set) -> Iterable[str]:
+        return self._typ.dictionary_words(seen)
+
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: SetT[_VT]) -> SetT[_VT]:
+        # set members are hashable, so never copied
+        c = SetT[_VT](v)
+        copy_container_state(v, c)
+        return c
+
     def zero_value(self) -> SetT[_VT]:
         return SetT[_VT](set())
 
@@ -1,8 +1,11 @@
 # -*- coding:utf-8 -*-
-from typing import Type, Union, TypeVar, Self
-from .base import TypeDef
+from typing import Type, Union, TypeVar, Self, Iterable, Any, Tuple, List
+from .base import TypeDef, invalid_raw, invalid_py
 from .._packetbase import PacketBase
 from .._types import DiffKeys
+from ..view import BinaryRecord
+from .._binary import write_block, read_block, skip_block
+from .._trust import current_trust
 
 
 __all__ = ['Subpacket']
@@ -21,13 +24,73 @@ class Subpacket(TypeDef[PT]):
         return isinstance(v, PacketBase)
 
     def check_raw(self, r) -> bool:
-        return isinstance(r, (dict, list))
+        return isinstance(r, (dict, list, BinaryRecord))
 
     def raw_to_py(self, r: Union[list, dict], strict=True) -> PT:
-        return self._typ.load(r, strict)
+        typ = self._typ
+        return typ._nested_loader(current_trust.get())(typ, r, strict)
+
+    def parse_raw(self, r: Union[list, dict], strict=True) -> PT:
+        if not isinstance(r, (dict, list, BinaryRecord)):
+            raise invalid_raw(r)
+        typ = self._typ
+        return typ._nested_loader(current_trust.get())(typ, r, strict)
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[PT]:
+        # the level of the outer load is taken once per container
+        typ = self._typ
+        load = typ._nested_loader(current_trust.get())
+        return [load(typ, r, strict) for r in rs]
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[PT]:
+        typ = self._typ
+        load = typ._nested_loader(current_trust.get())
+        result = []
+        for r in rs:
+            if not isinstance(r, (dict, list, BinaryRecord)):
+                raise invalid_raw(r)
+            result.append(load(typ, r, strict))
+        return result
+
+    def raw_to_py_lazy(self, r: Union[list, dict], strict=True) -> PT:
+        return self._typ.load_lazy(r)
 
     def py_to_raw(self, v: PT) -> Union[list, dict, type[None]]:
         return v.dump()
+
+    def emit_py(self, v: PT) -> Union[list, dict, type[None]]:
+        if not isinstance(v, PacketBase):
+            raise invalid_py(v)
+        return v.dump()
+
+    def write_binary(self, r: Any, buf: bytearray):
+        # nested packets are length prefixed to be skippable
+        nested = bytearray()
+        self._typ._write_binary(r, nested)
+        write_block(buf, nested)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        block, pos = read_block(data, pos)
+        r, end = self._typ._read_binary(block, 0)
+        if end != len(block):
+            raise ValueError(f'Wrong size of nested {self._typ.__name__}')
+        return r, pos
+
+    def skip_binary(self, data: memoryview, pos: int) -> int:
+        return skip_block(data, pos)
+
+    def view_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        block, pos = read_block(data, pos)
+        return self._typ._view_binary(block), pos
+
+    def dictionary_words(self, seen: set) -> Iterable[str]:
+        return self._typ._dictionary_words(seen)
+
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: PT) -> PT:
+        return v.clone()
     
     def self_type(self) -> Type[PT]:
         return self._typ
@@ -40,9 +103,16 @@ class Subpacket(TypeDef[PT]):
         self._typ.set_ro(ro)
 
     def clone(self) -> Self:
-        c = self.__class__(self._typ)
-        c.set_ro(False)
-        return c
+        # new typedef is not read only, the nested class itself keeps its state
+        return self.__class__(self._typ)
+
+    def diff_keys(self, data: PT, since: int = 0) -> DiffKeys:
+        return data.diff_keys(since)
+
+    def dump_partial(self, v: PT, paths: Any) -> Any:
+        if isinstance(paths, dict):
+            return v.dump_partial(paths)
+        return self.py_to_raw(v)
 
-    def diff_keys(self, data: PT) -> DiffKeys:
-        return data.diff_keys()
+    def apply_partial(self, v: PT, patch: Any) -> PT:
+        return v.apply_partial(patch)
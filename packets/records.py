@@ -0,0 +1,186 @@
+# -*- coding:utf-8 -*-
+"""Files of fixed size records.
+
+Records are packets of the fixed width `ArrayPacket` packed with it's `struct_layout`
+one after another without any header.
+"""
+from typing import Generic, Iterable, Iterator, List, Optional, Type, TypeVar, Union, Self, overload
+import os
+import mmap
+from .packet import ArrayPacket
+from .stream import DEFAULT_BATCH_SIZE
+
+
+__all__ = ['PacketFile']
+
+
+AT = TypeVar('AT', bound=ArrayPacket)
+
+
+_MODES = {
+    'r': 'rb',
+    'r+': 'r+b',
+    'w': 'w+b',
+    'a': 'a+b',
+}
+# records appended after the file was mapped are read from the memory until they take this size
+_MAX_TAIL = 1 << 20
+
+
+class PacketFile(Generic[AT]):
+    """Memory mapped file of packets with random access.
+    Only the requested records are decoded.
+
+    e.x.
+    with PacketFile('ticks.bin', Tick, 'a') as ticks:
+        ticks.append(Tick(...))
+        last = ticks[-1]
+        for batch in ticks.iter_batches(10000):
+            ...
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], packet: Type[AT], mode: str = 'r') -> None:
+        """Constructor
+
+        Args:
+            path (Union[str, os.PathLike]): path to the file
+            packet (Type[AT]): fixed width packet class of the records
+            mode (str, optional): `r` to read, `r+` to read and append, `w` to create empty file,
+                `a` to read and append creating the file if needed. Defaults to 'r'.
+
+        Raises:
+            ValueError: mode is unknown or the file size is not a multiple of the record size
+        """
+        file_mode = _MODES.get(mode)
+        if file_mode is None:
+            raise ValueError(f'Unknown mode "{mode}"')
+        self._packet = packet
+        self._layout = packet.struct_layout()
+        self._record_size = self._layout.size
+        self._writable = mode != 'r'
+        self._file = open(path, file_mode)
+        self._map: Optional[mmap.mmap] = None
+        self._map_size = 0
+        self._tail = bytearray()
+        self._size = os.fstat(self._file.fileno()).st_size
+        if self._size % self._record_size:
+            self._file.close()
+            raise ValueError(f'Size of "{path}" is not a multiple of "{packet.__name__}" record size {self._record_size}')
+
+    def __len__(self) -> int:
+        return self._size // self._record_size
+
+    @overload
+    def __getitem__(self, index: int) -> AT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[AT]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[AT, List[AT]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._read(start, stop)
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('Record index out of range')
+        mapped = self._mapped()
+        offset = index * self._record_size
+        if offset < self._map_size:
+            return self._packet.unpack_from(mapped, offset)
+        return self._packet.unpack_from(self._tail, offset - self._map_size)
+
+    def __iter__(self) -> Iterator[AT]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE, start: int = 0, stop: Optional[int] = None) -> Iterator[List[AT]]:
+        """Iterate over the records in batches
+
+        Args:
+            batch_size (int, optional): records in the batch. Defaults to DEFAULT_BATCH_SIZE.
+            start (int, optional): first record. Defaults to 0.
+            stop (Optional[int], optional): record to stop before. Defaults to the end of the file.
+
+        Yields:
+            Iterator[List[AT]]: loaded records
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for i in range(start, stop, batch_size):
+            yield self._read(i, min(i + batch_size, stop))
+
+    def append(self, pckt: AT):
+        """Append the record to the end of the file
+
+        Args:
+            pckt (AT): packet to append
+        """
+        self._write(pckt.pack())
+
+    def extend(self, packets: Iterable[AT]):
+        """Append records to the end of the file
+
+        Args:
+            packets (Iterable[AT]): packets to append
+        """
+        self._write(self._packet.pack_many(packets))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """Close the map and the file. Records loaded before stay valid."""
+        self._unmap()
+        self._file.close()
+
+    def _read(self, start: int, stop: int) -> List[AT]:
+        if start >= stop:
+            return []
+        size = self._record_size
+        mapped = self._mapped()
+        split = self._map_size // size
+        records: List[AT] = []
+        if start < split:
+            with memoryview(mapped) as whole, whole[start * size:min(stop, split) * size] as part:
+                records.extend(self._packet.iter_unpack(part))
+        if stop > split:
+            offset = self._map_size
+            with memoryview(self._tail) as tail, tail[max(start * size - offset, 0):stop * size - offset] as part:
+                records.extend(self._packet.iter_unpack(part))
+        return records
+
+    def _write(self, data: bytes):
+        if not self._writable:
+            raise ValueError('File is opened for reading')
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        if self._map is not None:
+            # the map doesn't cover appended records, they are kept in the memory
+            # and the file is mapped again on read when there are too many of them
+            self._tail += data
+            if len(self._tail) > _MAX_TAIL:
+                self._unmap()
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            self._map_size = self._size
+        return self._map
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_size = 0
+            self._tail.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
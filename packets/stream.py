@@ -0,0 +1,344 @@
+# -*- coding:utf-8 -*-
+"""Streams of packets.
+
+Packets are stored one JSON value per record, records are separated by new lines (NDJSON)
+or prefixed with the record separator (JSON text sequences, RFC 7464).
+Streams may be compressed with gzip, bz2 or lzma.
+"""
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Union, IO, Callable, Dict, Iterable, Self, Type, TypeVar
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+import io
+import os
+import bz2
+import gzip
+import lzma
+from . import _json as json
+from ._trust import Trust, current_trust, validate_trust
+if TYPE_CHECKING:
+    from ._packetbase import PacketBase
+
+
+__all__ = [
+    'DEFAULT_CHUNK_SIZE', 'DEFAULT_BATCH_SIZE', 'open_compressed', 'decode_records', 'iter_raw_batches',
+    'iter_load', 'load_parallel', 'load_records', 'PacketWriter',
+]
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_BATCH_SIZE = 1024
+
+T = TypeVar('T', bound='PacketBase')
+
+_MAGICS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'lzma'),
+)
+_MAGIC_SIZE = max(len(magic) for magic, _ in _MAGICS)
+
+
+def _open_gzip(fileobj: IO, mode: str, level: Optional[int]) -> IO:
+    return gzip.GzipFile(fileobj=fileobj, mode=mode, compresslevel=9 if level is None else level)
+
+
+def _open_bz2(fileobj: IO, mode: str, level: Optional[int]) -> IO:
+    return bz2.BZ2File(fileobj, mode, compresslevel=9 if level is None else level)
+
+
+def _open_lzma(fileobj: IO, mode: str, level: Optional[int]) -> IO:
+    return lzma.LZMAFile(fileobj, mode, preset=level)
+
+
+_OPENERS: Dict[str, Callable[[IO, str, Optional[int]], IO]] = {
+    'gzip': _open_gzip,
+    'bz2': _open_bz2,
+    'lzma': _open_lzma,
+}
+
+
+class _Prepended():
+    """Readable file returning already read `head` before the rest of `fileobj`"""
+
+    def __init__(self, head: Union[bytes, str], fileobj: IO) -> None:
+        self._head = head
+        self._fileobj = fileobj
+
+    def read(self, size: int = -1) -> Union[bytes, str]:
+        head = self._head
+        if not head:
+            return self._fileobj.read(size)
+        if size is None or size < 0:
+            self._head = head[:0]
+            return head + self._fileobj.read()
+        self._head = head[size:]
+        return head[:size]
+
+
+def open_compressed(fileobj: IO, compression: Optional[str] = 'auto', mode: str = 'rb', level: Optional[int] = None) -> IO:
+    """Wrap file object to (de)compress the data passing through it
+
+    Args:
+        fileobj (IO): file object to wrap
+        compression (Optional[str], optional): one of `gzip`, `bz2`, `lzma` or None for no compression.
+            `auto` detects compression of readable streams by the magic bytes. Defaults to 'auto'.
+        mode (str, optional): `rb` for reading or `wb` for writing. Defaults to 'rb'.
+        level (Optional[int], optional): compression level for writing. Defaults to the codec default.
+
+    Raises:
+        ValueError: compression is unknown
+
+    Returns:
+        IO: wrapped file object or `fileobj` itself if it is not compressed
+    """
+    if compression == 'auto':
+        if mode != 'rb':
+            raise ValueError('Compression can be detected only on reading')
+        head = fileobj.read(_MAGIC_SIZE)
+        fileobj = _Prepended(head, fileobj) # type: ignore
+        compression = None
+        if isinstance(head, bytes):
+            for magic, name in _MAGICS:
+                if head.startswith(magic):
+                    compression = name
+                    break
+    if compression is None:
+        return fileobj
+    opener = _OPENERS.get(compression, None)
+    if opener is None:
+        raise ValueError(f'Unknown compression "{compression}"')
+    return opener(fileobj, mode, level)
+
+
+def decode_records(records: List[Any], text: Optional[bool] = None) -> List[Any]:
+    """Decode the batch of JSON records. Every record is decoded on its own, so a broken
+    record or the one with several values is rejected instead of being merged with the neighbours.
+    Blank records are skipped.
+
+    Args:
+        records (List[Any]): encoded records, all of them `str` or all `bytes`
+        text (Optional[bool], optional): whether records are `str`. Defaults to detect by the first record.
+
+    Returns:
+        List[Any]: decoded records
+    """
+    if not records:
+        return []
+    if text is None:
+        text = isinstance(records[0], str)
+    blank = ' \t\r\n\x1e' if text else b' \t\r\n\x1e'
+    loads = json.loads
+    return [loads(r) for r in records if r.strip(blank)]
+
+
+def iter_raw_batches(fileobj: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Read the stream of JSON records in chunks.
+    Records are split by new lines, or by the record separator if the stream starts with one.
+
+    Args:
+        fileobj (IO): readable file object (binary or text)
+        chunk_size (int, optional): size of the chunk to read at once. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Yields:
+        Iterator[List[Any]]: decoded records of every chunk read
+    """
+    read = fileobj.read
+    sep = None
+    tail = None
+    text = False
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        if tail:
+            chunk = tail + chunk
+        if sep is None:
+            text = isinstance(chunk, str)
+            # not lstrip(), which takes the record separator for a whitespace
+            stripped = chunk.lstrip(' \t\r\n' if text else b' \t\r\n')
+            if not stripped:
+                tail = chunk[:0]
+                continue
+            rs = '\x1e' if text else b'\x1e'
+            sep = rs if stripped[:1] == rs else ('\n' if text else b'\n')
+        records = chunk.split(sep)
+        tail = records.pop()
+        if records and not records[0]:
+            # leading separator of JSON text sequence
+            records.pop(0)
+        yield decode_records(records, text)
+    if tail and tail.strip():
+        yield decode_records([tail], text)
+
+
+def iter_load(packet: Type[T], fileobj: IO, strict=True, compression: Optional[str] = 'auto', chunk_size: Optional[int] = None, trust: Optional[Trust] = None) -> Iterator[T]:
+    """Load packets from the stream of JSON records. Implementation of `PacketBase.iter_load`.
+
+    Args:
+        packet (Type[T]): packet class
+        fileobj (IO): readable file object (binary or text)
+        strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+        compression (Optional[str], optional): `gzip`, `bz2`, `lzma`, None or `auto` to detect. Defaults to 'auto'.
+        chunk_size (Optional[int], optional): size of the chunk to read at once. Defaults to DEFAULT_CHUNK_SIZE.
+        trust (Optional[Trust], optional): validation level of the raw data. Defaults to `__trust__` of the class.
+
+    Yields:
+        Iterator[T]: loaded packets
+    """
+    stream = open_compressed(fileobj, compression)
+    for raw_items in iter_raw_batches(stream, chunk_size or DEFAULT_CHUNK_SIZE):
+        yield from packet.load_many(raw_items, strict, trust)
+
+
+def load_parallel(packet: Type[T], records: Iterable[Union[str, bytes]], workers: Optional[int] = None, batch_size: int = 1000, strict=True, executor: Optional[Executor] = None, trust: Optional[Trust] = None, max_pending: Optional[int] = None) -> List[T]:
+    """Decode JSON records to packets in the pool of processes. Implementation of `PacketBase.load_parallel`.
+
+    Args:
+        packet (Type[T]): packet class, importable by workers
+        records (Iterable[Union[str, bytes]]): JSON encoded packets (e.x. NDJSON lines)
+        workers (Optional[int], optional): number of processes. Defaults to the CPU count.
+        batch_size (int, optional): records to send to a worker at once. Defaults to 1000.
+        strict (bool, optional): whether to raise on required fields missing. Defaults to True.
+        executor (Optional[Executor], optional): pool to reuse instead of creating one per call. Defaults to None.
+        trust (Optional[Trust], optional): validation level of the raw data.
+            Defaults to the level of the outer call, otherwise `__trust__` of the class.
+        max_pending (Optional[int], optional): batches submitted and not collected yet. Defaults to twice the workers.
+
+    Returns:
+        List[T]: loaded packets in the order of records
+    """
+    # workers don't share the context, the level goes with the tasks
+    trust = validate_trust(trust) if trust is not None else current_trust.get()
+    if max_pending is None:
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+    it = iter(records)
+    batches = iter(lambda: list(islice(it, batch_size)), [])
+    if executor is None:
+        with ProcessPoolExecutor(workers) as pool:
+            return _load_batches(pool, packet, batches, strict, trust, max_pending)
+    return _load_batches(executor, packet, batches, strict, trust, max_pending)
+
+
+def _load_batches(executor: Executor, packet: Type[T], batches: Iterator[List[Union[str, bytes]]], strict: bool, trust: Optional[Trust], max_pending: int) -> List[T]:
+    # batches are submitted only as the earlier ones are collected,
+    # so the records iterator is not drained into the pool queue at once
+    pending: 'deque[Future[List[T]]]' = deque()
+    res: List[T] = []
+    try:
+        for batch in batches:
+            if len(pending) >= max_pending:
+                res.extend(pending.popleft().result())
+            pending.append(executor.submit(load_records, packet, batch, strict, trust))
+        while pending:
+            res.extend(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
+    return res
+
+
+def load_records(packet: Type[T], records: List[Union[str, bytes]], strict=True, trust: Optional[Trust] = None) -> List[T]:
+    """Decode JSON records and load them to packets. Worker of `load_parallel`."""
+    return packet.load_many(decode_records(records), strict, trust)
+
+
+class PacketWriter():
+    """Buffered writer of packets to the NDJSON stream.
+
+    Packets are dumped on `write` and encoded in batches of `batch_size` records,
+    every batch is written to the file with a single `write` call.
+
+    e.x.
+    with PacketWriter(f, compression='gzip') as writer:
+        writer.write_many(packets)
+    """
+
+    def __init__(self, fileobj: IO, compression: Optional[str] = None, level: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, json_seq: bool = False) -> None:
+        """Constructor
+
+        Args:
+            fileobj (IO): writable file object. Text files are supported only without compression.
+            compression (Optional[str], optional): `gzip`, `bz2`, `lzma` or None. Defaults to None.
+            level (Optional[int], optional): compression level. Defaults to the codec default.
+            batch_size (int, optional): records to collect before writing. Defaults to DEFAULT_BATCH_SIZE.
+            json_seq (bool, optional): write JSON text sequence (RFC 7464) instead of NDJSON. Defaults to False.
+        """
+        self._text = isinstance(fileobj, io.TextIOBase)
+        if self._text and compression is not None:
+            raise ValueError('Compressed stream requires binary file')
+        self._stream = open_compressed(fileobj, compression, 'wb', level)
+        self._compressed = self._stream is not fileobj
+        self._batch_size = batch_size
+        self._prefix = '\x1e' if json_seq else ''
+        self._records: List[Any] = []
+        self._closed = False
+
+    def write(self, pckt: 'PacketBase'):
+        """Dump the packet and put it to the batch
+
+        Args:
+            pckt (PacketBase): packet to write
+        """
+        self._records.append(pckt.dump())
+        if len(self._records) >= self._batch_size:
+            self._write_batch()
+
+    def write_many(self, packets: Iterable['PacketBase']):
+        """Dump packets and put them to the batch
+
+        Args:
+            packets (Iterable[PacketBase]): packets to write
+        """
+        records = self._records
+        for pckt in packets:
+            records.append(pckt.dump())
+            if len(records) >= self._batch_size:
+                self._write_batch()
+                records = self._records
+
+    def write_raw(self, raw_data: Any):
+        """Put already dumped packet to the batch
+
+        Args:
+            raw_data (Any): dumped packet
+        """
+        self._records.append(raw_data)
+        if len(self._records) >= self._batch_size:
+            self._write_batch()
+
+    def flush(self):
+        """Write pending records and flush the file"""
+        self._write_batch()
+        self._stream.flush()
+
+    def close(self):
+        """Write pending records and finish the compressed stream.
+        The file object passed to constructor is not closed.
+        """
+        if self._closed:
+            return
+        self._write_batch()
+        if self._compressed:
+            self._stream.close()
+        else:
+            self._stream.flush()
+        self._closed = True
+
+    def _write_batch(self):
+        records = self._records
+        if not records:
+            return
+        self._records = []
+        prefix = self._prefix
+        if self._text:
+            self._stream.write(prefix + f'\n{prefix}'.join(map(json.dumps, records)) + '\n')
+        else:
+            bprefix = prefix.encode()
+            self._stream.write(bprefix + (b'\n' + bprefix).join(map(json.dumpb, records)) + b'\n')
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,5 +1,6 @@
 # -*- coding:utf-8 -*-
-from typing import TypeAlias, Any
+from typing import TypeAlias, Any, Iterable, List
+from copy import deepcopy
 from ..processors.base import TypeDef
 
 
@@ -14,9 +15,47 @@ class AnyD(TypeDef[object]):
     def raw_to_py(self, r: Any, strict=True) -> Any:
         return r
 
+    def parse_raw(self, r: Any, strict=True) -> Any:
+        return r
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[Any]:
+        if not self.raw_to_py_is_identity():
+            return super().raw_to_py_many(rs, strict)
+        return list(rs)
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[Any]:
+        if type(self).parse_raw is not AnyD.parse_raw:
+            return super().parse_raw_many(rs, strict)
+        return list(rs)
+
     def py_to_raw(self, v: Any) -> Any:
         return v
 
+    def py_to_raw_many(self, vs: Iterable[Any]) -> List[Any]:
+        if not self.py_to_raw_is_identity():
+            return super().py_to_raw_many(vs)
+        return list(vs)
+
+    def emit_py_many(self, vs: Iterable[Any]) -> List[Any]:
+        if type(self).emit_py is not AnyD.emit_py:
+            return super().emit_py_many(vs)
+        return list(vs)
+
+    def emit_py(self, v: Any) -> Any:
+        return v
+
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: Any) -> Any:
+        return deepcopy(v)
+
+    def raw_to_py_is_identity(self) -> bool:
+        return type(self).raw_to_py is AnyD.raw_to_py
+
+    def py_to_raw_is_identity(self) -> bool:
+        return type(self).py_to_raw is AnyD.py_to_raw
+
     def zero_value(self) -> object:
         return None
 
@@ -1,6 +1,6 @@
 # -*- coding:utf-8 -*-
-from typing import TypeAlias
-from ..processors.base import TypeDef
+from typing import TypeAlias, Any, Tuple, Optional
+from ..processors.base import TypeDef, invalid_raw, invalid_py
 
 
 class Bool(TypeDef[bool]):
@@ -18,12 +18,36 @@ class Bool(TypeDef[bool]):
         else:
             return int(r) > 0
 
+    def parse_raw(self, r, strict=True) -> bool:
+        if r.__class__ is bool:
+            return r
+        if not isinstance(r, (bool, int, float, str)):
+            raise invalid_raw(r)
+        return self.raw_to_py(r, strict)
+
     def py_to_raw(self, v: bool) -> bool:
         return v
 
+    def emit_py(self, v: bool) -> bool:
+        if not isinstance(v, bool):
+            raise invalid_py(v)
+        return v
+
+    def py_to_raw_is_identity(self) -> bool:
+        return type(self).py_to_raw is Bool.py_to_raw
+
     def zero_value(self) -> bool:
         return False
 
+    def struct_format(self) -> Optional[str]:
+        return '?'
+
+    def write_binary(self, r: Any, buf: bytearray):
+        buf.append(1 if self.raw_to_py(r) else 0)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        return data[pos] != 0, pos + 1
+
     def self_type(self) -> type[bool]:
         return bool
 
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
-from typing import TypeAlias
-from ..processors.base import TypeDef
+from typing import TypeAlias, Any, Tuple
+from ..processors.base import TypeDef, invalid_raw, invalid_py
+from .._binary import write_block, read_block, skip_block
 
 
 class Bytes(TypeDef[bytes]):
@@ -13,12 +14,38 @@ class Bytes(TypeDef[bytes]):
     def raw_to_py(self, r: bytes, strict=True) -> bytes:
         return r
 
+    def parse_raw(self, r: bytes, strict=True) -> bytes:
+        if not isinstance(r, bytes):
+            raise invalid_raw(r)
+        return r
+
     def py_to_raw(self, v: bytes) -> bytes:
         return v
 
+    def emit_py(self, v: bytes) -> bytes:
+        if not isinstance(v, bytes):
+            raise invalid_py(v)
+        return v
+
+    def raw_to_py_is_identity(self) -> bool:
+        return type(self).raw_to_py is Bytes.raw_to_py
+
+    def py_to_raw_is_identity(self) -> bool:
+        return type(self).py_to_raw is Bytes.py_to_raw
+
     def zero_value(self) -> bytes:
         return b''
 
+    def write_binary(self, r: Any, buf: bytearray):
+        write_block(buf, r)
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        block, pos = read_block(data, pos)
+        return bytes(block), pos
+
+    def skip_binary(self, data: memoryview, pos: int) -> int:
+        return skip_block(data, pos)
+
     def self_type(self) -> type[bytes]:
         return bytes
 
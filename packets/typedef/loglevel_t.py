@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
 from typing import TypeAlias
 from logging import _levelToName, _nameToLevel, DEBUG
-from ..processors.base import TypeDef
+from ..processors.base import TypeDef, invalid_raw, invalid_py
 
 
 class Loglevel(TypeDef[int]):
@@ -14,9 +14,21 @@ class Loglevel(TypeDef[int]):
     def raw_to_py(self, r: str, strict=True) -> int:
         return _nameToLevel[r.upper()]
 
+    def parse_raw(self, r: str, strict=True) -> int:
+        level = _nameToLevel.get(r.upper()) if isinstance(r, str) else None
+        if level is None:
+            raise invalid_raw(r)
+        return level
+
     def py_to_raw(self, v: int) -> str:
         return _levelToName[v]
 
+    def emit_py(self, v: int) -> str:
+        name = _levelToName.get(v)
+        if name is None:
+            raise invalid_py(v)
+        return name
+
     def zero_value(self) -> int:
         return DEBUG
 
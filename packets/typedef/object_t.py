@@ -1,7 +1,9 @@
 # -*- coding:utf-8 -*-
-from typing import Type, Optional, TypeVar, Dict
-from ..processors.base import TypeDef
+from typing import Union, Any, Type, Optional, TypeVar, Dict
+from copy import deepcopy
+from ..processors.base import TypeDef, invalid_raw, invalid_py, copy_container_state, compact_container_changes
 from .._packetbase import PacketBase
+from .._journal import next_version
 from .._types import DiffKeys
 
 
@@ -12,20 +14,25 @@ _V = TypeVar('_V')
 class ObjectT(Dict[_K, _V]):
     _ro = False
     __parent__: Optional[PacketBase] = None
-    __modified__: bool = False
-    __diff__ = set()
+    __modified__: Union[bool, int] = False
+    __diff__: Optional[Dict[Any, int]] = None
 
     def __setitem__(self, key, value):
         if not self._ro:
             super().__setitem__(key, value)
-            self.set_modified()
-            self.__diff__.add(key)
+            self._changed(key)
 
     def __delitem__(self, key):
         if not self._ro:
             super().__delitem__(key)
-            self.set_modified()
-            self.__diff__.add(key)
+            self._changed(key)
+
+    def _changed(self, key):
+        version = next_version()
+        self.set_modified(version)
+        if self.__diff__ is None:
+            self.__diff__ = {}
+        self.__diff__[key] = version
 
     def set_ro(self, ro: bool):
         self._ro = ro
@@ -35,13 +42,18 @@ class ObjectT(Dict[_K, _V]):
             if isinstance(vi, PacketBase):
                 vi.set_ro(ro)
 
-    def is_modified(self) -> bool:
-        return self.__modified__
+    def is_modified(self, since: int = 0) -> bool:
+        return self.__modified__ > since
     
-    def set_modified(self):
-        self.__modified__ = True
+    def set_modified(self, version: Optional[int] = None):
+        if version is None:
+            version = next_version()
+        self.__modified__ = version
         if self.__parent__:
-            self.__parent__.set_modified()
+            self.__parent__.set_modified(version)
+
+    def compact_changes(self, since: int):
+        compact_container_changes(self, since, self.values())
 
 
 class Object(TypeDef[Dict[_K, _V]]):
@@ -58,28 +70,47 @@ class Object(TypeDef[Dict[_K, _V]]):
 
     def raw_to_py(self, r, strict=True) -> ObjectT:
         d = ObjectT(r)
-        d.__diff__ = set()
         d.__modified__ = False
         return d
     
+    def parse_raw(self, r, strict=True) -> ObjectT:
+        if not isinstance(r, dict):
+            raise invalid_raw(r)
+        return self.raw_to_py(r, strict)
+
     def py_to_raw(self, v: ObjectT) -> dict:
         return v
+
+    def emit_py(self, v: ObjectT) -> dict:
+        if not isinstance(v, dict):
+            raise invalid_py(v)
+        return v
     
     def py_to_py(self, v: dict) -> Optional[ObjectT]:
         return None if v is None else ObjectT(v) if not isinstance(v, ObjectT) else v
 
+    def is_mutable(self) -> bool:
+        return True
+
+    def copy_py(self, v: ObjectT) -> ObjectT:
+        c = ObjectT({k: deepcopy(vi) for k, vi in v.items()})
+        copy_container_state(v, c)
+        return c
+
     def zero_value(self) -> dict:
         return {}
 
     def self_type(self) -> Type[ObjectT]:
         return ObjectT[_K, _V]
 
-    def diff_keys(self, data: ObjectT) -> DiffKeys:
+    def diff_keys(self, data: ObjectT, since: int = 0) -> DiffKeys:
         res = {}
-        for k in data.__diff__:
+        for k, version in (data.__diff__ or {}).items():
+            if version <= since:
+                continue
             v = data.get(k)
             if isinstance(v, ObjectT):
-                res[k] = self.diff_keys(v)
+                res[k] = self.diff_keys(v, since)
             else:
                 res[k] = super().diff_keys({})
         return res
@@ -1,8 +1,9 @@
 # -*- coding:utf-8 -*-
-from typing import Type, TypeAlias, Self
+from typing import Type, TypeAlias, Self, Iterable, Any, List
 import time
 import datetime
-from ..processors.base import TypeDef
+from ..processors.base import TypeDef, invalid_raw, invalid_py
+from ..processors.date import datetime_parser, cached_parser
 from .unixtime_t import UnixtimeT
 
 
@@ -12,17 +13,25 @@ StrDateUnixtimeT: TypeAlias = UnixtimeT
 class UnixtimeAsDateString(TypeDef[StrDateUnixtimeT]):
     """Unixtime processor. Stores `unixtime` as string using `self._date_format`"""
 
-    def __init__(self, date_format: str):
+    def __init__(self, date_format: str, cache_size: int = 0):
         """Constructor
 
         Args:
             date_format (str): the format string to store and decode datetime value.
+            cache_size (int, optional): size of LRU cache of the parsed values. Defaults to 0, no cache.
         """
         super().__init__()
 
         if '%z' in date_format:
             raise NotImplementedError('Timezone dates are not supported')
         self._date_format = date_format
+        self._cache_size = cache_size
+        parse_datetime = datetime_parser(date_format)
+        mktime = time.mktime
+
+        def parse(r: str) -> StrDateUnixtimeT:
+            return StrDateUnixtimeT(mktime(parse_datetime(r).timetuple()))
+        self._parse = cached_parser(parse, cache_size)
     
     def check_py(self, v: StrDateUnixtimeT) -> bool:
         if v < 0 or v > 4294967295:
@@ -33,13 +42,26 @@ class UnixtimeAsDateString(TypeDef[StrDateUnixtimeT]):
         return isinstance(r, str)
     
     def raw_to_py(self, r: str, strict=True) -> StrDateUnixtimeT:
-        return StrDateUnixtimeT(time.mktime(
-            datetime.datetime.strptime(r, self._date_format).timetuple()
-        ))
+        return self._parse(r)
+
+    def parse_raw(self, r: str, strict=True) -> StrDateUnixtimeT:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        return self._parse(r)
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[StrDateUnixtimeT]:
+        if type(self).raw_to_py is not UnixtimeAsDateString.raw_to_py:
+            return super().raw_to_py_many(rs, strict)
+        return list(map(self._parse, rs))
 
     def py_to_raw(self, v: StrDateUnixtimeT) -> str:
         return datetime.datetime.fromtimestamp(float(v)).strftime(self._date_format)
 
+    def emit_py(self, v: StrDateUnixtimeT) -> str:
+        if not self.check_py(v):
+            raise invalid_py(v)
+        return self.py_to_raw(v)
+
     def zero_value(self) -> StrDateUnixtimeT:
         return StrDateUnixtimeT(time.time())
 
@@ -47,7 +69,7 @@ class UnixtimeAsDateString(TypeDef[StrDateUnixtimeT]):
         return StrDateUnixtimeT
     
     def clone(self) -> Self:
-        c = self.__class__(self._date_format)
+        c = self.__class__(self._date_format, self._cache_size)
         c.set_ro(False)
         return c
 
@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
 from typing import Type, TypeAlias
 import time
-from ..processors.base import TypeDef
+from ..processors.base import TypeDef, invalid_raw, invalid_py
 from .unixtime_t import UnixtimeT
 
 
@@ -24,9 +24,22 @@ class UnixtimeAsString(TypeDef[StrUnixtimeT]):
     def raw_to_py(self, r: str, strict=True) -> StrUnixtimeT:
         return StrUnixtimeT(float(r))
 
+    def parse_raw(self, r: str, strict=True) -> StrUnixtimeT:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        f = float(r)
+        if f < 0 or f > 4294967295:
+            raise invalid_raw(r)
+        return StrUnixtimeT(f)
+
     def py_to_raw(self, v: StrUnixtimeT) -> str:
         return str(int(v))
 
+    def emit_py(self, v: StrUnixtimeT) -> str:
+        if not isinstance(v, (int, float)) or v < 0 or v > 4294967295:
+            raise invalid_py(v)
+        return str(int(v))
+
     def zero_value(self) -> StrUnixtimeT:
         return StrUnixtimeT(time.time())
 
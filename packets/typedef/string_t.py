@@ -1,6 +1,10 @@
 # -*- coding:utf-8 -*-
-from typing import Optional, TypeAlias, Self
-from ..processors.base import TypeDef
+from typing import Optional, TypeAlias, Self, Any, Tuple, Iterable, List
+from ..processors.base import TypeDef, invalid_raw, invalid_py
+from .._binary import write_block, read_block, skip_block
+
+
+_STR_TYPES = frozenset((str, ))
 
 
 class String(TypeDef[str]):
@@ -25,15 +29,75 @@ class String(TypeDef[str]):
         else:
             return str(r)
 
+    def parse_raw(self, r, strict=True) -> str:
+        if not isinstance(r, str):
+            raise invalid_raw(r)
+        if self._trim and self._max_length:
+            return r[0:self._max_length]
+        return r
+
+    def raw_to_py_many(self, rs: Iterable[Any], strict=True) -> List[str]:
+        if type(self).raw_to_py is not String.raw_to_py or (self._trim and self._max_length):
+            return super().raw_to_py_many(rs, strict)
+        return list(map(str, rs))
+
+    def parse_raw_many(self, rs: Iterable[Any], strict=True) -> List[str]:
+        if type(self).parse_raw is not String.parse_raw:
+            return super().parse_raw_many(rs, strict)
+        rs = rs if isinstance(rs, list) else list(rs)
+        if not _STR_TYPES.issuperset(map(type, rs)):
+            # the item by item pass raises on the invalid value
+            return super().parse_raw_many(rs, strict)
+        if self._trim and self._max_length:
+            n = self._max_length
+            return [r[0:n] for r in rs]
+        return rs[:]
+
     def py_to_raw(self, v: str) -> str:
         if self._trim and self._max_length:
             return str(v)[0:self._max_length]
         else:
             return str(v)
 
+    def py_to_raw_many(self, vs: Iterable[str]) -> List[str]:
+        if not self.py_to_raw_is_identity():
+            return super().py_to_raw_many(vs)
+        return list(map(str, vs))
+
+    def emit_py_many(self, vs: Iterable[str]) -> List[str]:
+        if type(self).emit_py is not String.emit_py:
+            return super().emit_py_many(vs)
+        vs = vs if isinstance(vs, list) else list(vs)
+        if not _STR_TYPES.issuperset(map(type, vs)):
+            return super().emit_py_many(vs)
+        if self._trim and self._max_length:
+            n = self._max_length
+            return [v[0:n] for v in vs]
+        return vs[:]
+
+    def emit_py(self, v: str) -> str:
+        if not isinstance(v, str):
+            raise invalid_py(v)
+        if self._trim and self._max_length:
+            return v[0:self._max_length]
+        return v
+
+    def py_to_raw_is_identity(self) -> bool:
+        return type(self).py_to_raw is String.py_to_raw and not (self._trim and self._max_length)
+
     def zero_value(self) -> str:
         return ''
 
+    def write_binary(self, r: Any, buf: bytearray):
+        write_block(buf, r.encode('utf-8'))
+
+    def read_binary(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        block, pos = read_block(data, pos)
+        return str(block, 'utf-8'), pos
+
+    def skip_binary(self, data: memoryview, pos: int) -> int:
+        return skip_block(data, pos)
+
     def self_type(self) -> type[str]:
         return str
 
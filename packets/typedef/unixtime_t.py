@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
-from typing import Type, Union, TypeAlias
+from typing import Type, Union, TypeAlias, Optional
 import time
-from ..processors.base import TypeDef
+from ..processors.base import TypeDef, invalid_raw, invalid_py
 
 
 UnixtimeT: TypeAlias = int
@@ -23,9 +23,22 @@ class Unixtime(TypeDef[UnixtimeT]):
     def raw_to_py(self, r: Union[int, float], strict=True) -> UnixtimeT:
         return UnixtimeT(r)
 
+    def parse_raw(self, r: Union[int, float], strict=True) -> UnixtimeT:
+        if not isinstance(r, (int, float)) or r < 0 or r > 4294967295:
+            raise invalid_raw(r)
+        return UnixtimeT(r)
+
     def py_to_raw(self, v: UnixtimeT) -> int:
         return int(v)
 
+    def emit_py(self, v: UnixtimeT) -> int:
+        if not isinstance(v, UnixtimeT) or v < 0 or v > 4294967295:
+            raise invalid_py(v)
+        return int(v)
+
+    def struct_format(self) -> Optional[str]:
+        return 'I'
+
     def zero_value(self) -> UnixtimeT:
         return int(time.time())
 
@@ -0,0 +1,103 @@
+# -*- coding:utf-8 -*-
+"""Views over the binary packet encoding."""
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional, Type
+import struct
+from ._binary import read_uvarint
+if TYPE_CHECKING:
+    from .field import Field
+    from .packet import Packet
+
+
+__all__ = ['BinaryRecord']
+
+
+class BinaryRecord(Mapping[str, Any]):
+    """Read only mapping of raw field names to raw values over the binary encoding of the packet
+    (see `PacketBase.dump_binary`). The buffer is never copied: offsets of the fields are found
+    by one scan skipping the values on the first access, a value is decoded only when it is requested.
+    Nested packets are returned as records over the part of the same buffer.
+    """
+    __slots__ = ('_packet', '_data', '_offsets')
+
+    def __init__(self, packet: 'Type[Packet]', data: memoryview) -> None:
+        """Constructor
+
+        Args:
+            packet (Type[Packet]): packet class of the encoding
+            data (memoryview): encoded packet
+        """
+        self._packet = packet
+        self._data = data
+        self._offsets: 'Optional[Dict[str, tuple[Field, int]]]' = None
+
+    @property
+    def data(self) -> memoryview:
+        """Encoded packet, e.g. to forward it as is"""
+        return self._data
+
+    def _index(self) -> 'Dict[str, tuple[Field, int]]':
+        packet = self._packet
+        data = self._data
+        fields = tuple(packet.__fields__.values())
+        offsets = {}
+        pos = 0
+        try:
+            while True:
+                tag, pos = read_uvarint(data, pos)
+                if not tag:
+                    break
+                if tag > len(fields):
+                    raise ValueError(f'Unknown field #{tag} of "{packet.__name__}"')
+                field = fields[tag - 1]
+                offsets[field.name] = (field, pos)
+                pos = field._typ.skip_binary(data, pos)
+        except (IndexError, struct.error):
+            raise ValueError(f'Binary data of "{packet.__name__}" is truncated')
+        if pos != len(data):
+            raise ValueError(f'Binary data of "{packet.__name__}" has {len(data) - pos} extra bytes')
+        self._offsets = offsets
+        return offsets
+
+    def get(self, key: str, default: Any = None) -> Any:
+        offsets = self._offsets if self._offsets is not None else self._index()
+        found = offsets.get(key)
+        if found is None:
+            return default
+        field, pos = found
+        try:
+            return field._typ.view_binary(self._data, pos)[0]
+        except (IndexError, struct.error):
+            raise ValueError(f'Binary data of "{self._packet.__name__}" is truncated')
+
+    def __getitem__(self, key: str) -> Any:
+        offsets = self._offsets if self._offsets is not None else self._index()
+        if key not in offsets:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in (self._offsets if self._offsets is not None else self._index())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets if self._offsets is not None else self._index())
+
+    def __len__(self) -> int:
+        return len(self._offsets if self._offsets is not None else self._index())
+
+    def to_raw(self) -> Dict[str, Any]:
+        """Decode all the fields
+
+        Returns:
+            Dict[str, Any]: raw packet
+        """
+        return self._packet._read_binary(self._data, 0)[0]
+
+    def __reduce__(self):
+        return (_load_record, (self._packet, bytes(self._data)))
+
+    def __repr__(self) -> str:
+        return f'<BinaryRecord {self._packet.__name__} of {len(self._data)} bytes>'
+
+
+def _load_record(packet: 'Type[Packet]', data: bytes) -> BinaryRecord:
+    return BinaryRecord(packet, memoryview(data))
@@ -0,0 +1,98 @@
+# -*- coding: utf8 -*-
+import unittest
+import asyncio
+from typing import Optional
+from packets import Packet, makeField
+from packets.aio import PacketStreamReader, PacketStreamWriter
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class Ping(Packet):
+    kind: str = makeField(string_t, required=True)
+    seq: Optional[int] = makeField(int_t)
+
+
+class Pong(Packet):
+    kind: str = makeField(string_t, required=True)
+    text: Optional[str] = makeField(string_t)
+
+
+class FakeWriter():
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+        self.writes = 0
+        self.drains = 0
+
+    def write(self, data: bytes):
+        self.writes += 1
+        self.reader.feed_data(data)
+
+    async def drain(self):
+        self.drains += 1
+
+    def close(self):
+        self.reader.feed_eof()
+
+    async def wait_closed(self):
+        pass
+
+
+class TestStreams(unittest.IsolatedAsyncioTestCase):
+    async def roundtrip(self, framing: str):
+        stream = asyncio.StreamReader()
+        fake = FakeWriter(stream)
+        writer = PacketStreamWriter(fake, framing) # type: ignore
+        pkts = [Ping(kind='ping', seq=i) for i in range(10)]
+        await asyncio.gather(*(writer.send(p) for p in pkts))
+        self.assertEqual(fake.writes, 1)
+        self.assertEqual(fake.drains, 1)
+        await writer.close()
+        received = [p async for p in PacketStreamReader(stream, Ping, framing)]
+        self.assertEqual(received, pkts)
+
+    async def test_ndjson(self):
+        await self.roundtrip('ndjson')
+
+    async def test_length(self):
+        await self.roundtrip('length')
+
+    async def test_dispatch(self):
+        stream = asyncio.StreamReader()
+        writer = PacketStreamWriter(FakeWriter(stream)) # type: ignore
+        writer.write(Ping(kind='ping', seq=1))
+        writer.write(Pong(kind='pong', text='x'))
+        await writer.close()
+        reader = PacketStreamReader(stream, {'ping': Ping, 'pong': Pong}, key='kind')
+        self.assertIsInstance(await reader.read(), Ping)
+        self.assertIsInstance(await reader.read(), Pong)
+        self.assertIsNone(await reader.read())
+
+    async def test_truncated(self):
+        stream = asyncio.StreamReader()
+        stream.feed_data(b'\x00\x00\x00\x10{}')
+        stream.feed_eof()
+        with self.assertRaises(ValueError):
+            await PacketStreamReader(stream, Ping, 'length').read()
+
+    async def test_max_frame(self):
+        big = b'{"kind": "' + b'x' * (100 << 10) + b'"}\n'
+        stream = asyncio.StreamReader()
+        stream.feed_data(big + b'{"kind": "ping"}')
+        stream.feed_eof()
+        reader = PacketStreamReader(stream, Ping)
+        self.assertEqual(len((await reader.read()).kind), 100 << 10)
+        self.assertEqual((await reader.read()).kind, 'ping')
+        self.assertIsNone(await reader.read())
+        for data in (big, big[:-1], big[-2000:]):
+            stream = asyncio.StreamReader()
+            stream.feed_data(data)
+            stream.feed_eof()
+            with self.assertRaisesRegex(ValueError, 'too large'):
+                await PacketStreamReader(stream, Ping, max_frame=1000).read()
+
+    async def test_stream_limit(self):
+        stream = asyncio.StreamReader(limit=16)
+        stream.feed_data(b'{"kind": "ping", "seq": 1}\n\n{"kind": "ping", "seq": 2}\n')
+        stream.feed_eof()
+        self.assertEqual([p.seq async for p in PacketStreamReader(stream, Ping, max_frame=30)], [1, 2])
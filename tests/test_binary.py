@@ -0,0 +1,168 @@
+# -*- coding: utf8 -*-
+import unittest
+import datetime
+import json
+from enum import Enum, Flag as EnumFlag
+from typing import Optional
+from packets import Packet, ArrayPacket, TablePacket, makeField
+from packets.processors import Array, Hash, Set, Enumeration, Bitmask
+from packets.typedef.int_t import int_t
+from packets.typedef.uint8_t import uint8_t
+from packets.typedef.uint64_t import uint64_t
+from packets.typedef.float_t import float_t
+from packets.typedef.bool_t import bool_t
+from packets.typedef.string_t import string_t
+from packets.typedef.str_datetime_t import str_datetime_t
+from packets.typedef.uint16_t import uint16_t
+from packets.typedef.int32_t import int32_t
+from packets.typedef.double_t import double_t
+from packets.typedef.unixtime_t import unixtime_t
+
+
+class Color(Enum):
+    RED = 'red'
+    GREEN = 'green'
+
+
+class Flag(Enum):
+    A = 0
+    B = 5
+
+
+class Point(ArrayPacket):
+    x: int = makeField(int_t, required=True)
+    y: int = makeField(int_t, default=0)
+
+
+class Sample(Packet):
+    value: float = makeField(float_t, required=True)
+    at: Optional[datetime.datetime] = makeField(str_datetime_t)
+
+
+class Rows(TablePacket[Sample]):
+    __default_field__ = makeField(Sample, required=True)
+
+
+class Telemetry(Packet):
+    id: int = makeField(uint64_t, 'deviceId', required=True)
+    delta: Optional[int] = makeField(int_t)
+    level: Optional[int] = makeField(uint8_t)
+    ok: Optional[bool] = makeField(bool_t)
+    name: Optional[str] = makeField(string_t)
+    color: Optional[Color] = makeField(Enumeration(Color))
+    flags: Optional[set] = makeField(Bitmask(Flag))
+    points: Optional[list] = makeField(Array(Point))
+    samples: Optional[dict] = makeField(Hash(string_t, Sample))
+    tags: Optional[set] = makeField(Set(string_t))
+    rows: Optional[Rows] = makeField(Rows)
+
+
+class TestBinary(unittest.TestCase):
+    def setUp(self):
+        self.pkt = Telemetry.load({
+            'deviceId': 2**40, 'delta': -300, 'level': 7, 'ok': True, 'name': 'датчик',
+            'color': 'green', 'flags': 33, 'points': [[1, -2], [3]],
+            'samples': {'t': {'value': 36.6, 'at': '2024-01-02 03:04:05'}},
+            'tags': {'a'}, 'rows': {'r1': {'value': 1.5}},
+        })
+
+    def test_roundtrip(self):
+        data = self.pkt.dump_binary()
+        self.assertEqual(Telemetry.load_binary(data).dump(), self.pkt.dump())
+        self.assertEqual(Telemetry.load_binary(bytearray(data)).dump(), self.pkt.dump())
+        self.assertLess(len(data) * 2, len(json.dumps(self.pkt.dump(), default=list)))
+
+    def test_optional(self):
+        pkt = Telemetry(id=1)
+        self.assertEqual(pkt.dump_binary(), b'\x01\x01\x00')
+        self.assertEqual(Telemetry.load_binary(pkt.dump_binary()), pkt)
+
+    def test_broken(self):
+        data = self.pkt.dump_binary()
+        with self.assertRaises(ValueError):
+            Telemetry.load_binary(data[:-3])
+        with self.assertRaises(ValueError):
+            Telemetry.load_binary(data + b'\x00')
+        with self.assertRaises(ValueError):
+            Telemetry.load_binary(b'\x7f\x00')
+        with self.assertRaisesRegex(ValueError, 'Telemetry::id'):
+            Telemetry.load_binary(b'\x00')
+
+
+class Perm(EnumFlag):
+    R = 1
+    W = 2
+
+
+class Reading(Packet):
+    sample: Sample = makeField(Sample, required=True)
+    perm: Optional[Perm] = makeField(Enumeration(Perm))
+
+
+class TestBinaryValues(unittest.TestCase):
+    def test_nested(self):
+        pkt = Reading.load({'sample': {'value': 1.5, 'at': '2024-01-02 03:04:05'}})
+        loaded = Reading.load_binary(pkt.dump_binary())
+        self.assertEqual(loaded, pkt)
+        self.assertIs(loaded.sample.__parent__, loaded)
+        with self.assertRaisesRegex(ValueError, 'Reading::sample.*Sample::value'):
+            Reading.load_binary(b'\x01\x01\x00\x00')
+        with self.assertRaisesRegex(ValueError, 'Reading::sample'):
+            Reading.load_binary(b'\x00')
+
+    def test_not_member(self):
+        pkt = Reading.load({'sample': {'value': 1.5}, 'perm': 3})
+        with self.assertRaisesRegex(ValueError, 'Reading::perm'):
+            pkt.dump_binary()
+
+    def test_none_items(self):
+        for typ, r in (
+            (Array(int_t), [1, None, -2]),
+            (Set(string_t), {'a', None}),
+            (Hash(string_t, Point), {'a': [1, 2], 'b': None}),
+        ):
+            with self.subTest(r=r):
+                buf = bytearray()
+                typ.write_binary(r, buf)
+                self.assertEqual(typ.read_binary(memoryview(buf), 0), (r, len(buf)))
+
+
+class Frame(ArrayPacket):
+    sensor: int = makeField(uint16_t, required=True)
+    value: float = makeField(double_t, required=True)
+    at: int = makeField(unixtime_t, required=True)
+    raw: int = makeField(int32_t, default=-1)
+    ok: bool = makeField(bool_t, default=True)
+
+
+class Named(ArrayPacket):
+    sensor: int = makeField(uint16_t, required=True)
+    name: str = makeField(string_t, required=True)
+
+
+class NetFrame(Frame):
+    __byte_order__ = '!'
+
+
+class TestStructLayout(unittest.TestCase):
+    def test_layout(self):
+        self.assertEqual(Frame.struct_layout().format, '<HdIi?')
+        self.assertEqual(NetFrame.struct_layout().format, '!HdIi?')
+        with self.assertRaises(TypeError):
+            Named.struct_layout()
+
+    def test_pack(self):
+        frame = Frame.load([1, 2.5, 1700000000])
+        data = frame.pack()
+        self.assertEqual(len(data), Frame.struct_layout().size)
+        self.assertEqual(Frame.unpack_from(data), frame)
+        buf = bytearray(len(data) + 2)
+        frame.pack_into(buf, 2)
+        self.assertEqual(Frame.unpack_from(memoryview(buf), 2), frame)
+
+    def test_iter_unpack(self):
+        frames = [Frame.load([i, i / 2, 1700000000 + i, -i, bool(i % 2)]) for i in range(5)]
+        data = Frame.pack_many(frames)
+        self.assertEqual(list(Frame.iter_unpack(memoryview(data))), frames)
+        with self.assertRaises(ValueError):
+            list(Frame.iter_unpack(data[:-1]))
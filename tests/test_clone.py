@@ -0,0 +1,68 @@
+# -*- coding: utf8 -*-
+import unittest
+from copy import deepcopy
+from typing import Optional
+from packets import Packet, TablePacket, makeField
+from packets.processors import Array, Hash, Set, ArrayT, HashT
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+from packets.typedef.object_t import object_t
+
+
+class Item(Packet):
+    f1: Optional[int] = makeField(int_t)
+
+
+class Template(Packet):
+    name: Optional[str] = makeField(string_t)
+    item: Optional[Item] = makeField(Item)
+    items: Optional[ArrayT[Item]] = makeField(Array(Item))
+    tags: Optional[HashT[str, int]] = makeField(Hash(string_t, int_t))
+    ids: Optional[set] = makeField(Set(int_t))
+    extra: Optional[dict] = makeField(object_t)
+
+
+class Table(TablePacket[Item]):
+    __default_field__ = makeField(Item, required=True)
+
+
+class TestClone(unittest.TestCase):
+    def setUp(self):
+        self.pkt = Template.load({
+            'name': 'n', 'item': {'f1': 1}, 'items': [{'f1': 2}],
+            'tags': {'a': 1}, 'extra': {'x': [1]}
+        })
+        self.pkt.ids = {1, 2}
+
+    def test_copies_mutable_values(self):
+        c = self.pkt.clone()
+        self.assertEqual(c, self.pkt)
+        self.assertIs(c.name, self.pkt.name)
+        for name in ('item', 'items', 'tags', 'ids', 'extra'):
+            self.assertIsNot(getattr(c, name), getattr(self.pkt, name))
+        self.assertIsNot(c.items[0], self.pkt.items[0])
+        self.assertIsNot(c.extra['x'], self.pkt.extra['x'])
+
+    def test_parents(self):
+        c = self.pkt.clone()
+        self.assertIs(c.item.__parent__, c)
+        self.assertIs(c.tags.__parent__, c)
+        self.assertIsNone(self.pkt.item.clone().__parent__)
+        c.tags['b'] = 2
+        self.assertTrue(c.is_modified())
+        self.assertFalse(self.pkt.tags.is_modified())
+        self.assertNotIn('b', self.pkt.tags)
+
+    def test_modified_flags(self):
+        self.pkt.item.f1 = 5
+        c = deepcopy(self.pkt)
+        self.assertTrue(c.is_modified())
+        self.assertTrue(c.item.is_modified())
+        self.assertEqual(c.diff_keys(), self.pkt.diff_keys())
+
+    def test_dynamic_classes(self):
+        table = Table.load({'a': {'f1': 1}})
+        c = table.clone()
+        self.assertIs(c.__class__, table.__class__)
+        self.assertIsNot(c.a, table.a)
+        self.assertEqual(c.a.f1, 1)
@@ -0,0 +1,156 @@
+# -*- coding: utf8 -*-
+import unittest
+from typing import Optional
+from packets import Packet, ArrayPacket, makeField
+from packets._packetbase import PacketBase, load_generic
+from packets.processors import Array, Hash
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+from packets.typedef.float_t import float_t
+
+
+class Sub(Packet):
+    f1: Optional[int] = makeField(int_t)
+
+
+class Loaded(Packet):
+    a: int = makeField(int_t, '_a', required=True)
+    b: Optional[str] = makeField(string_t, default='b')
+    c: Optional[Sub] = makeField(Sub)
+    d: Optional[list] = makeField(Array(float_t))
+    e: Optional[dict] = makeField(Hash(string_t, int_t))
+
+
+class Child(Loaded):
+    a: int = makeField(int_t, default=5, override=True)
+    f: Optional[str] = makeField(string_t)
+
+
+class Row(ArrayPacket):
+    a: int = makeField(int_t, required=True)
+    b: str = makeField(string_t, default='x')
+
+
+class Plain(PacketBase):
+    a: int = makeField(int_t, '_a', required=True)
+    b: Optional[str] = makeField(string_t)
+
+    def _parse_raw(self, raw_js, strict=True, update=False):
+        for field_name, field in self.__fields__.items():
+            setattr(self, field_name, field.raw_to_py(raw_js.get(field.name), strict=strict))
+
+    def dump(self):
+        return self._dumper()(self)
+
+    def dump_partial(self, field_paths):
+        return self.dump()
+
+
+class TestGeneratedLoader(unittest.TestCase):
+    def test_same_as_generic(self):
+        raw = {'_a': 1, 'c': {'f1': 2}, 'd': [1, 2.5], 'e': {'x': 1}}
+        pkt = Loaded.load(raw)
+        self.assertIn('__load_fn__', Loaded.__dict__)
+        self.assertEqual(pkt, load_generic(Loaded, raw))
+        self.assertEqual(pkt.b, 'b')
+        self.assertIs(pkt.c.__parent__, pkt)
+        self.assertFalse(pkt.is_modified())
+        self.assertFalse(pkt.loading)
+        pkt.c.f1 = 3
+        self.assertTrue(pkt.is_modified())
+
+    def test_required(self):
+        with self.assertRaisesRegex(ValueError, 'Loaded::a'):
+            Loaded.load({})
+        self.assertIsNone(Loaded.load({}, strict=False).a)
+
+    def test_invalid_raw(self):
+        with self.assertRaisesRegex(ValueError, 'Loaded::d'):
+            Loaded.load({'_a': 1, 'd': 'zzz'})
+
+    def test_override(self):
+        pkt = Child.load({'_a': 3, 'f': 'f'})
+        self.assertIsNot(Child.__dict__['__load_fn__'], Loaded.__dict__.get('__load_fn__'))
+        self.assertEqual(pkt.a, 3)
+        self.assertEqual(pkt.f, 'f')
+        self.assertEqual(Child.load({}, strict=False).a, 5)
+
+    def test_array_packet(self):
+        self.assertEqual(Row.load([1, 'y']).dump(), [1, 'y'])
+        self.assertEqual(Row.load((1, )).dump(), [1, 'x'])
+        with self.assertRaisesRegex(ValueError, 'Row::a'):
+            Row.load([None, 'y'])
+
+    def test_custom_parse_raw(self):
+        class Custom(Packet):
+            a: Optional[int] = makeField(int_t)
+
+            def _parse_raw(self, raw_js, strict=True, update=False):
+                super()._parse_raw({'a': raw_js['b']}, strict, update)
+
+        self.assertEqual(Custom.load({'b': 1}).a, 1)
+        self.assertIs(Custom.__dict__['__load_fn__'], load_generic)
+
+    def test_on_packet_loaded(self):
+        class Hooked(Packet):
+            a: Optional[int] = makeField(int_t)
+
+            def on_packet_loaded(self):
+                self.loaded = True
+
+        self.assertTrue(Hooked.load({'a': 1}).loaded)
+
+
+class TestGeneratedDumper(unittest.TestCase):
+    def test_same_as_generic(self):
+        raw = {'_a': 1, 'c': {'f1': 2}, 'd': [1, 2.5], 'e': {'x': 1}}
+        pkt = Loaded.load(raw)
+        self.assertEqual(pkt.dump(), pkt._dump_generic())
+        self.assertEqual(pkt.dump(raw=False), pkt._dump_generic(raw=False))
+        self.assertIn('__dump_fn__', Loaded.__dict__)
+        self.assertEqual(pkt.dump(), {'_a': 1, 'b': 'b', 'c': {'f1': 2}, 'd': [1.0, 2.5], 'e': {'x': 1}})
+
+    def test_defaults(self):
+        class Defaults(Packet):
+            a: Optional[str] = makeField(string_t, default='a')
+            b: Optional[list] = makeField(Array(int_t), default=[1])
+
+        pkt = Defaults()
+        pkt.a = None
+        dumped = pkt.dump()
+        self.assertEqual(dumped, {'a': 'a', 'b': [1]})
+        self.assertIsNot(dumped['b'], Defaults().dump()['b'])
+
+    def test_required(self):
+        pkt = Loaded.load({}, strict=False)
+        with self.assertRaisesRegex(ValueError, 'Field required "_a"'):
+            pkt.dump()
+
+    def test_base_fallback(self):
+        pkt = Plain.load({'_a': 1})
+        self.assertEqual(pkt.dump(), {'_a': 1})
+        self.assertEqual(pkt._dumper()(pkt, False), {'a': 1})
+
+    def test_array_packet(self):
+        pkt = Row.load([1])
+        self.assertEqual(pkt.dump(), [1, 'x'])
+        self.assertEqual(pkt.dump(), pkt._dump_generic())
+
+
+class TestBatch(unittest.TestCase):
+    def test_load_many(self):
+        raws = [{'_a': i, 'd': [i]} for i in range(3)]
+        pkts = Loaded.load_many(raws)
+        self.assertEqual([p.a for p in pkts], [0, 1, 2])
+        self.assertEqual(Loaded.dump_many(pkts), [Loaded.load(r).dump() for r in raws])
+        self.assertEqual(Loaded.dump_many(pkts, raw=False)[0], pkts[0].dump(raw=False))
+        with self.assertRaisesRegex(ValueError, 'Loaded::a'):
+            Loaded.load_many([{'_a': 1}, {}])
+
+    def test_mixed_classes(self):
+        pkts = [Loaded.load({'_a': 1}), Child.load({'_a': 2, 'f': 'x'})]
+        self.assertEqual(Loaded.dump_many(pkts)[1], pkts[1].dump())
+
+    def test_array_packet(self):
+        rows = Row.load_many(iter([[1, 'a'], [2]]))
+        self.assertEqual(Row.dump_many(rows), [[1, 'a'], [2, 'x']])
@@ -0,0 +1,73 @@
+from typing import List
+import unittest
+import datetime
+import time
+from packets import Packet, makeField
+from packets.processors import Array, DateTime, Time
+from packets.typedef.str_date_t import str_date_t
+from packets.typedef.str_datetime_t import str_datetime_t
+from packets.typedef.str_datetime_z_t import str_datetime_z_t
+from packets.typedef.str_time_t import str_time_t
+from packets.typedef.str_date_unixtime_t import UnixtimeAsDateString, str_date_unixtime_t
+
+
+class LogLine(Packet):
+    at: datetime.datetime = makeField(DateTime('%Y-%m-%d %H:%M:%S', cache_size=16), required=True)
+    seen: List[datetime.datetime] = makeField(Array(str_datetime_t), default=[])
+
+
+class TestDates(unittest.TestCase):
+    def test_same_as_strptime(self):
+        cases = [
+            (str_date_t, ['2024-01-02', '2024-1-2', '1999-12-31']),
+            (str_datetime_t, ['2024-01-02 03:04:05', '2024-1-2 3:4:5']),
+            (DateTime('%Y-%m-%dT%H:%M:%S'), ['2024-01-02T03:04:05']),
+            (str_datetime_z_t, ['2024-01-02 03:04:05 +0300', '2024-01-02 03:04:05 -0130',
+                                '2024-01-02 03:04:05 +0000', '2024-01-02 03:04:05 Z']),
+            (DateTime('%d.%m.%Y'), ['02.01.2024']),
+        ]
+        for typ, raws in cases:
+            for r in raws:
+                with self.subTest(r=r):
+                    expected = datetime.datetime.strptime(r, typ._date_format)
+                    v = typ.raw_to_py(r)
+                    self.assertEqual(v, expected)
+                    self.assertEqual(v.tzinfo, expected.tzinfo)
+        for r in ('12:30', '1:05'):
+            self.assertEqual(str_time_t.raw_to_py(r, True), datetime.datetime.strptime(r, '%H:%M').time())
+        self.assertEqual(Time('%H:%M:%S').parse_raw('23:59:58'), datetime.time(23, 59, 58))
+
+    def test_invalid(self):
+        for typ, r in ((str_date_t, '2024-02-30'), (str_date_t, '2024-01-02 03:04:05'), (str_date_t, '20240102'),
+                       (str_datetime_t, '2024-01-02T03:04:05'), (str_datetime_z_t, '2024-01-02 03:04:05'),
+                       (str_time_t, '24:00'), (str_date_t, 20240102)):
+            with self.subTest(r=r):
+                with self.assertRaises(ValueError):
+                    typ.parse_raw(r)
+
+    def test_unixtime(self):
+        r = '2024-01-02 03:04:05'
+        expected = int(time.mktime(datetime.datetime.strptime(r, '%Y-%m-%d %H:%M:%S').timetuple()))
+        self.assertEqual(str_date_unixtime_t.parse_raw(r), expected)
+        typ = UnixtimeAsDateString('%Y-%m-%d %H:%M:%S', cache_size=4)
+        self.assertEqual(typ.raw_to_py_many([r, r]), [expected, expected])
+        self.assertEqual(typ._parse.cache_info().hits, 1)
+
+    def test_cache(self):
+        typ = LogLine.__fields__['at']._typ
+        typ._parse.cache_clear()
+        raws = [{'at': '2024-01-02 03:04:05'}, {'at': '2024-01-02 03:04:05'}, {'at': '2024-01-02 03:04:06'}]
+        lines = LogLine.load_many(raws)
+        self.assertIs(lines[0].at, lines[1].at)
+        self.assertEqual(typ._parse.cache_info().currsize, 2)
+        self.assertEqual(typ.clone()._cache_size, 16)
+        self.assertFalse(hasattr(str_datetime_t._parse, 'cache_info'))
+
+    def test_bulk(self):
+        seen = [f'2024-01-02 03:04:{i:02}' for i in range(60)] + ['2024-1-2 3:4:5']
+        for trust in ('checked', 'trusted'):
+            line = LogLine.load({'at': seen[0], 'seen': seen}, trust=trust)
+            self.assertEqual(line.seen[-1], datetime.datetime(2024, 1, 2, 3, 4, 5))
+            self.assertEqual(line.dump()['seen'][:60], seen[:60])
+        with self.assertRaisesRegex(ValueError, 'LogLine::seen'):
+            LogLine.load({'at': seen[0], 'seen': [seen[0], 1]})
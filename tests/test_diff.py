@@ -1,8 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Set
 import unittest
 from copy import deepcopy
 from packets import Packet, makeField
-from packets.processors import Array
+from packets.processors import Array, Set as SetP
 from packets.typedef.int_t import int_t
 from packets.typedef.string_t import string_t
 from packets.typedef.float_t import float_t 
@@ -19,6 +19,11 @@ class Front(Packet):
     c: Internal = makeField(Internal, required=True)
 
 
+class Board(Packet):
+    items: List[Internal] = makeField(Array(Internal), default=[])
+    tags: Set[str] = makeField(SetP(string_t), default=set())
+
+
 class TestPacketDiff(unittest.TestCase):
     def test_packet_diff(self):
         pkt = Front(
@@ -40,3 +45,57 @@ class TestPacketDiff(unittest.TestCase):
             keys_diff = pkt.diff_keys()
             self.assertIsInstance(keys_diff, dict)
             self.assertDictEqual(keys_diff, {'_a': '1', 'c': {'_e': '1', 'd': '1', 'f': '1'}})
+
+    def make_board(self) -> Board:
+        return Board.load({'items': [{'_e': str(i), 'd': i} for i in range(5)], 'tags': {'a', 'b'}})
+
+    def test_array_elements_diff(self):
+        board = self.make_board()
+        board.items[3].d = 30
+        self.assertDictEqual(board.diff_keys(), {'items': {3: {'d': '1'}}})
+        board.items[1] = Internal(e='new')
+        board.items.append(Internal(e='last'))
+        self.assertDictEqual(board.diff_keys(), {'items': {1: '1', 3: {'d': '1'}, 5: '1'}})
+        patch = board.dump_partial(board.diff_keys())
+        self.assertDictEqual(patch, {'items': {
+            'set': {'1': {'_e': 'new', 'f': []}, '5': {'_e': 'last', 'f': []}},
+            'patch': {'3': {'d': 30}},
+        }})
+        replica = self.make_board()
+        replica.apply_partial(patch)
+        self.assertEqual(replica.dump(), board.dump())
+
+    def test_array_reshaped(self):
+        board = self.make_board()
+        board.items[2].d = 20
+        del board.items[0]
+        self.assertDictEqual(board.diff_keys(), {'items': '1'})
+        board = self.make_board()
+        board.items = []
+        self.assertDictEqual(board.diff_keys(), {'items': '1'})
+
+    def test_set_members_diff(self):
+        board = self.make_board()
+        board.tags.add('c')
+        board.tags.discard('a')
+        board.tags.add('b')
+        self.assertDictEqual(board.diff_keys(), {'tags': {'a': '1', 'c': '1'}})
+        patch = board.dump_partial(board.diff_keys())
+        self.assertDictEqual(patch, {'tags': {'add': ['c'], 'del': ['a']}})
+        replica = self.make_board()
+        replica.apply_partial(patch)
+        self.assertSetEqual(replica.tags, {'b', 'c'})
+        board.tags.clear()
+        self.assertDictEqual(board.diff_keys(), {'tags': '1'})
+
+    def test_read_only_pop(self):
+        board = self.make_board()
+        board.items.set_ro(True)
+        board.tags.set_ro(True)
+        with self.assertRaises(TypeError):
+            board.items.pop()
+        with self.assertRaises(TypeError):
+            board.tags.pop()
+        self.assertEqual(len(board.items), 5)
+        self.assertEqual(len(board.tags), 2)
+        self.assertFalse(board.is_modified())
@@ -0,0 +1,71 @@
+from typing import Optional, Dict
+import unittest
+from packets import Packet, ChangeJournal, makeField
+from packets.processors import Hash
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class Item(Packet):
+    name: str = makeField(string_t, required=True)
+    count: Optional[int] = makeField(int_t)
+
+
+class State(Packet):
+    a: int = makeField(int_t, default=0)
+    item: Item = makeField(Item, required=True)
+    tags: Dict[str, int] = makeField(Hash(string_t, int_t), default={})
+
+
+class TestChangeJournal(unittest.TestCase):
+    def make_state(self) -> State:
+        return State.load({'a': 1, 'item': {'name': 'x'}, 'tags': {'t': 1}})
+
+    def test_since(self):
+        pkt = self.make_state()
+        pkt.a = 2
+        mark = pkt.__modified__
+        pkt.item.count = 3
+        pkt.tags['u'] = 2
+        self.assertDictEqual(pkt.diff_keys(), {'a': '1', 'item': {'count': '1'}, 'tags': {'u': '1'}})
+        self.assertDictEqual(pkt.diff_keys(mark), {'item': {'count': '1'}, 'tags': {'u': '1'}})
+        self.assertTrue(pkt.is_modified(mark))
+        self.assertFalse(pkt.is_modified(pkt.__modified__))
+
+    def test_hash_diff_not_shared(self):
+        pkt = self.make_state()
+        other = self.make_state()
+        pkt.tags['u'] = 2
+        self.assertDictEqual(other.diff_keys(), {})
+
+    def test_consumers(self):
+        pkt = self.make_state()
+        journal = ChangeJournal(pkt, ('fast', 'slow'))
+        self.assertFalse(journal.is_modified('fast'))
+        pkt.a = 2
+        self.assertDictEqual(journal.pull('fast'), {'a': 2})
+        self.assertFalse(journal.is_modified('fast'))
+        pkt.tags['u'] = 2
+        del pkt.tags['t']
+        self.assertDictEqual(journal.pull('fast'), {'tags': {'u': 2, 't': None}})
+        patch = journal.pull('slow')
+        self.assertDictEqual(patch, {'a': 2, 'tags': {'u': 2, 't': None}})
+        replica = self.make_state()
+        replica.apply_partial(patch)
+        self.assertEqual(replica.dump(), pkt.dump())
+
+    def test_compaction(self):
+        pkt = self.make_state()
+        journal = ChangeJournal(pkt, ('fast', 'slow'))
+        for i in range(10):
+            pkt.tags[str(i)] = i
+            del pkt.tags[str(i)]
+            journal.pull('fast')
+        self.assertEqual(len(pkt.tags.__diff__), 10)
+        self.assertEqual(len(journal.diff_keys('slow')['tags']), 10)
+        journal.advance('slow')
+        self.assertIsNone(pkt.tags.__diff__)
+        self.assertFalse(pkt.is_modified())
+        pkt.item.name = 'y'
+        journal.unsubscribe('fast')
+        self.assertDictEqual(journal.diff_keys('slow'), {'item': {'name': '1'}})
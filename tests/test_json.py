@@ -0,0 +1,88 @@
+# -*- coding: utf8 -*-
+import unittest
+import io
+from typing import Optional
+from enum import Enum
+from packets import Packet, makeField, json
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+from packets.processors import Array, Enumeration
+
+
+class Message(Packet):
+    a: Optional[int] = makeField(int_t)
+    b: Optional[str] = makeField(string_t)
+
+
+class TestBackends(unittest.TestCase):
+    def setUp(self):
+        self.default = json.backend_name()
+
+    def tearDown(self):
+        json.set_backend(self.default)
+
+    def test_backends(self):
+        self.assertIn('json', json.available_backends())
+        for name in json.available_backends():
+            json.set_backend(name)
+            self.assertEqual(json.backend_name(), name)
+            pkt = Message(a=1, b='ё')
+            data = pkt.dumpb()
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(Message.loadb(data), pkt)
+            self.assertEqual(Message.loadb(memoryview(data)), pkt)
+            self.assertEqual(Message.loads(pkt.dumps()), pkt)
+            buf = bytearray(b'>')
+            self.assertEqual(pkt.encode_into(buf), len(data))
+            self.assertEqual(bytes(buf), b'>' + data)
+
+    def test_loads_options(self):
+        from decimal import Decimal
+        for name in json.available_backends():
+            json.set_backend(name)
+            self.assertEqual(json.loads('[1.5]', parse_float=Decimal), [Decimal('1.5')])
+            self.assertEqual(json.load(io.StringIO('[1.5]'), parse_float=Decimal), [Decimal('1.5')])
+            self.assertEqual(json.loads('[1.5]'), [1.5])
+
+    def test_default_is_compatible(self):
+        json.set_backend()
+        self.assertNotEqual(json.backend_name(), 'orjson')
+        self.assertEqual(json.loads(json.dumps([2 ** 70])), [2 ** 70])
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            json.set_backend('nope')
+
+
+class Level(Enum):
+    LOW = 'low'
+    HIGH = 'high'
+
+
+class Event(Packet):
+    event_name: Optional[str] = makeField(string_t)
+    level: Optional[Level] = makeField(Enumeration(Level))
+    messages: Optional[list] = makeField(Array(Message))
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.pkt = Event(event_name='started', level=Level.HIGH, messages=[Message(a=1, b='x')])
+
+    def test_codecs(self):
+        for compression in ('zlib', 'gzip', 'lzma'):
+            data = self.pkt.dumpz(compression, level=1)
+            self.assertEqual(Event.loadz(data, compression=compression), self.pkt)
+        with self.assertRaises(ValueError):
+            self.pkt.dumpz('zip')
+        with self.assertRaises(ValueError):
+            self.pkt.dumpz('gzip', zdict=True)
+
+    def test_dictionary(self):
+        zdict = Event.compression_dictionary()
+        for word in (b'"event_name":', b'"high"', b'"a":'):
+            self.assertIn(word, zdict)
+        self.assertIs(Event.compression_dictionary(), zdict)
+        data = self.pkt.dumpz(zdict=True)
+        self.assertLess(len(data), len(self.pkt.dumpz()))
+        self.assertEqual(Event.loadz(data, zdict=True), self.pkt)
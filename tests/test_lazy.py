@@ -0,0 +1,69 @@
+# -*- coding: utf8 -*-
+import unittest
+from typing import Optional, List
+from packets import Packet, makeField
+from packets.processors import Array
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class Header(Packet):
+    route: Optional[str] = makeField(string_t)
+    hops: Optional[int] = makeField(int_t)
+
+
+class Message(Packet):
+    __use_slots__ = False
+    id: int = makeField(int_t, required=True)
+    header: Optional[Header] = makeField(Header)
+    body: Optional[List[Header]] = makeField(Array(Header))
+    note: Optional[str] = makeField(string_t, default='none')
+
+
+class SlotMessage(Packet):
+    __use_slots__ = True
+    id: int = makeField(int_t, required=True)
+    header: Optional[Header] = makeField(Header)
+
+
+RAW = {'id': 1, 'header': {'route': 'a', 'hops': 2}, 'body': [{'route': 'b'}]}
+
+
+class TestLazy(unittest.TestCase):
+    def test_access(self):
+        pkt = Message.load_lazy(RAW)
+        self.assertFalse(hasattr(pkt, '_header'))
+        assert pkt.header is not None
+        self.assertIs(pkt.header.__raw__, RAW['header'])
+        self.assertEqual(pkt.header.route, 'a')
+        self.assertIs(pkt.header.__parent__, pkt)
+        self.assertEqual(pkt.note, 'none')
+        self.assertEqual(pkt, Message.load(RAW))
+        self.assertFalse(pkt.is_modified())
+
+    def test_dump_untouched(self):
+        pkt = Message.load_lazy(RAW)
+        dumped = pkt.dump()
+        self.assertIs(dumped['header'], RAW['header'])
+        self.assertEqual(dumped, dict(RAW, note='none'))
+        pkt.id = 2
+        assert pkt.header is not None
+        pkt.header.hops = 3
+        self.assertEqual(pkt.dump(), {'id': 2, 'header': {'route': 'a', 'hops': 3}, 'body': [{'route': 'b'}], 'note': 'none'})
+        self.assertEqual(pkt.diff_keys(), {'id': '1', 'header': {'hops': '1'}})
+        self.assertEqual(RAW['header'], {'route': 'a', 'hops': 2})
+
+    def test_required(self):
+        with self.assertRaisesRegex(ValueError, 'Message::id'):
+            Message.load_lazy({'header': {}})
+
+    @unittest.skipUnless(__debug__, 'raw values are not validated with -O')
+    def test_invalid_on_access(self):
+        pkt = Message.load_lazy({'id': 1, 'header': 'zzz'})
+        with self.assertRaisesRegex(ValueError, 'Message::header'):
+            pkt.header
+
+    def test_slots(self):
+        pkt = SlotMessage.load_lazy(RAW)
+        self.assertEqual(pkt.dump(), {'id': 1, 'header': RAW['header']})
+        self.assertEqual(pkt.clone().header, Header.load(RAW['header']))
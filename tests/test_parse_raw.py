@@ -0,0 +1,153 @@
+from typing import List, Dict
+import unittest
+import enum
+from packets import Packet, makeField
+from packets.processors import Array, Hash, Number, NumberAsString, Percent, Enumeration, EnumerationByName, Bitmask, DateTime, Time
+from packets.typedef.any_t import any_t
+from packets.typedef.bool_t import bool_t
+from packets.typedef.bytes_t import bytes_t
+from packets.typedef.float_t import float_t
+from packets.typedef.int_t import int_t
+from packets.typedef.loglevel_t import loglevel_t
+from packets.typedef.object_t import object_t
+from packets.typedef.percent_t import percent_t
+from packets.typedef.str_date_unixtime_t import str_date_unixtime_t
+from packets.typedef.str_int_t import str_int_t
+from packets.typedef.str_unixtime_t import str_unixtime_t
+from packets.typedef.string_t import string_t, String
+from packets.typedef.uint8_t import uint8_t
+from packets.typedef.unixtime_t import unixtime_t
+
+
+class Color(enum.Enum):
+    red = 1
+    green = 2
+
+
+class Caps(enum.Enum):
+    a = 0
+    b = 3
+
+
+class Sample(Packet):
+    values: List[int] = makeField(Array(uint8_t), default=[])
+    rates: Dict[str, float] = makeField(Hash(string_t, float_t), default={})
+
+
+class TestParseRaw(unittest.TestCase):
+    def test_same_as_check_and_convert(self):
+        cases = [
+            (any_t, [1, 'x', None]),
+            (bool_t, [True, 0, 2.5, 'true', 'False']),
+            (bytes_t, [b'', b'abc']),
+            (int_t, [0, -5, 7.9, 2147483647]),
+            (uint8_t, [0, 255]),
+            (float_t, [1, 2.5]),
+            (percent_t, [0, 50, 100]),
+            (str_int_t, ['1', '12.5', '-3']),
+            (loglevel_t, ['debug', 'ERROR']),
+            (object_t, [{}, {'a': [1]}]),
+            (string_t, ['', 'abc']),
+            (String(2, trim=True), ['abc']),
+            (unixtime_t, [0, 1700000000]),
+            (str_unixtime_t, ['0', '1700000000']),
+            (str_date_unixtime_t, ['2024-01-02 03:04:05']),
+            (DateTime('%Y-%m-%d'), ['2024-01-02']),
+            (Time('%H:%M'), ['12:30']),
+            (Enumeration(Color), [1, 2]),
+            (EnumerationByName(Color), ['red']),
+            (Bitmask(Caps), [0, 9]),
+            (Array(int_t), [[], [1, 2]]),
+            (Hash(string_t, int_t), [{'a': 1}]),
+        ]
+        for typ, raws in cases:
+            for r in raws:
+                with self.subTest(typ=typ, r=r):
+                    self.assertTrue(typ.check_raw(r))
+                    v = typ.parse_raw(r)
+                    self.assertEqual(v, typ.raw_to_py(r, True))
+                    self.assertEqual(typ.emit_py(v), typ.py_to_raw(v))
+
+    def test_invalid(self):
+        cases = [
+            (bytes_t, ['abc']),
+            (int_t, ['1', 2147483648, None]),
+            (uint8_t, [-1, 256]),
+            (percent_t, [101]),
+            (str_int_t, [1, 'x', '256.0x']),
+            (loglevel_t, ['verbose', 10]),
+            (object_t, [[]]),
+            (string_t, [1, b'x']),
+            (unixtime_t, [-1, '1']),
+            (str_unixtime_t, [1, '-1']),
+            (DateTime('%Y-%m-%d'), [20240102]),
+            (Enumeration(Color), [3]),
+            (EnumerationByName(Color), ['blue', 1]),
+            (Bitmask(Caps), ['1']),
+            (Array(int_t), [{}, [1, 'x']]),
+            (Hash(string_t, int_t), [[], {'a': 'x'}, {1: 1}]),
+        ]
+        for typ, raws in cases:
+            for r in raws:
+                with self.subTest(typ=typ, r=r):
+                    with self.assertRaises(ValueError):
+                        typ.parse_raw(r)
+
+    def test_emit_invalid(self):
+        for typ, v in ((int_t, 'x'), (uint8_t, 300), (string_t, 1), (Array(int_t), [1, 'x']),
+                       (DateTime('%Y'), '2024'), (Enumeration(Color), 1), (unixtime_t, -1)):
+            with self.subTest(typ=typ, v=v):
+                with self.assertRaises(ValueError):
+                    typ.emit_py(v)
+
+    def test_containers_check_items(self):
+        raw = {'values': [1, 2, 300], 'rates': {'a': 0.5}}
+        with self.assertRaisesRegex(ValueError, 'Sample::values'):
+            Sample.load(raw, trust='checked')
+        self.assertEqual(Sample.load(raw, trust='trusted').values, [1, 2, 300])
+        with self.assertRaisesRegex(ValueError, 'Sample::rates'):
+            Sample.load({'rates': {'a': 'x'}}, trust='checked')
+        pkt = Sample.load({'values': [1, 2], 'rates': {'a': 0.5}})
+        self.assertEqual(pkt.dump(), {'values': [1, 2], 'rates': {'a': 0.5}})
+
+
+class TestMany(unittest.TestCase):
+    def test_same_as_single(self):
+        cases = [
+            (int_t, [1, 2.7, True, -3]),
+            (uint8_t, [0, 255]),
+            (float_t, [1, 2.5]),
+            (percent_t, [10, 50]),
+            (str_int_t, ['1', '2.5']),
+            (string_t, ['a', '']),
+            (String(2, trim=True), ['abc', 'd']),
+            (any_t, [1, 'x', None]),
+            (bool_t, [True, 'false', 0]),
+            (Enumeration(Color), [1, 2]),
+        ]
+        for typ, raws in cases:
+            with self.subTest(typ=typ):
+                vs = [typ.raw_to_py(r, True) for r in raws]
+                self.assertEqual(typ.raw_to_py_many(raws), vs)
+                self.assertEqual(typ.parse_raw_many(iter(raws)), vs)
+                dumped = [typ.py_to_raw(v) for v in vs]
+                self.assertEqual(typ.py_to_raw_many(vs), dumped)
+                self.assertEqual(typ.emit_py_many(vs), dumped)
+
+    def test_invalid(self):
+        for typ, raws in ((int_t, [1, '2']), (uint8_t, [1, 256]), (uint8_t, [-1]), (string_t, ['a', 1]),
+                          (str_int_t, ['1', 'x'])):
+            with self.subTest(typ=typ, raws=raws):
+                with self.assertRaisesRegex(ValueError, 'is not valid'):
+                    typ.parse_raw_many(raws)
+        with self.assertRaises(ValueError):
+            uint8_t.emit_py_many([1, 300])
+        self.assertEqual(int_t.parse_raw_many([]), [])
+
+    def test_containers(self):
+        raw = {'values': list(range(200)), 'rates': {str(i): i / 2 for i in range(10)}}
+        for trust in ('trusted', 'checked'):
+            pkt = Sample.load(raw, trust=trust)
+            self.assertEqual(pkt.dump(), raw)
+        pkt.values.append(7)
+        self.assertEqual(pkt.diff_keys(), {'values': {200: '1'}})
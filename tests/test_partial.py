@@ -1,11 +1,11 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 import unittest
 import pickle
-from packets import Packet, makeField
+from packets import Packet, TablePacket, makeField
 from packets.typedef.int_t import int_t
 from packets.typedef.string_t import string_t
 from packets.typedef.float_t import float_t
-from packets.processors import Array
+from packets.processors import Array, Hash
 
 
 class Internal(Packet):
@@ -52,3 +52,116 @@ class TestWithFields(unittest.TestCase):
         self.assertNotIn('e', InternalPartial.field_names())
 
         pickle.dumps(FrontPartial, -1)
+
+    def test_cached_classes(self):
+        partial = Internal.with_fields('d', 'f')
+        self.assertIs(Internal.with_fields('f', 'd'), partial)
+        self.assertIsNot(Internal.with_fields('d'), partial)
+        pkt = partial.load({'d': 1, 'f': ['a']})
+        copied = pickle.loads(pickle.dumps(pkt, -1))
+        self.assertIs(copied.__class__, partial)
+        self.assertEqual(copied, pkt)
+        copied = pickle.loads(pickle.dumps(InternalPartial.load({'d': 2}), -1))
+        self.assertIs(copied.__class__, InternalPartial)
+
+
+class RoItem(Packet):
+    a: int = makeField(int_t, required=True)
+    b: Optional[int] = makeField(int_t)
+
+
+class RoRows(TablePacket[RoItem]):
+    __default_field__ = makeField(RoItem, required=True)
+
+
+class TestReadOnly(unittest.TestCase):
+    def tearDown(self):
+        RoItem.set_ro(False)
+        RoRows.set_ro(False)
+
+    def test_with_fields(self):
+        cached = RoItem.with_fields('a')
+        RoItem.set_ro(True)
+        for pkt in (cached.load({'a': 1}), RoItem.with_fields('a', 'b').load({'a': 1})):
+            pkt.a = 2
+            self.assertEqual(pkt.a, 1)
+        RoItem.with_fields('a').set_ro(False)
+        pkt = RoItem.load({'a': 1})
+        pkt.a = 2
+        self.assertEqual(pkt.a, 2)
+
+    def test_table(self):
+        table = RoRows.load({'r1': {'a': 1}})
+        table.set_ro(True)
+        for pkt in (table, RoRows.load({'r1': {'a': 1}, 'r2': {'a': 2}})):
+            pkt.r1 = RoItem(a=5)
+            self.assertEqual(pkt.r1.a, 1)
+        RoRows.set_ro(False)
+        table.r1 = RoItem(a=5)
+        self.assertEqual(table.r1.a, 5)
+
+
+class Rows(TablePacket[Internal]):
+    __default_field__ = makeField(Internal, required=True)
+
+
+class State(Packet):
+    front: Front = makeField(Front, required=True)
+    items: Dict[str, Internal] = makeField(Hash(string_t, Internal), default={})
+    rows: Optional[Rows] = makeField(Rows)
+
+
+class TestApplyPartial(unittest.TestCase):
+    def setUp(self):
+        raw = {
+            'front': {'a': 1, 'c': {'_e': 'x', 'f': ['1']}},
+            'items': {'k1': {'_e': 'k1'}, 'k2': {'_e': 'k2'}},
+            'rows': {'r1': {'_e': 'r1'}},
+        }
+        self.source = State.load(raw)
+        self.replica = State.load(raw)
+
+    def sync(self):
+        patch = self.source.dump_partial(self.source.diff_keys())
+        return self.replica.apply_partial(patch), patch
+
+    def test_nested(self):
+        front, internal, items = self.replica.front, self.replica.front.c, self.replica.items
+        self.source.front.c.d = 5
+        self.source.items['k3'] = Internal(e='k3')
+        del self.source.items['k1']
+        replica, patch = self.sync()
+        self.assertIs(replica, self.replica)
+        self.assertEqual(patch, {'front': {'c': {'d': 5}}, 'items': {'k3': {'_e': 'k3', 'f': []}, 'k1': None}})
+        self.assertIs(replica.front, front)
+        self.assertIs(replica.front.c, internal)
+        self.assertIs(replica.items, items)
+        self.assertEqual(replica.dump(), self.source.dump())
+        self.assertTrue(replica.is_modified())
+
+    def test_replace(self):
+        self.source.front.b = 2.5
+        self.source.front.c.f = ['2']
+        replica, _ = self.sync()
+        self.assertEqual(replica.dump(), self.source.dump())
+        self.assertEqual(replica.apply_partial({'unknown': 1}), replica)
+        with self.assertRaisesRegex(ValueError, 'Internal::e'):
+            replica.apply_partial({'front': {'c': {'_e': None}}})
+
+    def test_table_classes(self):
+        rows = Rows.load({'a': {'_e': 'a'}, 'b': {'_e': 'b'}})
+        same = Rows.load({'a': {'_e': 'x'}, 'b': {'_e': 'y'}})
+        self.assertIs(rows.__class__, same.__class__)
+        self.assertIsInstance(rows, Rows)
+        self.assertIsNot(Rows.load({'a': {'_e': 'a'}}).__class__, rows.__class__)
+        self.assertIs(Rows.load({'b': {'_e': 'b'}, 'a': {'_e': 'a'}}).__class__, rows.__class__)
+        self.assertIs(rows.__class__.load({'a': {'_e': 'z'}, 'b': {'_e': 'z'}}).__class__, rows.__class__)
+        data = pickle.dumps(rows, -1)
+        copied = pickle.loads(data)
+        self.assertIs(copied.__class__, rows.__class__)
+        self.assertEqual(copied.dump(), rows.dump())
+        self.assertNotIn(b'Field', data)
+
+    def test_table_rows(self):
+        replica = self.replica.apply_partial({'rows': {'r2': {'_e': 'r2'}}})
+        self.assertEqual(replica.rows.dump(), {'r1': {'_e': 'r1', 'f': []}, 'r2': {'_e': 'r2', 'f': []}})
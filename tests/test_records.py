@@ -0,0 +1,66 @@
+# -*- coding: utf8 -*-
+import unittest
+import os
+import tempfile
+from packets import ArrayPacket, PacketFile, makeField
+from packets.typedef.uint32_t import uint32_t
+from packets.typedef.double_t import double_t
+
+
+class Tick(ArrayPacket):
+    at: int = makeField(uint32_t, required=True)
+    price: float = makeField(double_t, required=True)
+
+
+class TestPacketFile(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.ticks = [Tick.load([i, i * 1.5]) for i in range(100)]
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_random_access(self):
+        with PacketFile(self.path, Tick, 'w') as f:
+            self.assertEqual(len(f), 0)
+            self.assertEqual(f[:], [])
+            f.extend(self.ticks[:50])
+            self.assertEqual(f[-1], self.ticks[49])
+            f.append(self.ticks[50])
+            self.assertEqual(len(f), 51)
+            self.assertEqual(f[50], self.ticks[50])
+        with PacketFile(self.path, Tick) as f:
+            self.assertEqual(f[10:20], self.ticks[10:20])
+            self.assertEqual(f[::10], self.ticks[:51:10])
+            with self.assertRaises(IndexError):
+                f[51]
+            with self.assertRaises(ValueError):
+                f.append(self.ticks[0])
+
+    def test_batches(self):
+        with PacketFile(self.path, Tick, 'a') as f:
+            f.extend(self.ticks)
+            batches = list(f.iter_batches(30, start=5))
+            self.assertEqual([len(b) for b in batches], [30, 30, 30, 5])
+            self.assertEqual(list(f), self.ticks)
+
+    def test_append_and_read(self):
+        with PacketFile(self.path, Tick, 'w') as f:
+            f.extend(self.ticks[:10])
+            self.assertEqual(f[-1], self.ticks[9])
+            mapped = f._map
+            for tick in self.ticks[10:]:
+                f.append(tick)
+                self.assertEqual(f[-1], tick)
+            # appended records are read without mapping the file again
+            self.assertIs(f._map, mapped)
+            self.assertEqual(f[5:15], self.ticks[5:15])
+            self.assertEqual(f[20:30], self.ticks[20:30])
+            self.assertEqual(list(f), self.ticks)
+
+    def test_broken_size(self):
+        with open(self.path, 'wb') as out:
+            out.write(b'\x00' * 13)
+        with self.assertRaises(ValueError):
+            PacketFile(self.path, Tick)
@@ -0,0 +1,69 @@
+# -*- coding: utf8 -*-
+import unittest
+import pickle
+from copy import deepcopy
+from typing import Optional, List
+from packets import Packet, ArrayPacket, makeField
+from packets.processors import Array
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class SlotSub(Packet):
+    __use_slots__ = True
+    x: Optional[int] = makeField(int_t)
+
+
+class SlotParent(Packet):
+    __use_slots__ = True
+    a: int = makeField(int_t, '_a', required=True)
+    b: Optional[str] = makeField(string_t, default='b')
+    c: Optional[List[int]] = makeField(Array(int_t), default=[1])
+    s: Optional[SlotSub] = makeField(SlotSub)
+
+
+class SlotChild(SlotParent):
+    a: int = makeField(int_t, default=4, override=True)
+    d: Optional[int] = makeField(int_t)
+
+
+class SlotRow(ArrayPacket):
+    __use_slots__ = True
+    a: int = makeField(int_t, required=True)
+    b: str = makeField(string_t, default='x')
+
+
+class TestSlots(unittest.TestCase):
+    def test_no_dict(self):
+        pkt = SlotChild.load({'_a': 1, 'd': 3, 's': {'x': 1}})
+        self.assertFalse(hasattr(pkt, '__dict__'))
+        self.assertEqual(SlotChild.__slots__, ('_d', '_d_modified'))
+        self.assertEqual(pkt.dump(), {'_a': 1, 'b': 'b', 'c': [1], 's': {'x': 1}, 'd': 3})
+        self.assertEqual(SlotChild(a=2).dump(), {'_a': 2, 'b': 'b', 'c': [1]})
+        self.assertEqual(SlotRow.load([1]).dump(), [1, 'x'])
+
+    def test_modified(self):
+        pkt = SlotChild.load({'_a': 1, 's': {'x': 1}})
+        self.assertFalse(pkt.is_modified())
+        assert pkt.s is not None
+        pkt.s.x = 2
+        self.assertTrue(pkt.is_modified())
+        self.assertEqual(pkt.diff_keys(), {'s': {'x': '1'}})
+
+    def test_pickle_and_clone(self):
+        pkt = SlotChild.load({'_a': 1, 'd': 3, 's': {'x': 1}})
+        for copied in (pickle.loads(pickle.dumps(pkt, -1)), pkt.clone(), deepcopy(pkt)):
+            self.assertEqual(copied, pkt)
+            assert copied.s is not None
+            self.assertIs(copied.s.__parent__, copied)
+            self.assertFalse(copied.is_modified())
+
+    def test_private_field(self):
+        with self.assertRaises(TypeError):
+            class Private(Packet):
+                __use_slots__ = True
+                _x = makeField(int_t)
+
+    def test_not_identifier(self):
+        with self.assertRaisesRegex(TypeError, 'not an identifier'):
+            type('Routes', (Packet, ), {'__use_slots__': True, '10.0.0.0': makeField(int_t)})
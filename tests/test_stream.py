@@ -0,0 +1,170 @@
+# -*- coding: utf8 -*-
+import unittest
+import io
+import gzip
+import bz2
+import lzma
+from typing import Optional
+from concurrent.futures import Executor, Future
+from packets import Packet, PacketWriter, makeField
+from packets.stream import decode_records
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class Record(Packet):
+    id: int = makeField(int_t, required=True)
+    name: Optional[str] = makeField(string_t)
+
+
+NDJSON = ''.join(f'{{"id": {i}, "name": "имя {i}"}}\n' for i in range(100)).encode('utf-8')
+
+
+class TestIterLoad(unittest.TestCase):
+    def check(self, fileobj, count=100, **kwargs):
+        pkts = list(Record.iter_load(fileobj, **kwargs))
+        self.assertEqual([p.id for p in pkts], list(range(count)))
+        self.assertEqual(pkts[-1].name, f'имя {count - 1}')
+
+    def test_plain(self):
+        self.check(io.BytesIO(NDJSON))
+        self.check(io.BytesIO(NDJSON), chunk_size=7)
+        self.check(io.StringIO(NDJSON.decode('utf-8')), chunk_size=13)
+        self.check(io.BytesIO(NDJSON.rstrip(b'\n')), chunk_size=64)
+
+    def test_compressed(self):
+        for compress in (gzip.compress, bz2.compress, lzma.compress):
+            self.check(io.BytesIO(compress(NDJSON)), chunk_size=100)
+        self.check(io.BytesIO(gzip.compress(NDJSON)), compression='gzip')
+        with self.assertRaises(ValueError):
+            list(Record.iter_load(io.BytesIO(NDJSON), compression='zip'))
+
+    def test_blank_lines(self):
+        self.check(io.BytesIO(b'\n\n' + NDJSON.replace(b'}\n', b'}\r\n\n')), chunk_size=50)
+
+    def test_json_seq(self):
+        seq = b''.join(b'\x1e' + line + b'\n' for line in NDJSON.splitlines())
+        self.check(io.BytesIO(seq), chunk_size=33)
+        self.check(io.StringIO(seq.decode('utf-8')), chunk_size=33)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(Record.iter_load(io.BytesIO(b'{"id": 1}\n{"id": \n')))
+        with self.assertRaisesRegex(ValueError, 'Record::id'):
+            list(Record.iter_load(io.BytesIO(b'{"id": 1}\n{"name": "x"}\n')))
+        # a line of several records is not split into them
+        with self.assertRaises(ValueError):
+            list(Record.iter_load(io.BytesIO(b'{"id": 1}, {"id": 3}\n{"id": 2}\n')))
+        with self.assertRaises(ValueError):
+            Record.load_parallel(['{"id": 1}, {"id": 3}', '{"id": 2}'], workers=1)
+        # broken records are not merged to the valid ones with the same count
+        with self.assertRaises(ValueError):
+            decode_records(['1,2', '[3', '4]'])
+        with self.assertRaises(ValueError):
+            decode_records([b'{"a": "}', b'{","b": "}', b'{"}', b'{}, {}, {}'])
+
+
+class TestPacketWriter(unittest.TestCase):
+    def setUp(self):
+        self.pkts = [Record(id=i, name=f'имя {i}') for i in range(100)]
+
+    def test_write(self):
+        out = io.BytesIO()
+        with PacketWriter(out, batch_size=30) as writer:
+            writer.write(self.pkts[0])
+            writer.write_many(self.pkts[1:])
+        self.assertEqual(out.getvalue().count(b'\n'), 100)
+        self.assertEqual(list(Record.iter_load(io.BytesIO(out.getvalue()))), self.pkts)
+
+    def test_batching(self):
+        out = io.StringIO()
+        writer = PacketWriter(out, batch_size=10)
+        writer.write_many(self.pkts[:15])
+        self.assertEqual(out.getvalue().count('\n'), 10)
+        writer.flush()
+        self.assertEqual(out.getvalue().count('\n'), 15)
+
+    def test_compressed(self):
+        for compression in ('gzip', 'bz2', 'lzma'):
+            out = io.BytesIO()
+            with PacketWriter(out, compression=compression, level=1) as writer:
+                writer.write_many(self.pkts)
+            self.assertFalse(out.closed)
+            out.seek(0)
+            self.assertEqual(list(Record.iter_load(out)), self.pkts)
+
+    def test_json_seq(self):
+        out = io.BytesIO()
+        with PacketWriter(out, json_seq=True) as writer:
+            writer.write_many(self.pkts)
+        self.assertTrue(out.getvalue().startswith(b'\x1e{'))
+        self.assertEqual(list(Record.iter_load(io.BytesIO(out.getvalue()))), self.pkts)
+
+
+class DeferredFuture(Future):
+    def __init__(self, executor: 'DeferredExecutor', fn, args):
+        super().__init__()
+        self.executor = executor
+        self.task = (fn, args)
+
+    def result(self, timeout=None):
+        if not self.done():
+            # the task runs when the result is collected
+            self.executor.pending.remove(self)
+            fn, args = self.task
+            self.set_result(fn(*args))
+        return super().result(timeout)
+
+
+class DeferredExecutor(Executor):
+    def __init__(self):
+        self.pending = []
+        self.submitted = 0
+        self.most_pending = 0
+
+    def submit(self, fn, *args, **kwargs):
+        future = DeferredFuture(self, fn, args)
+        self.pending.append(future)
+        self.submitted += 1
+        self.most_pending = max(self.most_pending, len(self.pending))
+        return future
+
+
+class TestLoadParallel(unittest.TestCase):
+    def test_order(self):
+        lines = NDJSON.splitlines()
+        pkts = Record.load_parallel(lines, workers=2, batch_size=7)
+        self.assertEqual(pkts, list(Record.iter_load(io.BytesIO(NDJSON))))
+        self.assertEqual(Record.load_parallel([], workers=1), [])
+
+    def test_executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+        lines = NDJSON.decode('utf-8').splitlines()
+        with ProcessPoolExecutor(2) as pool:
+            pkts = Record.load_parallel(lines, batch_size=30, executor=pool)
+            self.assertEqual([p.id for p in pkts], list(range(100)))
+            with self.assertRaisesRegex(ValueError, 'Record::id'):
+                Record.load_parallel(['{"id": 1}', '{}'], executor=pool)
+
+    def test_trust(self):
+        from packets._trust import current_trust
+        lines = ['{"id": "7"}']
+        self.assertEqual(Record.load_parallel(lines, workers=1, trust='trusted')[0].id, 7)
+        with self.assertRaisesRegex(ValueError, 'Record::id'):
+            Record.load_parallel(lines, workers=1, trust='checked')
+        token = current_trust.set('checked')
+        try:
+            with self.assertRaisesRegex(ValueError, 'Record::id'):
+                Record.load_parallel(lines, workers=1)
+        finally:
+            current_trust.reset(token)
+        self.assertEqual([p.id for p in Record.iter_load(io.BytesIO(b'{"id": "7"}\n'), trust='trusted')], [7])
+        with self.assertRaisesRegex(ValueError, 'Record::id'):
+            list(Record.iter_load(io.BytesIO(b'{"id": "7"}\n'), trust='checked'))
+
+    def test_bounded(self):
+        pool = DeferredExecutor()
+        pkts = Record.load_parallel(NDJSON.splitlines(), batch_size=10, executor=pool, max_pending=2)
+        self.assertEqual([p.id for p in pkts], list(range(100)))
+        self.assertEqual(pool.submitted, 10)
+        self.assertEqual(pool.most_pending, 2)
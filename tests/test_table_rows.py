@@ -0,0 +1,81 @@
+from typing import Optional
+import unittest
+import pickle
+from packets import Packet, TablePacket, ChangeJournal, makeField
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class Route(Packet):
+    gateway: str = makeField(string_t, required=True)
+    metric: Optional[int] = makeField(int_t)
+
+
+class Routes(TablePacket[Route]):
+    __default_field__ = makeField(Route, required=True)
+    __row_store__ = True
+
+
+class SlottedRoutes(TablePacket[Route]):
+    __default_field__ = makeField(Route, required=True)
+    __row_store__ = True
+    __use_slots__ = True
+
+
+class TestTableRows(unittest.TestCase):
+    def setUp(self):
+        self.raw = {f'10.0.{i}.0': {'gateway': f'gw{i}', 'metric': i} for i in range(100)}
+
+    def test_lazy_rows(self):
+        for cls in (Routes, SlottedRoutes):
+            table = cls.load(self.raw)
+            self.assertIs(table.__class__, cls)
+            rows = table.table_rows()
+            self.assertEqual(len(rows), 100)
+            self.assertEqual(rows._rows, {})
+            self.assertEqual(getattr(table, '10.0.5.0').metric, 5)
+            self.assertEqual(len(rows._rows), 1)
+            self.assertEqual(table.dump(), self.raw)
+            with self.assertRaises(AttributeError):
+                table.unknown
+
+    def test_add_remove(self):
+        table = Routes.load(self.raw)
+        rows = table.table_rows()
+        rows['new'] = Route(gateway='gw')
+        del rows['10.0.0.0']
+        self.assertNotIn('10.0.0.0', rows)
+        self.assertIn('new', rows)
+        dumped = table.dump()
+        self.assertEqual(dumped['new'], {'gateway': 'gw'})
+        self.assertEqual(len(dumped), 100)
+        self.assertEqual(Routes.load(dumped), table)
+
+    def test_partial(self):
+        table = Routes.load(self.raw)
+        journal = ChangeJournal(table, ('replica', ))
+        rows = table.table_rows()
+        rows['10.0.1.0'].metric = 10
+        rows['new'] = Route(gateway='gw')
+        del rows['10.0.2.0']
+        patch = journal.pull('replica')
+        self.assertDictEqual(patch, {'10.0.1.0': {'metric': 10}, 'new': {'gateway': 'gw'}, '10.0.2.0': None})
+        replica = Routes.load(self.raw)
+        self.assertIs(replica.apply_partial(patch), replica)
+        self.assertEqual(replica.dump(), table.dump())
+        self.assertFalse(journal.is_modified('replica'))
+
+    def test_copies(self):
+        table = Routes.load(self.raw)
+        table.table_rows()['10.0.3.0'].metric = 30
+        for copied in (table.clone(), pickle.loads(pickle.dumps(table, -1))):
+            self.assertEqual(copied.dump(), table.dump())
+            copied.table_rows()['10.0.3.0'].metric = 31
+            self.assertEqual(table.table_rows()['10.0.3.0'].metric, 30)
+            self.assertTrue(copied.is_modified())
+
+    def test_errors(self):
+        table = Routes.load({'bad': {'metric': 1}})
+        with self.assertRaisesRegex(ValueError, 'Routes::bad'):
+            table.table_rows()['bad']
+        self.assertEqual(table.dump(), {'bad': {'metric': 1}})
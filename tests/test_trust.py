@@ -0,0 +1,96 @@
+from typing import List, Optional
+import unittest
+from packets import Packet, ArrayPacket, makeField
+from packets.processors import Array
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+
+
+class Point(Packet):
+    x: int = makeField(int_t, required=True)
+    y: Optional[int] = makeField(int_t)
+
+
+class Shape(Packet):
+    name: str = makeField(string_t, required=True)
+    points: List[Point] = makeField(Array(Point), default=[])
+
+
+class TrustedPoint(Point):
+    __trust__ = 'trusted'
+
+
+class CheckedPoint(Point):
+    __trust__ = 'checked'
+
+
+class TrustedShape(Packet):
+    point: TrustedPoint = makeField(TrustedPoint, required=True)
+    points: List[TrustedPoint] = makeField(Array(TrustedPoint), default=[])
+
+
+class Pair(ArrayPacket):
+    a: int = makeField(int_t, required=True)
+    b: int = makeField(int_t, required=True)
+
+
+class TestTrust(unittest.TestCase):
+    def test_levels(self):
+        raw = {'x': '7', 'y': 2, 'z': 3}
+        self.assertEqual(Point.load(raw, trust='trusted').x, 7)
+        with self.assertRaisesRegex(ValueError, 'Point::x'):
+            Point.load(raw, trust='checked')
+        self.assertEqual(Point.load({'x': 1, 'z': 3}, trust='checked').x, 1)
+        with self.assertRaisesRegex(ValueError, 'Unknown field "z"'):
+            Point.load({'x': 1, 'z': 3}, trust='strict')
+        with self.assertRaises(ValueError):
+            Point.load({'x': 1}, trust='unknown') # type: ignore
+
+    def test_nested(self):
+        raw = {'name': 's', 'points': [{'x': 1}, {'x': 2, 'z': 3}]}
+        with self.assertRaisesRegex(ValueError, 'Unknown field "z"'):
+            Shape.load(raw, trust='strict')
+        # level of the call doesn't leak to the next calls
+        self.assertEqual(len(Shape.load(raw).points), 2)
+        unchecked = {'name': 's', 'points': [{'x': '7'}]}
+        self.assertEqual(Shape.load(unchecked, trust='trusted').points[0].x, 7)
+        with self.assertRaises(ValueError):
+            Shape.load(unchecked, trust='checked')
+        # trusted values are still converted like the generic loader does
+        self.assertEqual(Shape.load({'name': 5}, trust='trusted').name, '5')
+        self.assertEqual(Shape.load_binary(Shape(name='5').dump_binary(), trust='trusted').name, '5')
+
+    def test_class_level(self):
+        self.assertEqual(TrustedPoint.load({'x': '7'}).x, 7)
+        with self.assertRaises(ValueError):
+            TrustedPoint.load({'x': '7'}, trust='checked')
+        with self.assertRaisesRegex(ValueError, 'Unknown trust level'):
+            type('BadTrust', (Point, ), {'__trust__': 'none'})
+
+    def test_nested_class_level(self):
+        shape = TrustedShape.load({'point': {'x': '7'}, 'points': [{'x': '8'}]})
+        self.assertEqual((shape.point.x, shape.points[0].x), (7, 8))
+        with self.assertRaisesRegex(ValueError, 'TrustedShape::point'):
+            TrustedShape.load({'point': {'x': '7'}}, trust='checked')
+        with self.assertRaisesRegex(ValueError, 'TrustedShape::points'):
+            TrustedShape.load({'point': {'x': 7}, 'points': [{'x': '8'}]}, trust='checked')
+
+    def test_lazy_and_patch(self):
+        self.assertEqual(TrustedPoint.load_lazy({'x': '7'}).x, 7)
+        with self.assertRaisesRegex(ValueError, 'CheckedPoint::x'):
+            CheckedPoint.load_lazy({'x': '7'}).x
+        self.assertEqual(TrustedPoint.load({'x': 1}).apply_partial({'x': '7'}).x, 7)
+        with self.assertRaisesRegex(ValueError, 'CheckedPoint::x'):
+            CheckedPoint.load({'x': 1}).apply_partial({'x': '7'})
+
+    def test_array_packet(self):
+        self.assertEqual(Pair.load([1, 2, 3]).dump(), [1, 2])
+        with self.assertRaises(ValueError):
+            Pair.load([1, 2, 3], trust='strict')
+
+    def test_many(self):
+        raws = [{'x': '7'}, {'x': 1}]
+        self.assertEqual([p.x for p in Point.load_many(raws, trust='trusted')], [7, 1])
+        with self.assertRaises(ValueError):
+            Point.load_many(raws, trust='checked')
+        self.assertEqual(Point.loads('{"x": "7"}', trust='trusted').x, 7)
@@ -0,0 +1,75 @@
+# -*- coding: utf8 -*-
+import unittest
+import pickle
+from typing import Optional
+from packets import Packet, ArrayPacket, makeField
+from packets.view import BinaryRecord
+from packets.processors import Array
+from packets.typedef.int_t import int_t
+from packets.typedef.float_t import float_t
+from packets.typedef.string_t import string_t
+
+
+class Point(ArrayPacket):
+    x: int = makeField(int_t, required=True)
+    y: int = makeField(int_t, required=True)
+
+
+class Body(Packet):
+    text: Optional[str] = makeField(string_t)
+    score: Optional[float] = makeField(float_t)
+    point: Optional[Point] = makeField(Point)
+
+
+class Envelope(Packet):
+    route: str = makeField(string_t, required=True)
+    body: Optional[Body] = makeField(Body)
+    ids: Optional[list] = makeField(Array(int_t))
+
+
+class TestView(unittest.TestCase):
+    def setUp(self):
+        self.pkt = Envelope.load({'route': 'a.b', 'body': {'text': 'привет', 'score': 0.5, 'point': [1, 2]}, 'ids': [1, 2]})
+        self.data = bytearray(self.pkt.dump_binary())
+
+    def test_lazy_access(self):
+        view = Envelope.load_view(self.data)
+        self.assertIsInstance(view.__raw__, BinaryRecord)
+        self.assertIs(view.__raw__.data.obj, self.data)
+        self.assertFalse(hasattr(view, '_body'))
+        self.assertEqual(view.route, 'a.b')
+        body = view.body
+        assert body is not None
+        self.assertIsInstance(body.__raw__, BinaryRecord)
+        self.assertIs(body.__raw__.data.obj, self.data)
+        self.assertEqual(body.text, 'привет')
+        self.assertEqual(body.point, Point.load([1, 2]))
+        self.assertEqual(view.dump(), self.pkt.dump())
+
+    def test_forward(self):
+        view = Envelope.load_view(self.data)
+        self.assertEqual(view.route, 'a.b')
+        self.assertEqual(view.dump_binary(), bytes(self.data))
+        view.route = 'c'
+        data = view.dump_binary()
+        self.assertNotEqual(data, bytes(self.data))
+        self.assertEqual(Envelope.load_binary(data).dump(), dict(self.pkt.dump(), route='c'))
+
+    def test_nested_modified(self):
+        view = Envelope.load_view(self.data)
+        assert view.body is not None
+        view.body.score = 1.5
+        self.assertTrue(view.is_modified())
+        self.assertEqual(Envelope.load_binary(view.dump_binary()).body.score, 1.5)
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'Envelope::route'):
+            Envelope.load_view(b'\x00')
+        with self.assertRaises(ValueError):
+            Envelope.load_view(self.data[:-2])
+        self.assertEqual(Point.load_view(Point.load([3, 4]).dump_binary()), Point.load([3, 4]))
+
+    def test_pickle(self):
+        view = Envelope.load_view(self.data)
+        copied = pickle.loads(pickle.dumps(view))
+        self.assertEqual(copied.dump(), self.pkt.dump())